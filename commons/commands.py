@@ -475,6 +475,12 @@ DI_MD5_CORRUPT = 'di_obj_md5_corrupted'
 FI_ENABLE = 'enable'
 FI_DISABLE = 'disable'
 FI_TEST = 'test'
+# One background curl per S3 instance, each prints target, curl exit code, end time and response
+# flattened to a single line without word splitting or globbing of the response
+FI_FANOUT_TARGET = '(out=$(curl -s -m {timeout} --retry 3 --retry-delay 1 -X PUT -H ' \
+                   '"x-seagate-faultinjection: {op},always,{flag},0,0" {target} 2>&1); rc=$?; ' \
+                   'echo "FI_RESULT {target} $rc $(date +%s.%N) ' \
+                   '$(printf %s "$out" | tr "\\n" " ")") &'
 # Kubernetes commands to interact with service/pods.
 LDAP_SEARCH_DATA = ("ldapsearch -x -b \"dc=s3,dc=seagate,dc=com\" -H ldap://{0}"
                     + " -D \"cn={1},dc=seagate,dc=com\" -w {2}")
@@ -503,6 +509,8 @@ GET_BYTECOUNT = "consul kv get -recurse bytecount"
 KUBECTL_CMD = "kubectl {} {} -n {} {}"
 KUBECTL_GET_DEPLOYMENT = "kubectl get deployment"
 KUBECTL_GET_POD_CONTAINERS = "kubectl get pods {} -o jsonpath='{{.spec.containers[*].name}}'"
+KUBECTL_GET_PODS_CONTAINERS = "kubectl get pods -o jsonpath='{range .items[*]}{.metadata.name}" \
+                              "{\" \"}{.status.podIP}{\" \"}{.spec.containers[*].name}{\"\\n\"}{end}'"
 KUBECTL_GET_POD_IPS = 'kubectl get pods --no-headers -o ' \
                       'custom-columns=":metadata.name,:.status.podIP"'
 KUBECTL_GET_POD_NAMES = 'kubectl get pods --no-headers -o custom-columns=":metadata.name"'
@@ -18,21 +18,27 @@
 # please email opensource@seagate.com or cortx-questions@seagate.com.
 #
 """
-Extended log rotation class for cortx log files
+Extended log rotation class and non blocking queue based handlers for cortx log files
 """
+import atexit
+import copy
 import os
 import inspect
 import gzip
+import queue
 import shutil
 import datetime
 import logging
+import threading
 from logging import handlers
 from commons import params
 
 LOG_FILE = 'cortx-test.log'
+MAX_MSG_LENGTH = 64 * 1024  # Messages longer than this are truncated by TruncateFilter.
+LISTENERS = list()
 
 
-def init_loghandler(log, level=logging.DEBUG) -> None:
+def init_loghandler(log, level=logging.DEBUG, queued=True) -> None:
     """Initialize logging with stream and file handlers."""
     log.setLevel(level)
     make_log_dir(params.LOG_DIR_NAME)
@@ -47,11 +53,14 @@ def init_loghandler(log, level=logging.DEBUG) -> None:
     formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
     fh.setFormatter(formatter)
     ch.setFormatter(formatter)
-    log.addHandler(fh)
-    log.addHandler(ch)
+    if queued:
+        add_queue_handler(log, fh, ch)
+    else:
+        log.addHandler(fh)
+        log.addHandler(ch)
 
 
-def set_log_handlers(log, name, mode='w', level=logging.DEBUG):
+def set_log_handlers(log, name, mode='w', level=logging.DEBUG, queued=True):
     """Set stream and file handlers."""
     fh = logging.FileHandler(name, mode=mode)
     fh.setLevel(level)
@@ -60,8 +69,136 @@ def set_log_handlers(log, name, mode='w', level=logging.DEBUG):
     formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
     fh.setFormatter(formatter)
     ch.setFormatter(formatter)
-    log.addHandler(fh)
-    log.addHandler(ch)
+    if queued:
+        add_queue_handler(log, fh, ch)
+    else:
+        log.addHandler(fh)
+        log.addHandler(ch)
+
+
+def add_queue_handler(log, *log_handlers, max_length=MAX_MSG_LENGTH, sample_every=1):
+    """
+    Attach handlers to logger through a queue. Records are formatted and written by a
+    background listener thread, so logging call only enqueues the record.
+    :param log: logger instance
+    :param log_handlers: handlers which write records e.g. file and stream handlers
+    :param max_length: truncate messages longer than this, None to keep as is
+    :param sample_every: keep one in these many messages longer than max_length
+    :return: queue listener, stopped at exit.
+    """
+    if max_length:
+        truncate = TruncateFilter(max_length=max_length, sample_every=sample_every)
+        for handler in log_handlers:
+            handler.addFilter(truncate)
+    log_queue = queue.SimpleQueue()
+    listener = handlers.QueueListener(log_queue, *log_handlers, respect_handler_level=True)
+    q_handler = CortxQueueHandler(log_queue, listener)
+    log.addHandler(q_handler)
+    listener.start()
+    LISTENERS.append(listener)
+    return listener
+
+
+@atexit.register
+def stop_queue_listeners() -> None:
+    """Flush queued records and stop listener threads."""
+    while LISTENERS:
+        listener = LISTENERS.pop()
+        try:
+            listener.stop()
+        except AttributeError:
+            pass  # already stopped
+
+
+class LazyMessage:
+    """
+    Defer building of a log argument till the record is formatted
+    e.g. log.debug("json: %s", LazyMessage(json.dumps, body)). With queued handlers
+    such records are formatted by the listener thread, other records are formatted
+    on the calling thread.
+    """
+
+    __slots__ = ('func', 'args', 'kwargs')
+
+    def __init__(self, func, *args, **kwargs):
+        self.func = func
+        self.args = args
+        self.kwargs = kwargs
+
+    def __str__(self):
+        return str(self.func(*self.args, **self.kwargs))
+
+    __repr__ = __str__
+
+
+def _has_lazy_args(record) -> bool:
+    """True if record has LazyMessage args, which are rendered by the listener."""
+    args = record.args
+    if isinstance(args, dict):
+        args = args.values()
+    return any(isinstance(arg, LazyMessage) for arg in args or ())
+
+
+class TruncateFilter(logging.Filter):
+    """Truncate or sample huge log messages."""
+
+    def __init__(self, max_length=MAX_MSG_LENGTH, sample_every=1):
+        super().__init__()
+        self.max_length = max_length
+        self.sample_every = max(1, sample_every)
+        self._huge = 0
+        self._lock = threading.Lock()
+
+    def filter(self, record):
+        if getattr(record, 'truncated', False):
+            return True
+        if getattr(record, 'sampled_out', False):
+            return False
+        msg = record.getMessage()
+        if len(msg) <= self.max_length:
+            return True
+        with self._lock:
+            self._huge += 1
+            keep = (self._huge - 1) % self.sample_every == 0
+        if not keep:
+            record.sampled_out = True
+            return False
+        record.msg = "{}... [{} chars truncated]".format(
+            msg[:self.max_length], len(msg) - self.max_length)
+        record.args = None
+        record.truncated = True
+        return True
+
+
+class CortxQueueHandler(handlers.QueueHandler):
+    """
+    Queue handler which does not format the record on calling thread. Records logged
+    from a forked process, where listener thread does not exist, are handled directly.
+    """
+
+    def __init__(self, log_queue, listener):
+        super().__init__(log_queue)
+        self.listener = listener
+        self._pid = os.getpid()
+
+    def prepare(self, record):
+        # Listener side filters rewrite msg/args, hand them a private copy.
+        record = copy.copy(record)
+        if not _has_lazy_args(record):
+            # Render on calling thread, args may be changed by caller after logging call.
+            record.msg = record.getMessage()
+            record.args = None
+        if record.exc_info and not record.exc_text:
+            # Traceback objects can not outlive the frame safely, render them here.
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def emit(self, record):
+        if os.getpid() != self._pid:
+            self.listener.handle(self.prepare(record))
+            return
+        super().emit(record)
 
 
 def make_log_dir(dirpath) -> None:
@@ -100,7 +237,9 @@ class CortxRotatingFileHandler(handlers.RotatingFileHandler):
 
     def log_rotator(self, source, dest):
         """
-        Method to compress and rotate the current log when size limit is reached.
+        Method to compress and rotate the current log when size limit is reached. It runs
+        in emit, which is the queue listener thread for queued handlers, so compression
+        does not block logging callers and is complete when listeners are stopped.
         :param source: current log file path
         :param dest: destination path for rotated file
         """
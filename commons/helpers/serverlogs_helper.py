@@ -19,6 +19,9 @@
 
 """ This helper file is used to collect logs from Nodes for the given time stamps """
 
+import mmap
+import os
+import re
 from datetime import datetime
 from commons.helpers import host
 from commons.utils import config_utils
@@ -42,34 +45,203 @@ def get_node_details(node_name):
     node_obj.passwd = fileconf['node_password']
     return node_obj
 
-def split_file_for_timestamp(st_time, end_time, filename, filepath, test_id):
-    # split file for give time stamps and create new file with test_id
-    # appended to it
-    path = "{}/{}".format(filepath, filename)
-    logfile = open(path, 'r')
+# (regex on start of line, strptime format, format has year)
+TIMESTAMP_FORMATS = [
+    (re.compile(rb"^\[?(\d{4}-\d{2}-\d{2}[ T]\d{2}:\d{2}:\d{2})"), "%Y-%m-%d %H:%M:%S", True),
+    (re.compile(rb"^\[?(\d{4}/\d{2}/\d{2} \d{2}:\d{2}:\d{2})"), "%Y/%m/%d %H:%M:%S", True),
+    (re.compile(rb"^([A-Z][a-z]{2} +\d{1,2} \d{2}:\d{2}:\d{2})"), "%b %d %H:%M:%S", False),
+]
+READ_CHUNK = 4096
+MAX_LINES_WITHOUT_TIMESTAMP = 1000
+
+
+def parse_timestamp(line):
+    """
+    Parse timestamp at start of a log line or a timestamp string.
+    :param line: bytes or str
+    :return: (datetime, has_year) or None if line does not start with a known timestamp
+    """
+    if isinstance(line, str):
+        line = line.encode()
+    for regex, fmt, has_year in TIMESTAMP_FORMATS:
+        match = regex.match(line)
+        if match:
+            value = re.sub(rb" +", b" ", match.group(1)).replace(b"T", b" ").decode()
+            try:
+                return datetime.strptime(value, fmt), has_year
+            except ValueError:
+                continue
+    return None
+
+
+def _is_before(tstamp, target):
+    """Compare parsed timestamps, syslog timestamps do not carry year."""
+    if tstamp[1] and target[1]:
+        return tstamp[0] < target[0]
+    return tstamp[0].replace(year=target[0].year) < target[0]
+
+
+def _next_line(read_at, offset, size):
+    """Start offset and content of first line starting at or after offset."""
+    pos = offset
+    if pos > 0:
+        pos -= 1
+        while True:
+            buf = read_at(pos, READ_CHUNK)
+            if not buf:
+                return size, b""
+            idx = buf.find(b"\n")
+            if idx != -1:
+                pos += idx + 1
+                break
+            pos += len(buf)
+    line = b""
+    cur = pos
+    while cur < size:
+        buf = read_at(cur, READ_CHUNK)
+        if not buf:
+            break
+        idx = buf.find(b"\n")
+        if idx != -1:
+            line += buf[:idx]
+            break
+        line += buf
+        cur += len(buf)
+    return pos, line
+
+
+def _timestamp_at(read_at, offset, size):
+    """Start offset and timestamp of first timestamped line at or after offset."""
+    pos = offset
+    for _ in range(MAX_LINES_WITHOUT_TIMESTAMP):
+        start, line = _next_line(read_at, pos, size)
+        if start >= size:
+            break
+        tstamp = parse_timestamp(line)
+        if tstamp:
+            return start, tstamp
+        pos = start + len(line) + 1
+    return size, None
+
+
+def find_timestamp_offset(read_at, size, target, inclusive=True):
+    """
+    Binary search byte offset of first line with timestamp >= target (> target when
+    inclusive is False). Lines without timestamp belong to previous timestamped line.
+    :param read_at: callable(offset, length) returning bytes of log file
+    :param size: size of log file
+    :param target: (datetime, has_year) as returned by parse_timestamp
+    :param inclusive: include lines with timestamp equal to target
+    :return: byte offset
+    """
+    low, high = 0, size
+    while low < high:
+        mid = (low + high) // 2
+        start, tstamp = _timestamp_at(read_at, mid, size)
+        if tstamp is None:
+            found = True
+        elif inclusive:
+            found = not _is_before(tstamp, target)
+        else:
+            found = _is_before(target, tstamp)
+        if found:
+            high = mid
+        else:
+            low = start + 1
+    return _timestamp_at(read_at, low, size)[0] if low < size else size
+
 
-    newname = "{}_{}".format(test_id, filename)
-    newpath = "{}/{}".format(fileconf['log_destination'], newname)
-    newfile = open(newpath, 'w')
+def parse_window(st_time, end_time):
+    """
+    Parse start and end timestamps of a log window.
+    :return: ((datetime, has_year), (datetime, has_year))
+    :raises ValueError: if a timestamp is not in a known format
+    """
+    window = []
+    for name, value in (("st_time", st_time), ("end_time", end_time)):
+        tstamp = parse_timestamp(value)
+        if tstamp is None:
+            raise ValueError("Unrecognized {} timestamp: {!r}".format(name, value))
+        window.append(tstamp)
+    return tuple(window)
 
-    # timestamp format ('%b %#d %H:%M:%S') -> "Dec 12 16:06:01"
-    st_t = st_time.split()
-    en_t = end_time.split()
-    start_time = "{} {} {}".format(st_t[0], st_t[1], st_t[2])
-    end_time = "{} {} {}".format(en_t[0], en_t[1], en_t[2])
 
-    for line in logfile:
-        ls = line.split(' ')
-        # PLEASE CHECK TIMESTAMP IN LOG FILES FIRST, For every file it might be
-        # different
-        timestamp = "{} {} {}".format(ls[0], ls[1], ls[2])
-        if timestamp >= start_time and timestamp <= end_time:
-            newfile.write(line)
+def get_window_offsets(read_at, size, st_time, end_time):
+    """Byte range [start, end) of log lines between st_time and end_time (inclusive)."""
+    st_tstamp, end_tstamp = parse_window(st_time, end_time)
+    start = find_timestamp_offset(read_at, size, st_tstamp)
+    end = find_timestamp_offset(read_at, size, end_tstamp, inclusive=False)
+    return start, max(start, end)
 
-    newfile.close()  # close it if done writing into it
-    logfile.close()
 
-    return newpath
+def extract_log_windows(path, windows, dest_dir):
+    """
+    Extract per test slices of a local log file using memory map and binary search.
+    :param path: local log file
+    :param windows: dict of test_id: (st_time, end_time)
+    :param dest_dir: directory for per test slices named <test_id>_<log file name>
+    :return: dict of test_id: sliced file path
+    """
+    for st_time, end_time in windows.values():
+        parse_window(st_time, end_time)
+    slices = dict()
+    filename = os.path.basename(path)
+    with open(path, "rb") as logfile:
+        size = os.fstat(logfile.fileno()).st_size
+        if not size:
+            mapped = b""
+        else:
+            mapped = mmap.mmap(logfile.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            def read_at(offset, length):
+                return mapped[offset:offset + length]
+
+            for test_id, (st_time, end_time) in sorted(windows.items(),
+                                                       key=lambda win: win[1][0]):
+                start, end = get_window_offsets(read_at, size, st_time, end_time)
+                newpath = os.path.join(dest_dir, "{}_{}".format(test_id, filename))
+                with open(newpath, "wb") as newfile:
+                    newfile.write(mapped[start:end])
+                slices[test_id] = newpath
+        finally:
+            if size:
+                mapped.close()
+    return slices
+
+
+def copy_remote_log_window(sftp, remote_path, local_path, st_time, end_time):
+    """
+    Binary search window offsets over sftp and transfer only [start, end) byte range.
+    :return: number of bytes copied
+    """
+    parse_window(st_time, end_time)
+    size = sftp.stat(remote_path).st_size
+    with sftp.open(remote_path, "rb") as remote_file:
+        def read_at(offset, length):
+            remote_file.seek(offset)
+            return remote_file.read(length)
+
+        start, end = get_window_offsets(read_at, size, st_time, end_time)
+        remote_file.seek(start)
+        remaining = end - start
+        with open(local_path, "wb") as local_file:
+            while remaining > 0:
+                buf = remote_file.read(min(remaining, 1024 * 1024))
+                if not buf:
+                    break
+                local_file.write(buf)
+                remaining -= len(buf)
+    return end - start
+
+
+def split_file_for_timestamp(st_time, end_time, filename, filepath, test_id):
+    # split file for give time stamps and create new file with test_id
+    # appended to it
+    path = "{}/{}".format(filepath, filename)
+    slices = extract_log_windows(path, {test_id: (st_time, end_time)},
+                                 fileconf['log_destination'])
+    return slices[test_id]
+
 
 def process_and_copy_file(
         st_time,
@@ -79,19 +251,10 @@ def process_and_copy_file(
         localpath,
         test_id,
         sftp):
-    # Copy file from node to test client
+    # 1. Copy only the window for given time stamps from node to test client
     nodepath = "{}/{}".format(file_path, file_name)
-    dest_path = "{}/{}".format(fileconf['log_destination'], file_name)
-    # @TODO - check sftp.get(), this call might be wrong
-    sftp.get(remotepath=nodepath, localpath=dest_path)
-
-    # 1. Fetch give file from node and Split file for given time stamp
-    newfilepath = split_file_for_timestamp(
-        st_time,
-        end_time,
-        file_name,
-        fileconf['log_destination'],
-        test_id)
+    newfilepath = "{}/{}_{}".format(fileconf['log_destination'], test_id, file_name)
+    copy_remote_log_window(sftp, nodepath, newfilepath, st_time, end_time)
 
     # 2. Copy file from node to remote server <<< @TODO need new connection
     # here !! MISSING !!!
@@ -0,0 +1,188 @@
+# -*- coding: utf-8 -*-
+# !/usr/bin/python
+#
+# Copyright (c) 2022 Seagate Technology LLC and/or its Affiliates
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published
+# by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+#
+# For any questions about this software or licensing,
+# please email opensource@seagate.com or cortx-questions@seagate.com.
+#
+"""Session level log shipper which uploads test logs to NFS share in background."""
+import gzip
+import logging
+import os
+import queue
+import shutil
+import threading
+from concurrent.futures import Future
+
+from commons import params
+from commons.utils import system_utils
+
+LOGGER = logging.getLogger(__name__)
+
+
+class LogShipper:
+    """
+    Mounts NFS share once per session and ships log files from a queue using
+    background threads. Test teardown only enqueues the local file, upload location
+    is known upfront so that it can be commented in Jira before upload completes.
+    """
+
+    def __init__(self, host_dir: str = params.NFS_SERVER_DIR,
+                 mnt_dir: str = params.MOUNT_DIR, nworkers: int = 2,
+                 compress: bool = True) -> None:
+        self.host_dir = host_dir
+        self.mnt_dir = mnt_dir
+        self.nworkers = nworkers
+        self.compress = compress
+        self.mounted = False
+        self._queue = queue.Queue()
+        self._workers = list()
+        self._lock = threading.Lock()
+        # local path -> future of a queued or running ship, a path is queued once
+        self._pending = dict()
+
+    def start(self) -> None:
+        """Mount NFS share and start upload threads."""
+        with self._lock:
+            if self._workers:
+                return
+            try:
+                resp = system_utils.mount_nfs_dir(host_dir=self.host_dir, mnt_dir=self.mnt_dir)
+                self.mounted = resp[0]
+                if not resp[0]:
+                    LOGGER.error("Failed to mount %s, logs will be kept at %s: %s",
+                                 self.host_dir, params.LOCAL_LOG_PATH, resp[1])
+            except Exception as error:
+                LOGGER.error("Failed to mount %s, logs will be kept at %s: %s",
+                             self.host_dir, params.LOCAL_LOG_PATH, error)
+                self.mounted = False
+            for _ in range(self.nworkers):
+                worker = threading.Thread(target=self._worker, daemon=True)
+                worker.start()
+                self._workers.append(worker)
+
+    def is_mounted(self) -> bool:
+        """True while NFS share is mounted, another process of session may unmount it."""
+        return self.mounted and os.path.ismount(self.mnt_dir)
+
+    def destination(self, remote_path: str) -> str:
+        """Directory where files shipped now with remote_path will be found."""
+        if self.is_mounted():
+            return os.path.join(self.host_dir, remote_path)
+        return os.path.join(params.LOCAL_LOG_PATH, remote_path)
+
+    def shipped_name(self, local_path: str) -> str:
+        """Name of local file on the share."""
+        name = os.path.basename(local_path.rstrip(os.sep))
+        if self.compress:
+            name += ".gz" if os.path.isfile(local_path) else ".tar.gz"
+        return name
+
+    def submit(self, local_path: str, remote_path: str, remove: bool = False) -> Future:
+        """
+        Enqueue local file or directory for upload.
+        :param local_path: Local path of the file or directory to be uploaded
+        :param remote_path: Dir path relative to NFS share
+        :param remove: Remove local path once uploaded
+        :return: Future with final upload location of local path, future of pending ship
+        when local path is already queued
+        """
+        if not self._workers:
+            self.start()
+        with self._lock:
+            future = self._pending.get(local_path)
+            if future is not None:
+                return future
+            future = Future()
+            self._pending[local_path] = future
+        self._queue.put((local_path, remote_path, remove, future))
+        return future
+
+    def _worker(self) -> None:
+        """Upload thread."""
+        while True:
+            task = self._queue.get()
+            if task is None:
+                self._queue.task_done()
+                break
+            local_path, remote_path, remove, future = task
+            try:
+                location = self._ship(local_path, remote_path, remove)
+            except Exception as error:
+                LOGGER.error("Failed to ship %s: %s", local_path, error)
+                self._done(local_path)
+                future.set_exception(error)
+            else:
+                self._done(local_path)
+                future.set_result(location)
+            finally:
+                self._queue.task_done()
+
+    def _done(self, local_path: str) -> None:
+        with self._lock:
+            self._pending.pop(local_path, None)
+
+    def _ship(self, local_path: str, remote_path: str, remove: bool) -> str:
+        """
+        Copy (and compress) local path into destination directory, local log path when
+        share is not mounted (any more).
+        :return: location where the file was shipped
+        """
+        mounted = self.is_mounted()
+        if self.mounted and not mounted:
+            LOGGER.warning("%s is not mounted any more, keeping %s at %s", self.mnt_dir,
+                           local_path, params.LOCAL_LOG_PATH)
+        if mounted:
+            dest_dir = os.path.join(self.mnt_dir, remote_path)
+            location_dir = os.path.join(self.host_dir, remote_path)
+        else:
+            dest_dir = os.path.join(params.LOCAL_LOG_PATH, remote_path)
+            location_dir = dest_dir
+        os.makedirs(dest_dir, exist_ok=True)
+        dest = os.path.join(dest_dir, self.shipped_name(local_path))
+        if os.path.isfile(local_path):
+            if self.compress:
+                with open(local_path, 'rb') as src, gzip.open(dest, 'wb', compresslevel=6) as dst:
+                    shutil.copyfileobj(src, dst, 1024 * 1024)
+            else:
+                shutil.copy(local_path, dest)
+            if remove:
+                os.remove(local_path)
+        else:
+            if self.compress:
+                shutil.make_archive(dest[:-len(".tar.gz")], 'gztar',
+                                    root_dir=os.path.dirname(local_path.rstrip(os.sep)),
+                                    base_dir=os.path.basename(local_path.rstrip(os.sep)))
+            else:
+                shutil.copytree(local_path, dest)
+            if remove:
+                shutil.rmtree(local_path, ignore_errors=True)
+        location = os.path.join(location_dir, os.path.basename(dest))
+        LOGGER.debug("Shipped %s to %s", local_path, location)
+        return location
+
+    def flush(self) -> None:
+        """Wait till all queued files are shipped."""
+        self._queue.join()
+
+    def stop(self) -> None:
+        """Ship pending files and stop upload threads."""
+        with self._lock:
+            for _ in self._workers:
+                self._queue.put(None)
+            self._queue.join()
+            for worker in self._workers:
+                worker.join()
+            self._workers = list()
@@ -48,11 +48,13 @@ SSPL_TEST_CONFIG_PATH = "config/ras_test.yaml"
 PROV_TEST_CONFIG_PATH = "config/prov/prov_test.yaml"
 COMMON_DESTRUCTIVE_CONFIG_PATH = "config/common_destructive.yaml"
 DI_CONFIG_PATH = os.path.join(CONFIG_DIR, 'di_config.yaml')
+DI_DATA_PROFILES = os.path.join(CONFIG_DIR, 'di_data_profiles.yaml')
 DATA_PATH_CONFIG_PATH = os.path.join(CONFIG_DIR, 's3/test_data_path_validate.yaml')
 HA_TEST_CONFIG_PATH = "config/ha_test.yaml"
 DEL_CFG_PATH = os.path.join(CONFIG_DIR, "s3", "test_delayed_delete.yaml")
 IAM_POLICY_CFG_PATH = os.path.join(CONFIG_DIR, "s3", "s3_iam_policy_test.yaml")
 S3_VER_CFG_PATH = os.path.join(CONFIG_DIR,  "s3", "test_versioning.yaml")
+S3_PERF_PROFILES_PATH = os.path.join(CONFIG_DIR, "s3", "s3_perf_profiles.yaml")
 PROV_CONFIG_PATH = "config/prov/test_prov_config.yaml"
 
 TEST_DATA_PATH = os.path.join(os.getcwd(), TEST_DATA_FOLDER)
@@ -101,23 +103,41 @@ DI_LOG_FILE = 'diframework.log'
 NWORKERS = 32
 NGREENLETS = 32
 NUSERS = 10
+DI_VERIFY_NPROCS = 4
+DI_DATA_PROFILE = 'di_default'
 DATAGEN_HOME = '/var/log/datagen/'
 META_DATA_HOME = os.path.join(LOG_DIR, 'meta_data')
+DI_CHECKPOINT_DIR = os.path.join(LOG_DIR, 'di_checkpoint')
 S3_ENDPOINT = "https://s3.seagate.com"
 DATASET_FILES = "/var/log/datagen/createdfile.txt"
 USER_JSON = '_usersdata'
 USER_META_JSON = '_user_metadata'
 UPLOADED_FILES = "uploadInfo.csv"
+UPLOAD_MANIFEST = "uploadInfo.db"
 DELETE_OP_FILE_NAME = "deleteInfo.csv"
 COM_DELETE_OP_FILENAME = "combinedDeleteInfo.csv"
 UPLOAD_DONE_FILE = UPLOADED_FILES
 UPLOAD_FINISHED_FILENAME = "upload_done.txt"
 FAILED_FILES = "FailedFiles.csv"
+DI_MISMATCH_REPORT = "DIMismatchReport.json"
 FAILED_FILES_SERVER_ERROR = "FailedFilesServerError.csv"
 DESTRUCTIVE_TEST_RESULT = "/root/result_summary.csv"
 DELETE_PERCENTAGE = 10
 DOWNLOAD_HOME = '/var/log/'
 
+# Background IO of testrunner parallel IO mode
+BG_IO_NUSERS = 5
+BG_IO_NBUCKETS = 2
+BG_IO_OPS_PER_SEC = 20
+BG_IO_BYTES_PER_SEC = 32 * 1024 * 1024
+BG_IO_SIZE_DIST = ((4 * 1024, 40), (64 * 1024, 30), (1024 * 1024, 20), (8 * 1024 * 1024, 10))
+BG_IO_READ_RATIO = 0.5
+BG_IO_NWORKERS = 8
+BG_IO_LATENCY_TARGET = 5
+BG_IO_METRICS_INTERVAL = 10
+BG_IO_PRESSURE_FILE = os.path.join(LOG_DIR, 'bg_io_pressure')
+BG_IO_METRICS_FILE = os.path.join(LOG_DIR, 'bg_io_metrics.jsonl')
+
 S3_INSTANCES_PER_NODE = 1
 LOCAL_S3_CONFIG = os.path.join(tempfile.gettempdir(), 's3config.yaml')
 DT_PATTERN_PREFIX = '%Y%m%d-%H%M%S'
@@ -0,0 +1,163 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+#
+# Copyright (c) 2022 Seagate Technology LLC and/or its Affiliates
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published
+# by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+#
+# For any questions about this software or licensing,
+# please email opensource@seagate.com or cortx-questions@seagate.com.
+#
+"""Single pass checksum library.
+Any combination of hashlib digests and S3 multipart ETag is computed from one read of
+the data. Files are mmap'ed and hashed in large slices; hashlib releases the GIL while
+hashing large buffers so checksum_files scales with threads.
+"""
+import hashlib
+import logging
+import mmap
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any
+from typing import Iterable
+
+LOGGER = logging.getLogger(__name__)
+
+ETAG = 'etag'
+READ_SIZE = 8 * 1024 * 1024
+NWORKERS = min(32, (os.cpu_count() or 1) + 4)
+
+
+class MultiDigest:
+    """
+    Feed data once, get several digests.
+    Usage:
+    csum = MultiDigest(('md5', 'sha256'), part_size=16 * MB)
+    csum.update(data)
+    csum.result()  # {'md5': ..., 'sha256': ..., 'etag': '<md5 of part md5s>-<parts>'}
+    """
+
+    def __init__(self, algos: Iterable[str] = ('md5',), part_size: int = None) -> None:
+        """
+        :param algos: hashlib algorithm names
+        :param part_size: None skips ETag, 0 treats data as a single part, otherwise
+        multipart ETag for parts of part_size bytes
+        """
+        self.hashes = {algo: hashlib.new(algo) for algo in algos}
+        self.part_size = part_size
+        self.part_digests = list()
+        self._part = hashlib.md5() if part_size is not None else None  # nosec
+        self._part_len = 0
+        self.size = 0
+
+    def update(self, data: Any) -> None:
+        """Feed bytes like data."""
+        view = memoryview(data).cast('B')
+        self.size += len(view)
+        for file_hash in self.hashes.values():
+            file_hash.update(view)
+        if self._part is None:
+            return
+        if not self.part_size:
+            self._part.update(view)
+            self._part_len += len(view)
+            return
+        while view:
+            take = min(self.part_size - self._part_len, len(view))
+            self._part.update(view[:take])
+            self._part_len += take
+            view = view[take:]
+            if self._part_len == self.part_size:
+                self.part_digests.append(self._part.digest())
+                self._part, self._part_len = hashlib.md5(), 0  # nosec
+
+    @property
+    def etag(self) -> str:
+        """S3 multipart ETag (without quotes) of data fed so far."""
+        digests = list(self.part_digests)
+        if self._part_len or not digests:
+            digests.append(self._part.digest())
+        return hashlib.md5(b''.join(digests)).hexdigest() + '-' + str(len(digests))  # nosec
+
+    def hexdigest(self, algo: str = 'md5') -> str:
+        """Hex digest of given algorithm or ETag."""
+        if algo == ETAG:
+            return self.etag
+        return self.hashes[algo].hexdigest()
+
+    def result(self) -> dict:
+        """All digests keyed on algorithm name, ETag keyed on 'etag'."""
+        result = {algo: file_hash.hexdigest() for algo, file_hash in self.hashes.items()}
+        if self._part is not None:
+            result[ETAG] = self.etag
+        return result
+
+
+def checksum_buffer(buf: Any, algos: Iterable[str] = ('md5',), part_size: int = None) -> dict:
+    """Digests of an in memory buffer."""
+    csum = MultiDigest(algos, part_size)
+    csum.update(buf)
+    return csum.result()
+
+
+def checksum_stream(stream: Any, algos: Iterable[str] = ('md5',), part_size: int = None,
+                    read_size: int = READ_SIZE) -> dict:
+    """Digests of a file like object e.g. open file or get_object StreamingBody."""
+    csum = MultiDigest(algos, part_size)
+    chunk = stream.read(read_size)
+    while chunk:
+        csum.update(chunk)
+        chunk = stream.read(read_size)
+    return csum.result()
+
+
+def checksum_file(path: str, algos: Iterable[str] = ('md5',), part_size: int = None,
+                  read_size: int = READ_SIZE) -> dict:
+    """
+    Digests of a file, read once through mmap.
+    :param path: file path
+    :param algos: hashlib algorithm names
+    :param part_size: see MultiDigest
+    :param read_size: bytes hashed per update
+    :return: dict of hex digests, ETag keyed on 'etag' when part_size is not None
+    """
+    csum = MultiDigest(algos, part_size)
+    with open(path, 'rb') as fp:
+        size = os.fstat(fp.fileno()).st_size
+        if not size:
+            return csum.result()
+        with mmap.mmap(fp.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            view = memoryview(mapped)
+            try:
+                for off in range(0, size, read_size):
+                    csum.update(view[off:off + read_size])
+            finally:
+                view.release()
+    return csum.result()
+
+
+def file_md5(path: str) -> str:
+    """md5 hex digest of a file."""
+    return checksum_file(path)['md5']
+
+
+def checksum_files(paths: Iterable[str], algos: Iterable[str] = ('md5',),
+                   part_size: int = None, nworkers: int = NWORKERS) -> dict:
+    """
+    Digests of many files hashed by a thread pool.
+    :return: dict of path -> checksum_file result, in order of paths
+    """
+    paths = list(paths)
+    algos = tuple(algos)
+    with ThreadPoolExecutor(max_workers=max(1, min(nworkers, len(paths) or 1))) as executor:
+        results = executor.map(lambda path: checksum_file(path, algos, part_size), paths)
+        return dict(zip(paths, results))
@@ -0,0 +1,105 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+#
+# Copyright (c) 2022 Seagate Technology LLC and/or its Affiliates
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published
+# by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+#
+# For any questions about this software or licensing,
+# please email opensource@seagate.com or cortx-questions@seagate.com.
+#
+"""Named boto connection and transfer tuning profiles of config/s3/s3_perf_profiles.yaml."""
+import contextvars
+import logging
+import os
+from contextlib import contextmanager
+
+from boto3.s3.transfer import TransferConfig
+
+from config import S3_CFG
+from config.s3 import S3_PERF_CFG
+
+LOGGER = logging.getLogger(__name__)
+
+DEFAULT_PROFILE = 'default'
+PERF_PROFILE_ENV = 'S3_PERF_PROFILE'
+# (name, overrides) forced by use_perf_profile, wins over everything but explicit lib kwargs
+_ACTIVE = contextvars.ContextVar('s3_perf_profile', default=(None, dict()))
+
+
+def perf_profile_name(name: str = None, default: str = DEFAULT_PROFILE) -> str:
+    """
+    Resolve profile name: explicit name, per test override, S3_PERF_PROFILE env variable,
+    perf_profile of s3 config and finally the default a lib asks for.
+    """
+    return name or _ACTIVE.get()[0] or os.environ.get(PERF_PROFILE_ENV) or \
+        S3_CFG.get('perf_profile') or default
+
+
+def get_perf_profile(name: str = None, default: str = DEFAULT_PROFILE) -> dict:
+    """
+    Settings of a profile on top of default profile, with per test overrides applied.
+    :param name: profile name, resolved with perf_profile_name when not given
+    :param default: profile used when nothing else selects one
+    :return: dict of settings including profile name
+    """
+    name = perf_profile_name(name, default)
+    if name not in S3_PERF_CFG:
+        raise KeyError(f'S3 perf profile {name} is not defined')
+    profile = dict(S3_PERF_CFG[DEFAULT_PROFILE])
+    profile.update(S3_PERF_CFG[name])
+    profile.update(_ACTIVE.get()[1])
+    profile['name'] = name
+    return profile
+
+
+def botocore_config(profile: dict) -> dict:
+    """botocore Config keyword arguments of a profile."""
+    return dict(max_pool_connections=profile['max_pool_connections'],
+                tcp_keepalive=profile['tcp_keepalive'],
+                connect_timeout=profile['connect_timeout'],
+                read_timeout=profile['read_timeout'],
+                retries={'max_attempts': profile['max_attempts'],
+                         'mode': profile['retry_mode']})
+
+
+def transfer_config(profile: dict, **kwargs) -> TransferConfig:
+    """boto3 managed transfer config of a profile, kwargs override profile settings."""
+    settings = dict(multipart_threshold=profile['multipart_threshold'],
+                    multipart_chunksize=profile['multipart_chunksize'],
+                    max_concurrency=profile['max_concurrency'],
+                    io_chunksize=profile['io_chunksize'],
+                    max_io_queue=profile['max_io_queue'],
+                    use_threads=True)
+    settings.update(kwargs)
+    return TransferConfig(**settings)
+
+
+@contextmanager
+def use_perf_profile(name: str = None, **overrides):
+    """
+    Select a profile and/or override settings for S3 libs created within the block.
+    Selection is context local: it applies to the calling thread (or asyncio task) only,
+    threads started in the block e.g. background IO do not see it and should be given
+    perf_profile explicitly.
+    Usage in a test:
+    with use_perf_profile('throughput', max_concurrency=64):
+        s3_test_obj = S3TestLib()
+    """
+    prev_name, prev_overrides = _ACTIVE.get()
+    active = (name or prev_name, dict(prev_overrides, **overrides))
+    token = _ACTIVE.set(active)
+    LOGGER.info("Using S3 perf profile %s with overrides %s", *active)
+    try:
+        yield get_perf_profile()
+    finally:
+        _ACTIVE.reset(token)
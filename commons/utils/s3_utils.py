@@ -22,17 +22,20 @@ import os
 import time
 import urllib
 import hmac
+import itertools
 import datetime
 import hashlib
 import logging
 import json
 import xmltodict
 from hashlib import md5
+from random import choice
 from random import shuffle
 from typing import Any
 from config import S3_CFG, CMN_CFG
 
 from commons.utils import assert_utils
+from commons.utils import checksum
 from commons import constants as const
 
 
@@ -219,17 +222,9 @@ def poll(target, *args, condition=None, **kwargs) -> Any:
 
 
 def calc_checksum(file_path, part_size=0):
-    """Calculating an checksum using encryption algorithm."""
+    """Calculating multipart ETag of a file, whole file is one part without part_size."""
     try:
-        hash_digests = list()
-        with open(file_path, 'rb') as f_obj:
-            if part_size and os.stat(file_path).st_size > part_size:
-                for chunk in iter(lambda: f_obj.read(part_size), b''):
-                    hash_digests.append(md5(chunk).digest())
-            else:
-                hash_digests.append(md5(f_obj.read()).digest())
-
-        return md5(b''.join(hash_digests)).hexdigest() + '-' + str(len(hash_digests))
+        return checksum.checksum_file(file_path, algos=(), part_size=part_size)[checksum.ETAG]
     except OSError as error:
         LOGGER.error(str(error))
         raise error from OSError
@@ -250,17 +245,106 @@ def get_multipart_etag(parts):
     Calculate expected ETag for a multipart upload
 
     :param parts: List of dict with the format {part_number: (data_bytes, content_md5), ...}
+    or {part_number: PartView, ...}
     """
     md5_digests = []
     for part_number in sorted(parts.keys()):
-        md5_digests.append(md5(parts[part_number][0]).digest())
+        part = parts[part_number]
+        if isinstance(part, PartView):
+            md5_digests.append(part.digest)
+        else:
+            md5_digests.append(md5(part[0]).digest())
     multipart_etag = md5(b''.join(md5_digests)).hexdigest() + '-' + str(len(md5_digests))
     return '"%s"' % multipart_etag
 
 
+class PartView:
+    """
+    Part of a file given by offset and length, read with os.pread only when needed.
+    Indexes like the [data, content_md5] pair of a parts dict so a plan of views is a
+    drop in replacement of in memory parts; md5 digest is kept once part is read. Data
+    read for [1] is handed to the next [0] instead of being read again.
+    """
+
+    __slots__ = ('file_path', 'offset', 'length', '_digest', '_data')
+
+    def __init__(self, file_path: str, offset: int, length: int) -> None:
+        self.file_path = file_path
+        self.offset = offset
+        self.length = length
+        self._digest = None
+        self._data = None
+
+    def read(self) -> bytes:
+        """Part data, md5 digest is computed on the way."""
+        fd = os.open(self.file_path, os.O_RDONLY)
+        try:
+            data = os.pread(fd, self.length, self.offset)
+        finally:
+            os.close(fd)
+        if self._digest is None:
+            self._digest = md5(data).digest()
+        return data
+
+    @property
+    def digest(self) -> bytes:
+        """Binary md5 of part data."""
+        if self._digest is None:
+            self.read()
+        return self._digest
+
+    @property
+    def content_md5(self) -> str:
+        """Content-MD5 header value of part."""
+        return base64.b64encode(self.digest).decode('utf-8')
+
+    def __getitem__(self, index):
+        if index == 0:
+            data, self._data = self._data, None
+            return self.read() if data is None else data
+        if index == 1:
+            if self._digest is None:
+                self._data = self.read()
+            return self.content_md5
+        raise IndexError(index)
+
+    def __len__(self) -> int:
+        return 2
+
+    def __repr__(self) -> str:
+        return "PartView({}, offset={}, length={})".format(
+            self.file_path, self.offset, self.length)
+
+
+def plan_parts(file_path, part_lengths, random=False) -> dict:
+    """
+    Plan parts of a file without reading it.
+
+    :param file_path: Path of object file.
+    :param part_lengths: Iterable of part lengths in bytes, consumed until end of file.
+    :param random: Shuffle part order.
+    :return: Dict of part number -> PartView.
+    """
+    obj_size = os.stat(file_path).st_size
+    parts = dict()
+    offset = 0
+    for i, length in enumerate(part_lengths, 1):
+        if offset >= obj_size or length <= 0:
+            break
+        length = min(length, obj_size - offset)
+        LOGGER.info("data_len %s", str(length))
+        parts[i] = PartView(file_path, offset, length)
+        offset += length
+    if random:
+        keys = list(parts.keys())
+        shuffle(keys)
+        parts = {k: parts[k] for k in keys}
+    return parts
+
+
 def get_aligned_parts(file_path, total_parts=1, chunk_size=5242880, random=False) -> dict:
     """
-    Create the upload parts dict with aligned part size(limitation: not supported more than 10G).
+    Create the upload parts plan with aligned part size, parts are read when uploaded.
 
     https://www.gbmb.org/mb-to-bytes
     Megabytes (MB)	Bytes (B) decimal	Bytes (B) binary
@@ -270,27 +354,12 @@ def get_aligned_parts(file_path, total_parts=1, chunk_size=5242880, random=False
     :param file_path: Path of object file.
     :param chunk_size: chunk size used to read each check default is 5MB.
     :param random: Generate random else sequential part order.
-    :return: Parts details with data, checksum.
+    :return: Parts details, PartView indexed like [data, checksum].
     """
     try:
         obj_size = os.stat(file_path).st_size
-        parts = dict()
         part_size = int(int(obj_size) / int(chunk_size)) // int(total_parts)
-        with open(file_path, "rb") as file_pointer:
-            i = 1
-            while True:
-                data = file_pointer.read(chunk_size * part_size)
-                if not data:
-                    break
-                LOGGER.info("data_len %s", str(len(data)))
-                parts[i] = [data, calc_contentmd5(data)]
-                i += 1
-        if random:
-            keys = list(parts.keys())
-            shuffle(keys)
-            parts = {k: parts[k] for k in keys}
-
-        return parts
+        return plan_parts(file_path, itertools.repeat(chunk_size * part_size), random)
     except OSError as error:
         LOGGER.error(str(error))
         raise error from OSError
@@ -298,7 +367,7 @@ def get_aligned_parts(file_path, total_parts=1, chunk_size=5242880, random=False
 
 def get_unaligned_parts(file_path, total_parts=1, chunk_size=5242880, random=False) -> dict:
     """
-    Create the upload parts dict with unaligned part size(limitation: not supported more than 10G).
+    Create the upload parts plan with unaligned part size, parts are read when uploaded.
 
     https://www.gbmb.org/mb-to-bytes
     Megabytes (MB)	Bytes (B) decimal	Bytes (B) binary
@@ -311,30 +380,15 @@ def get_unaligned_parts(file_path, total_parts=1, chunk_size=5242880, random=Fal
     :param file_path: Path of object file.
     :param chunk_size: chunk size used to read each check default is 5MB.
     :param random: Generate random else sequential part order.
-    :return: Parts details with data, checksum.
+    :return: Parts details, PartView indexed like [data, checksum].
     """
     try:
         obj_size = os.stat(file_path).st_size
-        parts = dict()
         part_size = int(int(obj_size) / int(chunk_size)) // int(total_parts)
         unaligned = [104857, 209715, 314572, 419430, 524288,
                      629145, 734003, 838860, 943718, 1048576]
-        with open(file_path, "rb") as file_pointer:
-            i = 1
-            while True:
-                shuffle(unaligned)
-                data = file_pointer.read((chunk_size + unaligned[0]) * part_size)
-                if not data:
-                    break
-                LOGGER.info("data_len %s", str(len(data)))
-                parts[i] = [data, calc_contentmd5(data)]
-                i += 1
-        if random:
-            keys = list(parts.keys())
-            shuffle(keys)
-            parts = {k: parts[k] for k in keys}
-
-        return parts
+        lengths = ((chunk_size + choice(unaligned)) * part_size for _ in itertools.count())
+        return plan_parts(file_path, lengths, random)
     except OSError as error:
         LOGGER.error(str(error))
         raise error from OSError
@@ -347,19 +401,14 @@ def get_precalculated_parts(file_path, part_list, chunk_size=1048576) -> dict:
     :param file_path: Path of object file.
     :param part_list: List of dict with keys 'part_size' (in bytes) and 'count'
     :param chunk_size: chunk size used to read each check default is 1MB.
-    :return: Parts details with data, checksum.
+    :return: Parts details, PartView indexed like [data, checksum].
     """
     total_part_list = []
     for part in part_list:
         total_part_list.extend([part['part_size']] * part['count'])
     shuffle(total_part_list)
-    parts = dict()
     try:
-        with open(file_path, "rb") as file_pointer:
-            for i, part_size in enumerate(total_part_list, 1):
-                data = file_pointer.read(int(part_size * chunk_size))
-                parts[i] = [data, calc_contentmd5(data)]
-        return parts
+        return plan_parts(file_path, (int(part_size * chunk_size) for part_size in total_part_list))
     except OSError as error:
         LOGGER.error(str(error))
         raise error from OSError
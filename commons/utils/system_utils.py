@@ -19,6 +19,7 @@
 #
 """Module to maintain system utils."""
 
+import base64
 import logging
 import os
 import sys
@@ -33,13 +34,12 @@ import string
 import glob
 from typing import Tuple
 from subprocess import Popen, PIPE
-from hashlib import md5
-from pathlib import Path
 from botocore.response import StreamingBody
 from paramiko import SSHClient, AutoAddPolicy
 from commons import commands
 from commons import params
 from commons.constants import AWS_CLI_ERROR
+from commons.utils import checksum
 
 if sys.platform == 'win32':
     try:
@@ -56,6 +56,10 @@ LOGGER = logging.getLogger(__name__)
 
 dns_rr_counter = 0
 
+# calculate_checksum hash_algo names to hashlib names
+HASH_ALGOS = {"md5": "md5", "SHA-1": "sha1", "SHA-224": "sha224", "SHA-256": "sha256",
+              "SHA-384": "sha384", "SHA-512": "sha512"}
+
 
 def run_remote_cmd(
         cmd: str,
@@ -304,24 +308,21 @@ def calculate_checksum(
     hash_algo = kwargs.get("hash_algo", "md5")
     if not os.path.exists(file_path):
         return False, "Please pass proper file path"
-    if hash_algo == "md5":
-        if binary_bz64:
-            cmd = "openssl md5 -binary {} | base64".format(file_path)
-        else:
-            cmd = "md5sum {} {}".format(options, file_path)
-    if hash_algo == "SHA-1":
-        cmd = "sha1sum {}".format(file_path)
-    if hash_algo == "SHA-224":
-        cmd = "sha224sum {}".format(file_path)
-    if hash_algo == "SHA-256":
-        cmd = "sha256sum {}".format(file_path)
-    if hash_algo == "SHA-384":
-        cmd = "sha384sum {}".format(file_path)
-    if hash_algo == "SHA-512":
-        cmd = "sha512sum {}".format(file_path)
-
-    LOGGER.debug("Executing cmd: %s", cmd)
-    result = run_local_cmd(cmd)
+    algo = HASH_ALGOS.get(hash_algo)
+    if algo is None:
+        return False, "Unsupported hash algo {}".format(hash_algo)
+    try:
+        digest = checksum.checksum_file(file_path, algos=(algo,))[algo]
+    except OSError as error:
+        LOGGER.error("Checksum of %s failed: %s", file_path, error)
+        return False, str(error)
+    # responses keep the format of md5sum/openssl output read by run_local_cmd
+    if algo == "md5" and binary_bz64:
+        output = base64.b64encode(bytes.fromhex(digest)) + b"\n"
+    else:
+        sep = " *" if algo == "md5" and options.strip() in ("-b", "--binary") else "  "
+        output = "{}{}{}\n".format(digest, sep, file_path).encode()
+    result = True, str(output)
     LOGGER.debug("Output: %s", str(result))
     if kwargs.get("filter_resp", None) and binary_bz64:
         result = (result[0], filter_bin_md5(result[1]))
@@ -335,31 +336,13 @@ def calc_checksum(object_ref: object, hash_algo: str = 'md5'):
     :param hash_algo: md5 or sha1
     :return:
     """
-    read_sz = 8192
-    csum = None
-    file_hash = md5()  # nosec
     if hash_algo != 'md5':
         raise NotImplementedError('Only md5 supported')
     if isinstance(object_ref, StreamingBody):
-        chunk = object_ref.read(amt=read_sz)
-        while chunk:
-            file_hash.update(chunk)
-            chunk = object_ref.read(amt=read_sz)
-        return file_hash.hexdigest()
+        return checksum.checksum_stream(object_ref)['md5']
     if os.path.exists(object_ref):
-        size = Path(object_ref).stat().st_size
-
-        with open(object_ref, 'rb') as file_ptr:
-            if size < read_sz:
-                buf = file_ptr.read(size)
-            else:
-                buf = file_ptr.read(read_sz)
-            while buf:
-                file_hash.update(buf)
-                buf = file_ptr.read(read_sz)
-            csum = file_hash.hexdigest()
-
-    return csum
+        return checksum.file_md5(object_ref)
+    return None
 
 
 def cal_percent(num1: float, num2: float) -> float:
@@ -581,7 +564,7 @@ def get_file_checksum(filename: str):
     """
     LOGGER.debug("Calculating checksum of file content")
     try:
-        result = md5(open(filename, "rb").read()).hexdigest()
+        result = checksum.file_md5(filename)
 
         return True, result
     except BaseException as error:
@@ -1029,6 +1012,24 @@ def insert_into_builtins(name, obj):
         builtins.obj = obj
 
 
+def mount_nfs_dir(host_dir: str = None, mnt_dir: str = None) -> tuple:
+    """Mount NFS directory if it is not already mounted.
+    :param host_dir: Link of NFS server directory
+    :param mnt_dir: Path of directory to be mounted
+    :return: Bool, response"""
+    if not os.path.ismount(mnt_dir):
+        if not os.path.exists(mnt_dir):
+            LOGGER.info("Creating a mount directory to share")
+            make_dirs(dpath=mnt_dir)
+
+        cmd = commands.CMD_MOUNT.format(host_dir, mnt_dir)
+        resp = run_local_cmd(cmd=cmd)
+        if not resp[0]:
+            return resp
+
+    return True, mnt_dir
+
+
 def mount_upload_to_server(host_dir: str = None, mnt_dir: str = None,
                            remote_path: str = None, local_path: str = None) \
         -> tuple:
@@ -1039,15 +1040,9 @@ def mount_upload_to_server(host_dir: str = None, mnt_dir: str = None,
     :param local_path: Local path of the file to be uploaded
     :return: Bool, response"""
     try:
-        if not os.path.ismount(mnt_dir):
-            if not os.path.exists(mnt_dir):
-                LOGGER.info("Creating a mount directory to share")
-                resp = make_dirs(dpath=mnt_dir)
-
-            cmd = commands.CMD_MOUNT.format(host_dir, mnt_dir)
-            resp = run_local_cmd(cmd=cmd)
-            if not resp[0]:
-                return resp
+        resp = mount_nfs_dir(host_dir=host_dir, mnt_dir=mnt_dir)
+        if not resp[0]:
+            return resp
 
         new_path = os.path.join(mnt_dir, remote_path)
         LOGGER.info("Creating directory on server")
@@ -33,6 +33,7 @@ import tempfile
 import time
 import uuid
 import xml.etree.ElementTree as ET
+from concurrent.futures import Future
 from threading import Thread
 from typing import List
 
@@ -46,6 +47,7 @@ from commons import Globals
 from commons import cortxlogging
 from commons import params
 from commons import report_client
+from commons.log_shipper import LogShipper
 from commons import constants as const
 from commons.helpers.health_helper import Health
 from commons.utils import assert_utils
@@ -56,6 +58,7 @@ from config import CMN_CFG
 from core.runner import LRUCache
 from core.runner import get_db_credential
 from core.runner import get_jira_credential
+from core.test_index import get_session_index
 from libs.di.di_mgmt_ops import ManagementOPs
 from libs.di.di_run_man import RunDataCheckManager
 from libs.di.fi_adapter import S3FailureInjection
@@ -65,6 +68,8 @@ LOG_DIR = 'log'
 CACHE = LRUCache(1024 * 10)
 CACHE_JSON = 'nodes-cache.yaml'
 REPORT_CLIENT = None
+TEST_INDEX = None
+LOG_SHIPPER = None
 DT_PATTERN = '%Y-%m-%d_%H:%M:%S'
 
 LOGGER = logging.getLogger(__name__)
@@ -247,12 +252,18 @@ def pytest_addoption(parser):
         "--use_ssl", action="store", default=True,
         help="Decide whether to use HTTPS/SSL connection for S3 endpoint."
     )
+    parser.addoption(
+        "--test_list", action="store", default=None,
+        help="Test list csv to select from, used when tests are sharded across targets."
+    )
 
 
-def read_test_list_csv() -> List:
+def read_test_list_csv(test_list_file: str = None) -> List:
+    if not test_list_file:
+        test_list_file = os.path.join(os.getcwd(), params.LOG_DIR_NAME, params.JIRA_TEST_LIST)
     try:
         tests = list()
-        with open(os.path.join(os.getcwd(), params.LOG_DIR_NAME, params.JIRA_TEST_LIST)) as f:
+        with open(test_list_file) as f:
             reader = csv.reader(f)
             test_list = list(reader)
             for test_row in test_list:
@@ -264,14 +275,17 @@ def read_test_list_csv() -> List:
         print(e)
 
 
-def read_dist_test_list_csv() -> List:
+def read_dist_test_list_csv(test_list_file: str = None) -> List:
     """
     Read distributed test csv file
+    :param test_list_file: Shard test list, defaults to distributed test list.
     """
+    if not test_list_file:
+        test_list_file = os.path.join(os.getcwd(), params.LOG_DIR_NAME,
+                                      params.JIRA_DIST_TEST_LIST)
     tests = list()
     try:
-        with open(os.path.join(os.getcwd(), params.LOG_DIR_NAME, params.JIRA_DIST_TEST_LIST)) \
-                as test_file:
+        with open(test_list_file) as test_file:
             reader = csv.reader(test_file)
             test_list = list(reader)
             for test_row in test_list:
@@ -293,12 +307,16 @@ def pytest_sessionfinish(session, exitstatus):
         for handler in handlers:
             _logger.removeHandler(handler)
 
-    try:
-        resp = system_utils.umount_dir(mnt_dir=params.MOUNT_DIR)
-        if resp[0]:
-            print("Successfully unmounted directory")
-    except Exception as fault:
-        print("Exception occurred while unmounting directory")
+    if LOG_SHIPPER is not None:
+        LOG_SHIPPER.stop()
+    # xdist workers share the mount, controller finishes last and unmounts it
+    if not hasattr(session.config, 'workerinput'):
+        try:
+            resp = system_utils.umount_dir(mnt_dir=params.MOUNT_DIR)
+            if resp[0]:
+                print("Successfully unmounted directory")
+        except Exception as fault:
+            print("Exception occurred while unmounting directory")
     filter_report_session_finish(session)
 
 
@@ -328,6 +346,8 @@ def get_test_metadata_from_tp_meta(item):
 
 
 def get_marks_for_test_item(item):
+    if TEST_INDEX is not None:
+        return [mark for mark in TEST_INDEX.marks(item) if mark not in SKIP_MARKS]
     marks = list()
     for mark in item.iter_markers():
         if mark.name in SKIP_MARKS:
@@ -489,7 +509,6 @@ def pytest_collection(session):
     _distributed = ast.literal_eval(str(config.option.distributed))
     is_parallel = ast.literal_eval(str(config.option.is_parallel))
     health_check = ast.literal_eval(str(config.option.health_check))
-    required_tests = list()
     global CACHE
     CACHE = LRUCache(1024 * 10)
     Globals.LOCAL_RUN = _local
@@ -497,60 +516,38 @@ def pytest_collection(session):
     Globals.TP_TKT = config.option.tp_ticket
     Globals.BUILD = config.option.build
     Globals.TARGET = config.option.target
+    global TEST_INDEX
+    if hasattr(config, 'workerinput'):
+        shared_dir = config.workerinput.get('shared_dir')
+    else:
+        shared_dir = getattr(config, 'shared_directory', None)
+    TEST_INDEX = get_session_index(items, shared_dir)
+    for item in items:
+        CACHE.store(item.nodeid, TEST_INDEX.test_id(item))
     if _distributed:
-        required_tests = read_dist_test_list_csv()
+        required_tests = read_dist_test_list_csv(config.option.test_list)
         Globals.TE_TKT = config.option.te_tkt
-        selected_items = []
-        for item in items:
-            test_found = ''
-            for mark in item.iter_markers():
-                if mark.name == 'tags':
-                    test_found = mark.args[0]
-                    if test_found in required_tests:
-                        selected_items.append(item)
-            CACHE.store(item.nodeid, test_found)
+        selected_items, _ = TEST_INDEX.select(items, required_tests)
         items[:] = selected_items
     elif _local:
-        meta = list()
-        for item in items:
-            test_id = ''
-            _marks = list()
-            for mark in item.iter_markers():
-                if mark.name == 'tags':
-                    test_id = mark.args[0]
-                else:
-                    _marks.append(mark.name)
-            CACHE.store(item.nodeid, test_id)
-            meta.append(dict(nodeid=item.nodeid, test_id=test_id, marks=_marks))
+        meta = [dict(nodeid=item.nodeid, test_id=TEST_INDEX.test_id(item),
+                     marks=TEST_INDEX.marks(item)) for item in items]
     else:
-        required_tests = read_test_list_csv()  # e.g. required_tests = ['TEST-17413', 'TEST-17414']
+        required_tests = read_test_list_csv(config.option.test_list)  # e.g. required_tests = ['TEST-17413', 'TEST-17414']
         Globals.TE_TKT = config.option.te_tkt
-        selected_items = []
-        selected_tests = []
-        for item in items:
-            parallel_found = False
-            test_found = ''
-            for mark in item.iter_markers():
-                if mark.name == 'parallel':
-                    parallel_found = True
-                    if not is_parallel:
-                        break
-                elif mark.name == 'tags':
-                    test_found = mark.args[0]
-            if parallel_found == is_parallel and test_found != '':
-                if test_found in required_tests:
-                    selected_items.append(item)
-                    selected_tests.append(test_found)
-            CACHE.store(item.nodeid, test_found)
-        with open(os.path.join(os.getcwd(), params.LOG_DIR_NAME, params.JIRA_SELECTED_TESTS), 'w') \
-                as test_file:
+        selected_items, selected_tests = TEST_INDEX.select(items, required_tests,
+                                                           is_parallel=is_parallel)
+        # shards of a sharded run select concurrently, keep their selections apart
+        shard = config.option.target + "_" if config.option.test_list else ''
+        with open(os.path.join(os.getcwd(), params.LOG_DIR_NAME,
+                               shard + params.JIRA_SELECTED_TESTS), 'w') as test_file:
             write = csv.writer(test_file)
             for test in selected_tests:
                 write.writerow([test])
         if is_parallel:
-            te_selected_csv = str(config.option.te_tkt) + "_parallel.csv"
+            te_selected_csv = str(config.option.te_tkt) + "_" + shard + "parallel.csv"
         else:
-            te_selected_csv = str(config.option.te_tkt) + "_non_parallel.csv"
+            te_selected_csv = str(config.option.te_tkt) + "_" + shard + "non_parallel.csv"
         with open(os.path.join(os.getcwd(), params.LOG_DIR_NAME, te_selected_csv), 'w') \
                 as test_file:
             write = csv.writer(test_file)
@@ -743,9 +740,18 @@ def pytest_runtest_makereport(item, call):
             f.write(report.nodeid + extra + "\n")
 
 
+def get_log_shipper() -> LogShipper:
+    """Session log shipper, NFS share is mounted on first use."""
+    global LOG_SHIPPER
+    if LOG_SHIPPER is None:
+        LOG_SHIPPER = LogShipper(host_dir=params.NFS_SERVER_DIR, mnt_dir=params.MOUNT_DIR)
+        LOG_SHIPPER.start()
+    return LOG_SHIPPER
+
+
 def upload_supporting_logs(test_id: str, remote_path: str, log: str):
     """
-    Upload all supporting (s3bench) log files to nfs share
+    Queue all supporting (s3bench) log files for upload to nfs share
     :param test_id: test number in file name
     :param remote_path: path on NFS share
     :param log: log file string e.g. s3bench
@@ -757,18 +763,12 @@ def upload_supporting_logs(test_id: str, remote_path: str, log: str):
     else:
         support_logs = glob.glob(f"{LOG_DIR}/latest/logs-cortx-cloud-*")
     LOGGER.debug("support logs is %s", support_logs)
+    shipper = get_log_shipper()
     for support_log in support_logs:
-        resp = system_utils.mount_upload_to_server(host_dir=params.NFS_SERVER_DIR,
-                                                   mnt_dir=params.MOUNT_DIR,
-                                                   remote_path=remote_path,
-                                                   local_path=support_log)
-        if resp[0]:
-            LOGGER.info("Supporting log files are uploaded at location : %s", resp[1])
-            if os.path.isfile(support_log):
-                os.remove(support_log)
-                LOGGER.info("Removed the files from local path after uploading to NFS share")
-        else:
-            LOGGER.error("Failed to supporting log file at location %s", resp[1])
+        shipper.submit(support_log, remote_path, remove=os.path.isfile(support_log))
+    if support_logs:
+        LOGGER.info("Supporting log files are queued for upload at location : %s",
+                    shipper.destination(remote_path))
 
 
 def check_cortx_cluster_health():
@@ -911,44 +911,48 @@ def pytest_runtest_logreport(report: "TestReport") -> None:
         with open(test_log, 'w') as fp:
             for rec in logs:
                 fp.write(rec + '\n')
-        LOGGER.info("Uploading test log file to NFS server")
+        LOGGER.info("Queuing test log file for upload to NFS server")
         remote_path = getattr(report, 'logpath').replace(":", "_")
-        resp = system_utils.mount_upload_to_server(host_dir=params.NFS_SERVER_DIR,
-                                                   mnt_dir=params.MOUNT_DIR,
-                                                   remote_path=remote_path,
-                                                   local_path=test_log)
-        if resp[0]:
-            LOGGER.info("Log file is uploaded at location : %s", resp[1])
-        else:
-            LOGGER.error("Failed to upload log file at location %s", resp[1])
+        shipper = get_log_shipper()
+        future = shipper.submit(test_log, remote_path)
         upload_supporting_logs(test_id, remote_path, "s3bench")
         upload_supporting_logs(test_id, remote_path, "")
         upload_supporting_logs(test_id, remote_path, "csm_gui")
-        LOGGER.info("Adding log file path to %s", test_id)
-        comment = "Log file path: {}".format(os.path.join(resp[1], name))
-        if Globals.JIRA_UPDATE:
-            jira_id, jira_pwd = get_jira_credential()
-            task = jira_utils.JiraTask(jira_id, jira_pwd)
-            try:
-                if Globals.tp_meta['te_meta']['te_id'] == Globals.TE_TKT:
-                    test_run_id = next(d['test_run_id'] for i, d in enumerate(
-                        Globals.tp_meta['test_meta']) if d['test_id'] ==
-                                       test_id)
-                    resp = task.update_execution_details(
-                        test_run_id=test_run_id, test_id=test_id,
-                        comment=comment)
-                    if resp:
-                        LOGGER.info("Added execution details comment in: %s",
-                                    test_id)
-                    else:
-                        LOGGER.error("Failed to comment to %s", test_id)
+        # comment location where log is actually shipped once shipping is done
+        future.add_done_callback(lambda shipped: comment_log_path(test_id, shipped))
+
+
+def comment_log_path(test_id: str, shipped: Future) -> None:
+    """Add location of shipped test log to test execution in Jira."""
+    if shipped.exception() is not None:
+        return
+    log_location = shipped.result()
+    LOGGER.info("Log file uploaded at location : %s", log_location)
+    LOGGER.info("Adding log file path to %s", test_id)
+    comment = "Log file path: {}".format(log_location)
+    if Globals.JIRA_UPDATE:
+        jira_id, jira_pwd = get_jira_credential()
+        task = jira_utils.JiraTask(jira_id, jira_pwd)
+        try:
+            if Globals.tp_meta['te_meta']['te_id'] == Globals.TE_TKT:
+                test_run_id = next(d['test_run_id'] for i, d in enumerate(
+                    Globals.tp_meta['test_meta']) if d['test_id'] ==
+                                   test_id)
+                resp = task.update_execution_details(
+                    test_run_id=test_run_id, test_id=test_id,
+                    comment=comment)
+                if resp:
+                    LOGGER.info("Added execution details comment in: %s",
+                                test_id)
                 else:
-                    LOGGER.error("Failed to get correct TE id. \nExpected: "
-                                 "%s\nActual: %s", Globals.TE_TKT,
-                                 Globals.tp_meta['te_meta']['te_id'])
-            except KeyError:
-                LOGGER.error("KeyError: Failed to add log file path to %s",
-                             test_id)
+                    LOGGER.error("Failed to comment to %s", test_id)
+            else:
+                LOGGER.error("Failed to get correct TE id. \nExpected: "
+                             "%s\nActual: %s", Globals.TE_TKT,
+                             Globals.tp_meta['te_meta']['te_id'])
+        except KeyError:
+            LOGGER.error("KeyError: Failed to add log file path to %s",
+                         test_id)
 
 
 @pytest.fixture(scope='function')
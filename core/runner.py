@@ -25,16 +25,16 @@ import os
 import pathlib
 import secrets
 import threading
-import random
 import uuid
 import logging
 from collections import deque
 from typing import Tuple
 from typing import Optional
 from typing import Any
+from commons import params
 from config import CMN_CFG
-from libs.di.di_run_man import RunDataCheckManager
 from libs.di.di_mgmt_ops import ManagementOPs
+from libs.di.load_generator import BackgroundLoad
 
 LOGGER = logging.getLogger(__name__)
 
@@ -138,25 +138,32 @@ def cleanup():
 
 
 def run_global_io_async(args, event):
+    """
+    Run rate controlled background IO until event is set. Users and buckets are created
+    once and reused for the whole run.
+    :param args: contains testrunner args
+    :param event: threading event object to stop background IO
+    :return: background IO summary, None if users could not be created
+    """
     mgm_ops = ManagementOPs()
-    secret_range = random.SystemRandom()
-    prefs_dict = {'prefix_dir': f"global_io_{uuid.uuid4().hex}"}
-    while not event.is_set():
+    users_buckets = None
+    while users_buckets is None and not event.is_set():
         try:
-            users = mgm_ops.create_account_users(
-                nusers=5, use_cortx_cli=False)
-            users_buckets = mgm_ops.create_buckets(
-                nbuckets=2, users=users)
-        except BaseException as error:
-            continue
-        file_counts = secret_range.randint(10, 15)
-        run_data_check_obj = RunDataCheckManager(users=users_buckets)
-        run_data_check_obj.start_io_async(
-            users=users_buckets, buckets=None, files_count=file_counts,
-            prefs=prefs_dict)
-        run_data_check_obj.stop_io_async(
-            users=users_buckets, di_check=args.data_integrity_chk,
-            eventual_stop=True)
+            users = mgm_ops.create_account_users(nusers=params.BG_IO_NUSERS,
+                                                 use_cortx_cli=False)
+            users_buckets = mgm_ops.create_buckets(nbuckets=params.BG_IO_NBUCKETS,
+                                                   users=users)
+        except Exception as error:
+            LOGGER.error("Background IO users and buckets creation failed: %s", error)
+            event.wait(30)
+    if users_buckets is None:
+        return None
+    load = BackgroundLoad(users_buckets, prefix=f"global-io-{uuid.uuid4().hex}")
+    summary = load.run(event, verify=args.data_integrity_chk)
+    if summary['mismatches'] or summary.get('verify_failures'):
+        LOGGER.error("Background IO data integrity failures: %s",
+                     summary['mismatch_report'] + summary.get('verify_failures', []))
+    return summary
 
 
 def start_parallel_io(args):
@@ -0,0 +1,154 @@
+# -*- coding: utf-8 -*-
+# !/usr/bin/python
+#
+# Copyright (c) 2022 Seagate Technology LLC and/or its Affiliates
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published
+# by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+#
+# For any questions about this software or licensing,
+# please email opensource@seagate.com or cortx-questions@seagate.com.
+#
+"""Session wide index of collected test items used for test selection."""
+import json
+import logging
+import os
+from typing import Iterable
+from typing import List
+from typing import Tuple
+
+from filelock import FileLock
+
+LOGGER = logging.getLogger(__name__)
+
+TEST_INDEX_JSON = 'test_index.json'
+
+
+class TestIndex:
+    """
+    Precomputed nodeid -> (test_id, marks) and test_id -> nodeids maps.
+    Markers of an item are walked only once per session; every selection after that
+    is a dict/set lookup. The index is dumped in the directory shared by xdist
+    controller and workers so that workers reuse it instead of rebuilding it.
+    """
+
+    __test__ = False  # not a pytest test class
+
+    def __init__(self, entries: dict = None) -> None:
+        self.entries = entries if entries else dict()
+        self.tags = dict()
+        for nodeid, entry in self.entries.items():
+            if entry['test_id']:
+                self.tags.setdefault(entry['test_id'], []).append(nodeid)
+
+    @staticmethod
+    def _item_entry(item) -> dict:
+        """Walk markers of a single item."""
+        test_id = ''
+        marks = list()
+        for mark in item.iter_markers():
+            if mark.name == 'tags':
+                test_id = mark.args[0]
+            else:
+                marks.append(mark.name)
+        return dict(test_id=test_id, marks=marks, parallel='parallel' in marks)
+
+    def add_item(self, item) -> dict:
+        """Index an item and return its entry."""
+        entry = self._item_entry(item)
+        self.entries[item.nodeid] = entry
+        if entry['test_id']:
+            self.tags.setdefault(entry['test_id'], []).append(item.nodeid)
+        return entry
+
+    def entry(self, item) -> dict:
+        """Return entry of an item, indexing it when it was not collected by the builder."""
+        entry = self.entries.get(item.nodeid)
+        if entry is None:
+            entry = self.add_item(item)
+        return entry
+
+    def test_id(self, item) -> str:
+        """Test id (tags marker) of an item."""
+        return self.entry(item)['test_id']
+
+    def marks(self, item) -> List:
+        """Marker names of an item except tags marker."""
+        return self.entry(item)['marks']
+
+    def nodeids(self, test_id: str) -> List:
+        """Nodeids tagged with given test id."""
+        return self.tags.get(test_id, [])
+
+    def select(self, items: Iterable, required_tests: Iterable,
+               is_parallel: bool = None) -> Tuple[List, List]:
+        """
+        Select items whose test id is in required tests.
+        :param items: collected items
+        :param required_tests: test ids e.g. ['TEST-17413', 'TEST-17414']
+        :param is_parallel: When not None select items with matching parallel marker.
+        :return: selected items and their test ids
+        """
+        required = frozenset(required_tests or ())
+        selected_items = []
+        selected_tests = []
+        for item in items:
+            entry = self.entry(item)
+            if not entry['test_id'] or entry['test_id'] not in required:
+                continue
+            if is_parallel is not None and entry['parallel'] != is_parallel:
+                continue
+            selected_items.append(item)
+            selected_tests.append(entry['test_id'])
+        return selected_items, selected_tests
+
+    def dump(self, path: str) -> str:
+        """Write index as json."""
+        with open(path, 'w') as index_file:
+            json.dump(self.entries, index_file)
+        return path
+
+    @classmethod
+    def load(cls, path: str) -> 'TestIndex':
+        """Read index written by dump."""
+        with open(path, 'r') as index_file:
+            return cls(json.load(index_file))
+
+    @classmethod
+    def from_items(cls, items: Iterable) -> 'TestIndex':
+        """Build index with a single walk over markers of collected items."""
+        index = cls()
+        for item in items:
+            index.add_item(item)
+        return index
+
+
+def get_session_index(items: Iterable, shared_dir: str = None) -> TestIndex:
+    """
+    Build the index once per session. First process (xdist controller or worker)
+    to take the lock builds and dumps it to the shared directory, others load it.
+    :param items: collected items
+    :param shared_dir: directory shared between xdist controller and workers
+    """
+    if not shared_dir or not os.path.isdir(shared_dir):
+        return TestIndex.from_items(items)
+    path = os.path.join(shared_dir, TEST_INDEX_JSON)
+    with FileLock(path + '.lock'):
+        if os.path.isfile(path):
+            try:
+                LOGGER.debug("Loading test index from %s", path)
+                return TestIndex.load(path)
+            except (OSError, ValueError) as error:
+                LOGGER.warning("Rebuilding test index, failed to load %s: %s", path, error)
+        index = TestIndex.from_items(items)
+        index.dump(path)
+        LOGGER.debug("Test index with %s items dumped at %s", len(index.entries), path)
+    return index
@@ -27,6 +27,7 @@ from requests.packages.urllib3.exceptions import InsecureRequestWarning
 
 from commons import constants
 from commons.constants import Rest as const
+from commons.cortxlogging import LazyMessage
 from config import CMN_CFG
 
 
@@ -52,6 +53,14 @@ class RestClient:
             "jsonfile"] if 'jsonfile' in self._config else const.JOSN_FILE
         self.secure_connection = self._config["secure"]
 
+    @staticmethod
+    def _response_body(response_object):
+        """Response json or text, used for lazy logging of response."""
+        try:
+            return "JSON {}".format(response_object.json())
+        except BaseException:
+            return "Text {}".format(response_object.text)
+
     # pylint: disable=too-many-arguments
     def rest_call(self, request_type, endpoint=None,
                   data=None, headers=None, params=None, json_dict=None,
@@ -77,7 +86,7 @@ class RestClient:
         self.log.debug("Request type : %s", request_type.upper())
         self.log.debug("Header : %s", headers)
         self.log.debug("Parameters : %s", params)
-        self.log.debug("json_dict: %s", json.dumps(json_dict))
+        self.log.debug("json_dict: %s", LazyMessage(json.dumps, json_dict))
         # TODO: Need to be verified and fix by CSM team. Temporary fix for s3 failures
         if CMN_CFG.get("product_family") == constants.PROD_FAMILY_LC:
             # To Resolve {'error_code': '4099', 'message': 'Invalid request message received.',
@@ -89,10 +98,7 @@ class RestClient:
             request_url, headers=headers,
             data=data, params=params, verify=False, json=json_dict)
         self.log.debug("Response Object: %s", response_object)
-        try:
-            self.log.debug("Response JSON: %s", response_object.json())
-        except BaseException:
-            self.log.debug("Response Text: %s", response_object.text)
+        self.log.debug("Response: %s", LazyMessage(self._response_body, response_object))
         # Can be used in case of larger response
         if save_json:
             with open(self._json_file_path, 'w+') as json_file:
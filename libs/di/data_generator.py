@@ -18,18 +18,19 @@
 # please email opensource@seagate.com or cortx-questions@seagate.com.
 #
 """Generate test data for S3 I/O with desired compression, duplication and formats.
-Size could be as small as 1 byte to 1 GB.
+Size could be as small as 1 byte to 1 GB when generated in memory, larger objects
+(up to 5 GB) should be streamed in chunks with iter_chunks or stream.
 """
+import io
 import os
 import logging
-import array
 import random
 import zlib
 import hashlib
 import string
-from typing import Union
 from typing import Tuple
 from typing import Any
+from typing import Iterator
 from Crypto.Cipher import AES
 from pathlib import Path
 from commons import params
@@ -38,11 +39,18 @@ from libs.di.file_formats import *
 KB = 1024
 MB = KB * KB
 CMN_BUF = 'i' * MB
+BLOCK_SIZE = MB  # unit of content layout, every block honours the compression ratio
+CMN_BYTES = b'i' * BLOCK_SIZE
+ZERO_BUF = bytes(BLOCK_SIZE)
+DEF_CHUNK_SIZE = 8 * MB
 DEF_COMPRESS_LEVEL = 4
 DEFAULT_DATA_TYPE = 1
 ZEROED_DATA_TYPE = 2
 U_LIMIT = 10 ** 6
 CMPR_RATIOS = (1, 2, 3, 4, 5, 6, 7, 8)
+# printable alphabet keystream bytes are mapped to for text objects
+TEXT_ALPHABET = (string.ascii_letters + string.digits + ' \n').encode('ascii')
+TEXT_TABLE = bytes(TEXT_ALPHABET[byte % len(TEXT_ALPHABET)] for byte in range(256))
 SMALL_BLOCK_SIZES = [4 * KB, 8 * KB, 16 * KB, 32 * KB, 64 * KB, 128 * KB]
 MEDIUM_BLOCK_SIZES = [4 * MB, 8 * MB, 16 * MB, 21 * MB, 32 * MB, 64 * MB, 128 * MB]
 
@@ -71,8 +79,16 @@ class DataGenerator:
 
     def __init__(self,
                  c_ratio: int = 1,
-                 embed_csum_in_name: bool = True) -> None:
+                 embed_csum_in_name: bool = True,
+                 text: bool = False) -> None:
+        """
+        :param c_ratio: compression ratio
+        :param embed_csum_in_name: embed checksum in generated object names
+        :param text: generate printable text, incompressible region is mapped to a 64
+        character alphabet
+        """
         self.compression_ratio = c_ratio
+        self.text = text
         self.append_csum_file_name = embed_csum_in_name
         self.compressibility = int(100 - (1.0 / self.compression_ratio * 100))
         self.secret = '0123456789abcdef' * 2
@@ -81,67 +97,142 @@ class DataGenerator:
     def generate(self,
                  size: int,
                  datatype: int = DEFAULT_DATA_TYPE,
-                 seed: int = None) -> Union[Tuple[str, Any], Tuple[Union[int, bytes], Any]]:
+                 seed: int = None,
+                 csum_algo: str = 'sha1') -> Tuple[bytearray, str]:
 
-        """Assume size is less than 5GB.
-        Keeping de-dupe and compression ratio separate for avoiding complexity in buffer
-        stream.
+        """Generate size bytes in a preallocated buffer and checksum it in the same pass.
+        Content is fully determined by (seed, size, compression ratio); every BLOCK_SIZE
+        block starts with an AES-CTR keystream region of block_len / c_ratio bytes followed
+        by a compressible pattern.
 
             compressibility (in %) = 100 - (1.0/compression_ratio * 100)
 
+        :param size: object size in bytes
+        :param datatype: DEFAULT_DATA_TYPE or ZEROED_DATA_TYPE
+        :param seed: seed of incompressible data, random seed is used when not given
+        :param csum_algo: hashlib algorithm of returned checksum
+        :return: buffer and hex digest
         """
-        csum = hashlib.sha1()
+        csum = hashlib.new(csum_algo)
+        buf = bytearray(size)
         if size == 0:
-            buf = ''
-            csum.update(buf)
-            chksum = csum.hexdigest()
-            return buf, chksum
-
-        if datatype == DEFAULT_DATA_TYPE:
-            # Ignoring de-dupe ratio for blobs.
-            if self.compression_ratio >= 1:
-                compressibility = int(100 - (1 / self.compression_ratio * 100))
-                buf = self.__get_data(size, compressibility, seed)
-        buf = buf.encode('utf-8')[:size]  # hack until better solution is found.
-        csum.update(buf)
-        chksum = csum.hexdigest()
-        return buf, chksum
+            return buf, csum.hexdigest()
+        if seed is None:
+            seed = self.get_random_seed()
+        view = memoryview(buf)
+        for off in range(0, size, BLOCK_SIZE):
+            blk_view = view[off:off + BLOCK_SIZE]
+            if datatype != ZEROED_DATA_TYPE:
+                self.fill(blk_view, seed, size, off)
+            csum.update(blk_view)
+        return buf, csum.hexdigest()
 
     @staticmethod
     def get_random_seed(lower: int = 0,
                         upper: int = U_LIMIT) -> int:
         return random.randint(lower, upper)
 
-    def __get_data(self, size, compressibility, seed=None):
-        buf = self.__get_uncompressible_buffer(compressibility, size, seed)
-        return str(buf) + self.__get_buf(size - len(buf))  # todo can be improved
+    def incompressible_len(self, block_len: int) -> int:
+        """Length of incompressible prefix of a block of block_len bytes."""
+        if self.compression_ratio <= 1:
+            return block_len
+        return int(round(block_len / self.compression_ratio))
 
-    def __get_buf(self, size):
-        if size <= 0:
-            return ''
+    def _cipher(self, seed: int, counter: int):
+        """AES-CTR keystream generator for seed positioned at 16 byte counter."""
+        key = hashlib.sha256(self.secret.encode('utf-8') + str(seed).encode('utf-8')).digest()
+        return AES.new(key[:16], AES.MODE_CTR, nonce=key[16:24], initial_value=counter)
 
-        if size > len(CMN_BUF):
-            return CMN_BUF + self.__get_buf(size - MB)
-        else:
-            return CMN_BUF[:size]
+    def fill(self, view: memoryview, seed: int, size: int, offset: int = 0) -> memoryview:
+        """
+        Fill view with object bytes [offset, offset + len(view)) of an object of given
+        seed and size. Any range can be regenerated without generating preceding data.
+        :param view: writable memoryview/bytearray
+        :param seed: object seed
+        :param size: object size, needed for compression ratio of last block
+        :param offset: offset of view in the object
+        """
+        view = memoryview(view)
+        pos, end, out = offset, offset + len(view), 0
+        while pos < end:
+            blk, boff = divmod(pos, BLOCK_SIZE)
+            blk_len = min(BLOCK_SIZE, size - blk * BLOCK_SIZE)
+            inc = self.incompressible_len(blk_len)
+            count = min(blk_len - boff, end - pos)
+            if boff < inc:
+                ks_len = min(inc - boff, count)
+                skip = boff % AES.block_size
+                cipher = self._cipher(seed, blk * (BLOCK_SIZE // AES.block_size)
+                                      + boff // AES.block_size)
+                if skip:
+                    cipher.encrypt(ZERO_BUF[:skip])
+                cipher.encrypt(ZERO_BUF[:ks_len], output=view[out:out + ks_len])
+                if self.text:
+                    view[out:out + ks_len] = view[out:out + ks_len].tobytes().translate(TEXT_TABLE)
+                out += ks_len
+                pos += ks_len
+                count -= ks_len
+            if count > 0:
+                view[out:out + count] = CMN_BYTES[:count]
+                out += count
+                pos += count
+        return view
 
-    def __get_uncompressible_buffer(self, compressibility, size, seed=None):
-        if not seed:
-            unc_buf = os.urandom(size)
-            return unc_buf[0: int((size * (1.0 - compressibility / 100.0)))]
-        else:
-            buf = array.array('l', [seed] * size).tobytes()
-            buf = self.encrypt_buf(buf)
-            buf = buf[0: int((size * (1.0 - compressibility / 100.0)))]
-            return buf
+    def iter_chunks(self,
+                    size: int,
+                    seed: int,
+                    chunk_size: int = DEF_CHUNK_SIZE,
+                    offset: int = 0,
+                    csum: Any = None,
+                    reuse_buffer: bool = True) -> Iterator[memoryview]:
+        """
+        Yield object of given (seed, size) in chunk_size chunks without building it in
+        memory. Chunks can be written to a file, passed to upload_part or hashed.
+        :param size: object size
+        :param seed: object seed
+        :param chunk_size: size of yielded chunks, last one can be smaller
+        :param offset: start yielding from this object offset
+        :param csum: optional hashlib object updated with every chunk
+        :param reuse_buffer: yield views of a single chunk buffer, consume a chunk before
+        asking for next. Set False when chunks are kept around e.g. submitted to threads.
+        """
+        buf = bytearray(min(chunk_size, max(size - offset, 0))) if reuse_buffer else None
+        for off in range(offset, size, chunk_size):
+            length = min(chunk_size, size - off)
+            view = memoryview(buf)[:length] if reuse_buffer else memoryview(bytearray(length))
+            self.fill(view, seed, size, off)
+            if csum is not None:
+                csum.update(view)
+            yield view
+
+    def stream(self, size: int, seed: int) -> 'DataStream':
+        """Seekable read only file object over generated object, see DataStream."""
+        return DataStream(self, size, seed)
+
+    def checksum(self, size: int, seed: int, csum_algo: str = 'md5',
+                 chunk_size: int = DEF_CHUNK_SIZE) -> str:
+        """Checksum of generated object computed chunk by chunk."""
+        csum = hashlib.new(csum_algo)
+        for _ in self.iter_chunks(size, seed, chunk_size=chunk_size, csum=csum):
+            pass
+        return csum.hexdigest()
+
+    def write_to_file(self, name: str, size: int, seed: int,
+                      chunk_size: int = DEF_CHUNK_SIZE, csum_algo: str = 'sha1') -> str:
+        """Write generated object to a file chunk by chunk and return its checksum."""
+        csum = hashlib.new(csum_algo)
+        with open(name, 'wb') as fd:
+            for chunk in self.iter_chunks(size, seed, chunk_size=chunk_size, csum=csum):
+                fd.write(chunk)
+        return csum.hexdigest()
 
     def encrypt_buf(self, buf):
         blksz = 16
         sz = len(buf)
         pad = 'z'
         if sz % blksz:
-            pad = ' ' * (blksz - sz % blksz)
-            buf = ''.join([buf, pad])
+            pad = b' ' * (blksz - sz % blksz)
+            buf = b''.join([buf, pad])
 
         aes = AES.new(self.secret.encode('utf-8'), AES.MODE_OFB, self.iv.encode('utf-8'))
         buf = aes.encrypt(buf)
@@ -149,13 +240,8 @@ class DataGenerator:
             buf = buf[:sz]
         return buf
 
-    def save_buf_to_file(self,
-                         fbuf: Any,
-                         csum: str,
-                         size: int,
-                         data_folder_prefix: str,
-                         min_sz: int = 5,
-                         max_sz: int = 10) -> str:
+    def get_object_name(self, csum: str, min_sz: int = 5, max_sz: int = 10) -> str:
+        """Random object/file name with checksum embedded when enabled."""
         name = ''
         ext = random.sample(all_extensions, 1)[0]
         for i in range(random.randrange(min_sz, max_sz)):
@@ -163,6 +249,16 @@ class DataGenerator:
         if self.append_csum_file_name:
             name += '_' + csum
         name += '_' + 'cx' + ext
+        return name
+
+    def save_buf_to_file(self,
+                         fbuf: Any,
+                         csum: str,
+                         size: int,
+                         data_folder_prefix: str,
+                         min_sz: int = 5,
+                         max_sz: int = 10) -> str:
+        name = self.get_object_name(csum, min_sz, max_sz)
         if size < 1024:
             iosize = 1024
         elif (size >= 1024) & (size < 1024 * 1024):
@@ -234,6 +330,50 @@ class DataGenerator:
         return buffer
 
 
+class DataStream(io.RawIOBase):
+    """
+    Read only, seekable file like object over a generated object. Bytes are generated on
+    read so memory is bounded by read size; usable with upload_fileobj/put_object.
+    """
+
+    def __init__(self, generator: DataGenerator, size: int, seed: int) -> None:
+        super().__init__()
+        self.generator = generator
+        self.size = size
+        self.seed = seed
+        self.pos = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def tell(self) -> int:
+        return self.pos
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        if whence == io.SEEK_SET:
+            pos = offset
+        elif whence == io.SEEK_CUR:
+            pos = self.pos + offset
+        elif whence == io.SEEK_END:
+            pos = self.size + offset
+        else:
+            raise ValueError("invalid whence {}".format(whence))
+        if pos < 0:
+            raise ValueError("negative seek position {}".format(pos))
+        self.pos = pos
+        return self.pos
+
+    def readinto(self, buffer) -> int:
+        length = min(len(buffer), max(self.size - self.pos, 0))
+        if length:
+            self.generator.fill(memoryview(buffer)[:length], self.seed, self.size, self.pos)
+            self.pos += length
+        return length
+
+
 if __name__ == '__main__':
     # Test Data Generator here.
     d = DataGenerator(c_ratio=1)
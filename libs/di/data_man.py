@@ -43,6 +43,8 @@ framework. It acts as a hash cache storing the server state on client side.
             ]
         }
 }
+DataManager is a per user view of the upload manifest (libs/di/manifest.py), which is the
+single store of uploaded objects. export_to_json dumps the above layout.
 """
 import os
 import logging
@@ -53,6 +55,7 @@ from commons import params
 from commons.utils import system_utils
 from commons.utils import config_utils
 from commons.exceptions import CortxTestException
+from libs.di.manifest import UploadManifest
 
 # Container level
 C_LEVEL_TOP = 1
@@ -65,13 +68,49 @@ LOGGER = logging.getLogger(__name__)
 class DataManager(object):
     """ Save objects meta data that went to storage for each test."""
 
-    def __init__(self):
+    def __init__(self, manifest_path=params.UPLOAD_MANIFEST):
         self.buckets = list()
         self.change_tracker = dict()
         self.state = dict()
         self.rlock = threading.Lock()
         self.wlock = threading.Lock()
         self.plock = multiprocessing.Lock()
+        self.manifest = UploadManifest(manifest_path)
+
+    def close(self):
+        """Close manifest connection of calling thread."""
+        self.manifest.close()
+
+    @staticmethod
+    def _entry_to_file(entry):
+        return dict(name=entry['key'], checksum=entry['md5'], sz=entry['size'],
+                    seed=entry['seed'], mtime=entry['updated'])
+
+    def _user_files(self, user):
+        """Live manifest entries of user ordered by bucket and name."""
+        return sorted(self.manifest.live_objects(users=[user]),
+                      key=lambda entry: (entry['bucket'], entry['key']))
+
+    def get_file(self, user, bucket, name):
+        """Lookup a single object entry, None if not present."""
+        entry = self.manifest.get(bucket, name)
+        if entry is None or entry['deleted'] is not None or entry['user'] != user:
+            return None
+        return self._entry_to_file(entry)
+
+    def get_bucket_files(self, user, bucket):
+        """Object entries of a bucket."""
+        return [self._entry_to_file(entry) for entry in self._user_files(user)
+                if entry['bucket'] == bucket]
+
+    def export_to_json(self, user):
+        """Dump user entries to user meta json in the layout described in module doc."""
+        data = self.get_container(level=C_LEVEL_USER)
+        data['name'] = user
+        data['buckets'] = self.get_all_buckets_data_for_user(user) or list()
+        fpath = self.prepare_file_data(user)
+        config_utils.create_content_json(fpath, data, ensure_ascii=True)
+        return fpath
 
     def prepare_file_data(self, user):
         """Read data before saving."""
@@ -103,18 +142,13 @@ class DataManager(object):
     def get_all_buckets_data_for_user(self, user):
         if user is None:
             raise ValueError('user is mandatory')
-
-        fpath = self.prepare_file_data(user)
-        # improve with ijson lib
-        data = config_utils.read_content_json(fpath=fpath)
-        if data:
-            if user != data['name']:
-                return None
-            if not data['buckets']:
-                return None
-            return data['buckets']
-        else:
-            return None
+        buckets = dict()
+        for entry in self._user_files(user):
+            if entry['bucket'] not in buckets:
+                buckets[entry['bucket']] = self.get_container(level=C_LEVEL_BUCKET)
+                buckets[entry['bucket']]['name'] = entry['bucket']
+            buckets[entry['bucket']]['files'].append(self._entry_to_file(entry))
+        return list(buckets.values()) if buckets else None
 
     def get_files_within_bucket(self, bkt_container, bucket):
         if bucket is not None and bkt_container:
@@ -169,39 +203,15 @@ class DataManager(object):
         return container, False  # anyway return an empty container
 
     def add_file_to_bucket(self, user, bucket, file_dict):
-        """The updates within process will be in-memory and then persisted to json."""
-        file_obj, checksum = file_dict['name'], file_dict['checksum']
-        size, seed, mtime = file_dict['size'], file_dict['seed'], file_dict['mtime']
-        data = dict()
-        if bucket is not None:
-            with self.wlock:
-                fpath = self.prepare_file_data(user)
-                data = config_utils.read_content_json(fpath=fpath)
-                if not data or user != data['name']:
-                    data = self.get_container(level=C_LEVEL_USER)
-                    data['name'] = user
-                bkt_container, flag = self._get_bucket_container_from_buckets(data, bucket, user)
-
-                # usage files = self.get_files_within_bucket(bkt_container, user, bucket)
-                fdict = self.get_file_within_bucket(file_obj, bkt_container, bucket)
-                if not fdict:
-                    # format of fdict is name=a.txt, chksum=abcd, seed=1, size=1024
-                    fdict = dict(name=file_obj, checksum=checksum,
-                                 sz=size, seed=seed, mtime=mtime)
-                    bkt_container['files'].append(fdict)
-                else:
-                    fdict['checksum'] = checksum
-                    fdict['sz'] = size
-                    fdict['seed'] = seed
-                    fdict['mtime'] = mtime
-
-                if not flag:
-                    data['buckets'].append(bkt_container)
-
-                self.store_file_data(data, user)
-
-    def delete_file_from_bucket(self):
-        raise NotImplementedError('coming soon')
+        """Record object in manifest, re-upload of a name bumps its version."""
+        if bucket is None:
+            return
+        self.manifest.add(user, bucket, file_dict['name'], file_dict['checksum'],
+                          seed=file_dict['seed'], size=file_dict['size'])
+
+    def delete_file_from_bucket(self, user, bucket, name):
+        """Tombstone object entry."""
+        self.manifest.tombstone(bucket, name)
 
     def update_file_in_bucket(self):
         raise NotImplementedError('Currently add file takes care of it')
@@ -0,0 +1,152 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+#
+# Copyright (c) 2022 Seagate Technology LLC and/or its Affiliates
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published
+# by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+#
+# For any questions about this software or licensing,
+# please email opensource@seagate.com or cortx-questions@seagate.com.
+#
+"""Declarative data profiles.
+A profile describes object size distribution, compression ratio mix, dedupe ratio and
+text/binary mix. objects() realizes it as a reproducible sequence of object specs, each
+spec is generated by DataGenerator from its seed so content never needs to be stored.
+"""
+import logging
+import random
+from typing import Iterable
+from typing import Iterator
+from typing import Tuple
+
+import yaml
+
+from commons import params
+from libs.di.data_generator import DataGenerator
+
+LOGGER = logging.getLogger(__name__)
+
+SEED_BITS = 62
+
+
+class DataProfile:
+    """
+    Usage:
+    profile = DataProfile.load('di_mixed')
+    for spec in profile.objects(1000, seed=42):
+        buf, md5 = profile.generator(spec).generate(spec['size'], seed=spec['seed'],
+                                                    csum_algo='md5')
+    """
+
+    def __init__(self,
+                 name: str,
+                 sizes: Iterable[Tuple[int, int, float]],
+                 compression: Iterable[Tuple[int, float]] = ((1, 1),),
+                 dedupe_ratio: float = 1,
+                 text_ratio: float = 0,
+                 max_size: int = None) -> None:
+        """
+        :param name: profile name
+        :param sizes: (min, max, weight) size ranges, size is uniform within a range
+        :param compression: (c_ratio, weight) compression ratio mix
+        :param dedupe_ratio: objects / unique contents, >= 1
+        :param text_ratio: fraction of objects with printable text content
+        :param max_size: cap of object size, ranges above it are dropped and a range
+        crossing it is clipped
+        """
+        self.name = name
+        self.sizes = [tuple(size) for size in sizes]
+        self.compression = [tuple(ratio) for ratio in compression]
+        if not self.sizes or any(low > high for low, high, _ in self.sizes):
+            raise ValueError(f'Invalid size ranges {self.sizes} of profile {name}')
+        self.max_size = max_size
+        if max_size is not None:
+            self.sizes = [(low, min(high, max_size), weight)
+                          for low, high, weight in self.sizes if low <= max_size]
+            if not self.sizes:
+                raise ValueError(f'No size range of profile {name} is within {max_size}')
+        if dedupe_ratio < 1:
+            raise ValueError(f'Dedupe ratio {dedupe_ratio} of profile {name} is less than 1')
+        if not 0 <= text_ratio <= 1:
+            raise ValueError(f'Text ratio {text_ratio} of profile {name} is not in [0, 1]')
+        self.dedupe_ratio = dedupe_ratio
+        self.text_ratio = text_ratio
+
+    def __repr__(self) -> str:
+        return (f'DataProfile({self.name!r}, sizes={self.sizes}, compression={self.compression}'
+                f', dedupe_ratio={self.dedupe_ratio}, text_ratio={self.text_ratio}'
+                f', max_size={self.max_size})')
+
+    @classmethod
+    def from_dict(cls, name: str, spec: dict) -> 'DataProfile':
+        """Profile from a profiles file entry."""
+        return cls(name, spec['sizes'], spec.get('compression', ((1, 1),)),
+                   spec.get('dedupe_ratio', 1), spec.get('text_ratio', 0),
+                   spec.get('max_size'))
+
+    @classmethod
+    def load(cls, name: str, path: str = params.DI_DATA_PROFILES) -> 'DataProfile':
+        """Named profile of a profiles YAML file."""
+        with open(path) as profiles_file:
+            profiles = yaml.safe_load(profiles_file)
+        if name not in profiles:
+            raise KeyError(f'Data profile {name} not found in {path}')
+        return cls.from_dict(name, profiles[name])
+
+    @classmethod
+    def from_dataset_cfg(cls, path: str, **kwargs) -> 'DataProfile':
+        """
+        Profile from a tools/datagen dataset cfg of "<upper size> <percent>" lines, sizes
+        of a line are between upper size of previous line and its own.
+        """
+        sizes, low = list(), 0
+        with open(path) as cfg:
+            for line in cfg:
+                fields = line.split()
+                if len(fields) < 2:
+                    continue
+                sizes.append((low, int(fields[0]), float(fields[1])))
+                low = int(fields[0])
+        return cls(path, sizes, **kwargs)
+
+    def pick_size(self, rng: random.Random) -> int:
+        """Size from size ranges."""
+        low, high, _ = rng.choices(self.sizes, weights=[size[2] for size in self.sizes])[0]
+        return rng.randint(low, high)
+
+    def pick_c_ratio(self, rng: random.Random) -> int:
+        """Compression ratio from compression mix."""
+        return rng.choices(self.compression, weights=[ratio[1] for ratio in self.compression])[0][0]
+
+    def objects(self, count: int, seed: int = None) -> Iterator[dict]:
+        """
+        Realize profile as count object specs, same seed gives same specs.
+        A spec is a duplicate of an earlier unique spec with probability
+        1 - 1 / dedupe_ratio so objects / unique contents approaches dedupe_ratio.
+        :return: dicts with index, seed, size, c_ratio, text and duplicate flag
+        """
+        rng = random.Random(seed)
+        uniques = list()
+        for index in range(count):
+            if uniques and rng.random() >= 1 / self.dedupe_ratio:
+                yield dict(rng.choice(uniques), index=index, duplicate=True)
+                continue
+            spec = dict(index=index, seed=rng.getrandbits(SEED_BITS), size=self.pick_size(rng),
+                        c_ratio=self.pick_c_ratio(rng), text=rng.random() < self.text_ratio,
+                        duplicate=False)
+            uniques.append(spec)
+            yield spec
+
+    @staticmethod
+    def generator(spec: dict) -> DataGenerator:
+        """Generator of spec content."""
+        return DataGenerator(c_ratio=spec['c_ratio'], text=spec['text'])
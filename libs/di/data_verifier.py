@@ -0,0 +1,312 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+#
+# Copyright (c) 2022 Seagate Technology LLC and/or its Affiliates
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published
+# by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+#
+# For any questions about this software or licensing,
+# please email opensource@seagate.com or cortx-questions@seagate.com.
+#
+"""Verify downloaded data against content regenerated from the object seed.
+Generated objects are fully determined by (seed, size, compression ratio) so expected
+bytes are regenerated chunk by chunk and compared in memory, no local file is needed.
+Objects without a seed are verified by hashing the get_object stream, large objects
+are fetched with concurrent ranged GETs and hashed in order. RangeVerifier checks many
+random or strided ranges of objects against regenerated bytes without full downloads.
+"""
+import hashlib
+import logging
+import math
+import random
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any
+from typing import Iterable
+from typing import List
+from typing import Tuple
+
+from libs.di.data_generator import DataGenerator
+from libs.di.data_generator import DEF_CHUNK_SIZE
+
+LOGGER = logging.getLogger(__name__)
+
+CMP_PAGE_SIZE = 4096
+READ_SIZE = 8 * 1024 * 1024
+RANGE_SIZE = 16 * 1024 * 1024  # objects larger than this are fetched in ranges
+RANGE_WORKERS = 4
+RANGES_PER_OBJECT = 8
+RANGE_READ_SIZE = 1024 * 1024  # max bytes per verified range
+RANDOM, STRIDED = 'random', 'strided'
+
+
+def first_mismatch(actual: Any, expected: Any) -> int:
+    """
+    Index of first differing byte of two equal length buffers, -1 when equal.
+    Pages are compared first so that only one page is scanned byte by byte.
+    """
+    actual, expected = memoryview(actual), memoryview(expected)
+    if actual == expected:
+        return -1
+    for page in range(0, len(actual), CMP_PAGE_SIZE):
+        if actual[page:page + CMP_PAGE_SIZE] != expected[page:page + CMP_PAGE_SIZE]:
+            for idx in range(page, min(page + CMP_PAGE_SIZE, len(actual))):
+                if actual[idx] != expected[idx]:
+                    return idx
+    return -1
+
+
+def compare_stream(reader: Any,
+                   size: int,
+                   seed: int,
+                   c_ratio: int = 1,
+                   offset: int = 0,
+                   length: int = None,
+                   chunk_size: int = DEF_CHUNK_SIZE,
+                   text: bool = False) -> dict:
+    """
+    Compare a stream against generated object of given seed and size.
+    :param reader: file like object with read(n) e.g. get_object Body or an open file
+    :param size: size of the generated object
+    :param seed: seed of the generated object
+    :param c_ratio: compression ratio used while generating the object
+    :param offset: object offset of first byte of the stream e.g. start of a range read
+    :param length: expected stream length, defaults to rest of the object
+    :param chunk_size: bytes read and regenerated per comparison
+    :param text: object was generated as text
+    :return: dict with match, mismatch_offset (object offset, -1 on match) and bytes_read.
+    Stream shorter or longer than expected mismatches at the expected/stream end.
+    """
+    end = size if length is None else min(offset + length, size)
+    gen = DataGenerator(c_ratio=c_ratio, text=text)
+    expected = bytearray(chunk_size)
+    pos = offset
+    while True:
+        data = reader.read(chunk_size)
+        if not data:
+            break
+        nread = len(data)
+        if pos + nread > end:
+            LOGGER.debug("Stream is longer than expected end %s", end)
+            return dict(match=False, mismatch_offset=max(pos, end),
+                        bytes_read=pos - offset + nread)
+        view = memoryview(expected)[:nread]
+        gen.fill(view, seed, size, pos)
+        idx = first_mismatch(data, view)
+        if idx >= 0:
+            return dict(match=False, mismatch_offset=pos + idx, bytes_read=pos - offset + nread)
+        pos += nread
+    if pos < end:
+        LOGGER.debug("Stream ended at %s before expected end %s", pos, end)
+        return dict(match=False, mismatch_offset=pos, bytes_read=pos - offset)
+    return dict(match=True, mismatch_offset=-1, bytes_read=pos - offset)
+
+
+def _read_range(client: Any, bucket: str, key: str, start: int, end: int) -> Tuple[bytes, int]:
+    """Get bytes [start, end] of an object and its total size from Content-Range."""
+    response = client.get_object(Bucket=bucket, Key=key, Range='bytes={}-{}'.format(start, end))
+    total = response.get('ContentRange', '').rpartition('/')[2]
+    return response['Body'].read(), int(total) if total.isdigit() else -1
+
+
+def hash_object(client: Any,
+                bucket: str,
+                key: str,
+                csum_algo: str = 'md5',
+                range_size: int = RANGE_SIZE,
+                nworkers: int = RANGE_WORKERS) -> Tuple[str, int]:
+    """
+    Hash an object without writing it to disk. First range tells object size; objects
+    larger than range_size are fetched by nworkers concurrent ranged GETs, at most
+    2 * nworkers ranges are held in memory and hashed in order.
+    :param client: boto3 S3 client
+    :param bucket: bucket name
+    :param key: object key
+    :param csum_algo: hashlib algorithm
+    :param range_size: bytes per ranged GET
+    :param nworkers: concurrent ranged GETs per object
+    :return: hex digest and number of bytes hashed
+    """
+    csum = hashlib.new(csum_algo)
+    try:
+        data, size = _read_range(client, bucket, key, 0, range_size - 1)
+    except client.exceptions.ClientError as error:
+        if error.response.get('Error', {}).get('Code') != 'InvalidRange':
+            raise
+        return csum.hexdigest(), 0  # empty object
+    csum.update(data)
+    nbytes = len(data)
+    if size <= range_size:
+        return csum.hexdigest(), nbytes
+    starts = iter(range(range_size, size, range_size))
+    with ThreadPoolExecutor(max_workers=nworkers) as executor:
+        pending = deque()
+        for start in starts:
+            pending.append(executor.submit(_read_range, client, bucket, key,
+                                           start, min(start + range_size, size) - 1))
+            if len(pending) >= 2 * nworkers:
+                break
+        while pending:
+            data, _ = pending.popleft().result()
+            csum.update(data)
+            nbytes += len(data)
+            start = next(starts, None)
+            if start is not None:
+                pending.append(executor.submit(_read_range, client, bucket, key,
+                                               start, min(start + range_size, size) - 1))
+    return csum.hexdigest(), nbytes
+
+
+def plan_ranges(size: int,
+                count: int = RANGES_PER_OBJECT,
+                range_size: int = RANGE_READ_SIZE,
+                mode: str = RANDOM,
+                rng: random.Random = None) -> List[Tuple[int, int]]:
+    """
+    Inclusive (start, end) byte ranges to verify in an object.
+    :param size: object size
+    :param count: number of ranges
+    :param range_size: max length of a range, random ranges have random length up to it
+    :param mode: RANDOM for random offsets, STRIDED for ranges spread at equal strides
+    :param rng: random generator, seeded one makes plan repeatable
+    """
+    if size <= 0 or count <= 0:
+        return []
+    if mode == STRIDED:
+        length = min(range_size, size)
+        stride = max((size - length) // max(count - 1, 1), 1)
+        starts = sorted({min(idx * stride, size - length) for idx in range(count)})
+        return [(start, start + length - 1) for start in starts]
+    if mode != RANDOM:
+        raise ValueError(f'Unknown range mode {mode}')
+    rng = rng or random.SystemRandom()
+    ranges = list()
+    for _ in range(count):
+        length = rng.randint(1, min(range_size, size))
+        start = rng.randint(0, size - length)
+        ranges.append((start, start + length - 1))
+    return ranges
+
+
+def verify_range(client: Any, entry: dict, start: int, end: int) -> dict:
+    """
+    Ranged GET of bytes [start, end] of an uploaded object compared with bytes
+    regenerated from its seed.
+    :param client: boto3 S3 client
+    :param entry: manifest entry with user, bucket, key, seed, size, c_ratio and text
+    :return: dict with object, range, match, mismatch_offset, bytes_read, ttfb and latency
+    seconds, error on request failure
+    """
+    result = dict(user=entry.get('user'), bucket=entry['bucket'], key=entry['key'],
+                  start=start, end=end, match=False, mismatch_offset=-1, bytes_read=0)
+    begin = time.perf_counter()
+    try:
+        response = client.get_object(Bucket=entry['bucket'], Key=entry['key'],
+                                     Range='bytes={}-{}'.format(start, end))
+        result['ttfb'] = time.perf_counter() - begin
+        result.update(compare_stream(response['Body'], entry['size'], entry['seed'],
+                                     c_ratio=entry.get('c_ratio') or 1, offset=start,
+                                     length=end - start + 1, text=bool(entry.get('text'))))
+    except Exception as error:
+        LOGGER.error("Range %s-%s of %s/%s failed with %s", start, end, entry['bucket'],
+                     entry['key'], error)
+        result['error'] = str(error)
+    result['latency'] = time.perf_counter() - begin
+    return result
+
+
+def _percentile(values: List[float], pct: float) -> float:
+    """Nearest rank percentile of sorted values."""
+    if not values:
+        return 0
+    return values[max(0, math.ceil(pct / 100 * len(values)) - 1)]
+
+
+class RangeVerifier:
+    """
+    Verify random or strided ranges of many objects with concurrent ranged GETs.
+    Usage:
+    verifier = RangeVerifier(di_base.init_s3_connections(users), mode=STRIDED)
+    summary = verifier.run(UploadManifest(params.UPLOAD_MANIFEST).live_objects(users))
+    """
+
+    def __init__(self,
+                 s3_objects: dict,
+                 nworkers: int = RANGE_WORKERS * 4,
+                 ranges_per_object: int = RANGES_PER_OBJECT,
+                 range_size: int = RANGE_READ_SIZE,
+                 mode: str = RANDOM,
+                 rng: random.Random = None) -> None:
+        """
+        :param s3_objects: user -> s3 resource (or client) dict
+        :param nworkers: concurrent ranged GETs
+        :param ranges_per_object: ranges verified per object
+        :param range_size: max bytes per range
+        :param mode: RANDOM or STRIDED
+        :param rng: random generator for RANDOM mode
+        """
+        self.s3_objects = s3_objects
+        self.nworkers = nworkers
+        self.ranges_per_object = ranges_per_object
+        self.range_size = range_size
+        self.mode = mode
+        self.rng = rng
+        self.lock = threading.Lock()
+
+    def _client(self, user: str) -> Any:
+        s3 = self.s3_objects[user]
+        return getattr(getattr(s3, 'meta', None), 'client', s3)
+
+    def plan(self, entries: Iterable[dict]) -> list:
+        """(entry, start, end) tasks of objects which can be regenerated from seed."""
+        tasks = list()
+        for entry in entries:
+            if entry.get('seed') is None or not entry.get('size'):
+                LOGGER.debug("Skipping %s/%s without seed", entry['bucket'], entry['key'])
+                continue
+            with self.lock:
+                ranges = plan_ranges(entry['size'], self.ranges_per_object, self.range_size,
+                                     self.mode, self.rng)
+            tasks.extend((entry, start, end) for start, end in ranges)
+        return tasks
+
+    def run(self, entries: Iterable[dict]) -> dict:
+        """
+        Verify planned ranges of entries.
+        :return: summary with per range results, mismatches, errors, latency percentiles
+        and throughput
+        """
+        tasks = self.plan(entries)
+        LOGGER.info("Verifying %s ranges with %s workers", len(tasks), self.nworkers)
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=max(1, self.nworkers)) as executor:
+            results = list(executor.map(
+                lambda task: verify_range(self._client(task[0].get('user')), *task), tasks))
+        elapsed = time.perf_counter() - start
+        latencies = sorted(result['latency'] for result in results)
+        nbytes = sum(result['bytes_read'] for result in results)
+        summary = dict(
+            ranges=results,
+            mismatches=[result for result in results
+                        if not result['match'] and 'error' not in result],
+            errors=[result for result in results if 'error' in result],
+            total=len(results), bytes=nbytes, elapsed=round(elapsed, 3),
+            ranges_per_sec=round(len(results) / elapsed, 2) if elapsed else 0,
+            mb_per_sec=round(nbytes / elapsed / 2 ** 20, 2) if elapsed else 0,
+            latency_p50=round(_percentile(latencies, 50), 4),
+            latency_p99=round(_percentile(latencies, 99), 4),
+            latency_max=round(latencies[-1], 4) if latencies else 0)
+        LOGGER.info("Range verification done %s", {key: val for key, val in summary.items()
+                                                   if not isinstance(val, list)})
+        return summary
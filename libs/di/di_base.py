@@ -20,7 +20,10 @@
 """ Data Integrity framework base file.
 """
 import logging
+import os
+import threading
 import boto3
+from botocore.config import Config
 from botocore.exceptions import ClientError
 from logging.handlers import SysLogHandler
 from config import DATA_PATH_CFG
@@ -28,6 +31,9 @@ from config import CMN_CFG
 from commons.utils import assert_utils
 from commons.utils.system_utils import run_local_cmd
 from commons.params import S3_ENDPOINT
+from commons.params import NWORKERS
+from commons.utils.s3_perf_utils import botocore_config
+from commons.utils.s3_perf_utils import get_perf_profile
 
 LOGGER = logging.getLogger(__name__)
 
@@ -51,35 +57,82 @@ class SysLogger:
         logging.info(f"{msg}")
 
 
+# (pid, access key, endpoint, nworkers, perf profile, botocore config) -> shared s3 resource,
+# a process never uses parent's sockets
+_S3_CONNECTIONS = dict()
+_S3_CONNECTIONS_LOCK = threading.Lock()
+
+
+def _clear_s3_connections():
+    """Forget connections inherited from parent, runs in child after fork."""
+    global _S3_CONNECTIONS_LOCK
+    _S3_CONNECTIONS.clear()
+    _S3_CONNECTIONS_LOCK = threading.Lock()
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_clear_s3_connections)
+
+
+def get_s3_conn(access_key, secret_key, user_name, nworkers=NWORKERS, endpoint=None):
+    """
+    Thread safe s3 resource shared by all threads of a process for a user, endpoint and
+    connection settings (nworkers and active perf profile).
+    Its single client has connection pool sized to nworkers with TCP keepalive, calls
+    should go through resource.meta.client which is safe to use from many threads.
+    """
+    endpoint = endpoint or CMN_CFG.get('s3_url', S3_ENDPOINT)
+    profile = get_perf_profile(default='di')
+    config = botocore_config(profile)
+    config['max_pool_connections'] = max(nworkers, config['max_pool_connections'])
+    key = (os.getpid(), access_key, endpoint, nworkers, profile['name'],
+           repr(sorted(config.items())))
+    s3 = _S3_CONNECTIONS.get(key)
+    if s3 is not None:
+        return s3
+    with _S3_CONNECTIONS_LOCK:
+        s3 = _S3_CONNECTIONS.get(key)
+        if s3 is None:
+            s3 = _init_s3_conn(access_key, secret_key, user_name, endpoint=endpoint,
+                               config=Config(**config))
+            if s3 is not None:
+                _S3_CONNECTIONS[key] = s3
+    return s3
+
+
 def init_s3_connections(users):
-    """Init s3 connections pool for a multiple  user"""
+    """Init shared s3 connection for multiple users"""
     s3_objects = dict()
 
     for user, keys in users.items():
         user_name = user
         access_key = keys["accesskey"]
         secret_key = keys["secretkey"]
-        s3_objects[user_name] = _init_s3_conn(access_key, secret_key, user_name)
+        s3_objects[user_name] = get_s3_conn(access_key, secret_key, user_name)
     return s3_objects
 
 
 def init_s3_conn(user_name, keys, nworkers):
-    """Init s3 connections pool for a single user"""
+    """
+    Init s3 connections pool for a single user. Pool entries are the same thread safe
+    connection, pool size is kept for callers picking an entry per task.
+    """
     access_key = keys[0]
     secret_key = keys[1]
-    pool = list()
-    for ix in range(nworkers + 1):
-        pool.append(_init_s3_conn(access_key, secret_key, user_name))
-        LOGGER.info('Initialized s3 connection %s', str(ix))
-    return pool
+    s3 = get_s3_conn(access_key, secret_key, user_name, nworkers=nworkers)
+    LOGGER.info('Initialized shared s3 connection for %s workers', nworkers)
+    return [s3] * (nworkers + 1)
 
 
-def _init_s3_conn(access_key, secret_key, user_name):
+def _init_s3_conn(access_key, secret_key, user_name, endpoint=None, config=None):
     """Protected function to create a single s3 resource."""
     s3 = None
     try:
-        s3 = boto3.resource('s3', aws_access_key_id=access_key, aws_secret_access_key=secret_key,
-                            endpoint_url=CMN_CFG.get('s3_url', S3_ENDPOINT))
+        session = boto3.session.Session()
+        s3 = session.resource('s3', aws_access_key_id=access_key,
+                              aws_secret_access_key=secret_key,
+                              endpoint_url=endpoint or CMN_CFG.get('s3_url', S3_ENDPOINT),
+                              config=config)
         LOGGER.info(f's3 resource created for user {user_name}')
     except (ClientError, Exception) as exc:
         LOGGER.error(
@@ -20,8 +20,6 @@
 
 """ Destructive operations."""
 import csv
-import fcntl
-import hashlib
 import logging
 import multiprocessing as mp
 import os
@@ -31,9 +29,11 @@ from multiprocessing import Manager
 
 import boto3
 
+from commons.utils.checksum import checksum_stream
 from config.s3 import S3_CFG
 from libs.di import di_lib
 from libs.di import di_params
+from libs.di.manifest import UploadManifest
 
 logger = logging.getLogger(__name__)
 
@@ -47,7 +47,6 @@ def destructive_step():
     # 'test_controller_a_faults', 'test_controller_b_faults']
 
     destructiveTestList = ['test_sas_hba_fault', 'test_sas_hba_fault']
-    deletedObjectList = []
     numProcess = 5
 
     # Initial sleep
@@ -57,11 +56,10 @@ def destructive_step():
     logger.info("Init Sleep End : {}".format(time.ctime()))
 
     users = di_lib.read_iter_content_json()
+    manifest = UploadManifest(di_params.UPLOAD_MANIFEST)
 
     if os.path.exists(di_params.destructiveTestResult):
         os.remove(di_params.destructiveTestResult)
-    if os.path.exists(di_params.deleteOpFileName):
-        os.remove(di_params.deleteOpFileName)
     if os.path.exists(di_params.comDeleteOpFileName):
         os.remove(di_params.comDeleteOpFileName)
     # Create 10 s3 instances
@@ -83,14 +81,12 @@ def destructive_step():
 
     # For loop to trigger destructive test, read & delete data.
     for curDestructiveTest in destructiveTestList:
-        # Get upload file
+        # Get uploaded objects which are not deleted yet
         uploadedData = []
         attempts = 0
         while attempts < 3:
             try:
-                with open(di_params.uploadDoneFile, newline='') as f:
-                    reader = csv.reader(f)
-                    uploadedData = list(reader)
+                uploadedData = list(manifest.live_objects())
                 break
             except Exception as e:
                 attempts = attempts + 1
@@ -100,10 +96,6 @@ def destructive_step():
             # print("uploaded data not found, existing script")
             logger.info("uploaded data not found, existing script")
             exit(1)
-        if os.path.exists(di_params.deleteOpFileName):
-            with open(di_params.deleteOpFileName, newline='') as f:
-                reader = csv.reader(f)
-                deletedObjectList = list(reader)
 
         # Remove Destruction Result file
         if os.path.exists(di_params.destructiveTestResult):
@@ -111,7 +103,7 @@ def destructive_step():
 
         # read object, check for checksum value.. then delete objects and update csv
         logger.info(f'Total uploaded items {len(uploadedData)}')
-        k = (len(uploadedData) - len(deletedObjectList)) * deletePercentage // 100
+        k = len(uploadedData) * deletePercentage // 100
         indicies = random.sample(range(len(uploadedData)), k)
         deleteList = [uploadedData[i] for i in indicies]
         newListLen = len(deleteList)
@@ -124,7 +116,8 @@ def destructive_step():
             combinedDelList = manager.list()
             for i in range(numProcess):
                 pList = deleteList[perProcessObj * i:perProcessObj * (i + 1)]
-                p = mp.Process(target=destructionCheck, args=(pList, deletedObjectList, s3ObjectList, combinedDelList))
+                p = mp.Process(target=destructionCheck,
+                               args=(pList, di_params.UPLOAD_MANIFEST, s3ObjectList, combinedDelList))
                 jobs.append(p)
             p = mp.Process(target=destructionTrigger, args=(curDestructiveTest,))
             jobs.append(p)
@@ -137,7 +130,8 @@ def destructive_step():
             # Dump combined delete list to csv
             with open(di_params.comDeleteOpFileName, 'a', newline='') as myfile:
                 wr = csv.writer(myfile, quoting=csv.QUOTE_ALL)
-                wr.writerows(combinedDelList)
+                wr.writerows([item['user'], item['bucket'], item['key'], item['md5']]
+                             for item in combinedDelList)
 
         if os.path.exists(di_params.destructiveTestResult):
             destructiveTestRes = []
@@ -199,47 +193,31 @@ def destructionTrigger(curDestructiveTest):
         os.system(di_params.CONTROLLER_B_FAULT_CMD)
 
 
-def destructionCheck(uploadedData, deletedObjectList, s3ObjectList, combinedDelList):
+def destructionCheck(uploadedData, manifestPath, s3ObjectList, combinedDelList):
+    manifest = UploadManifest(manifestPath)
     deletedObjectList1 = []
-    for item in uploadedData:
-        if item not in deletedObjectList:  # item: userid bucket obj checksum
-            chSumRec = str(item[3])
-            chSumRec = chSumRec.strip()
-            s3 = s3ObjectList[item[0]]
-            dwnSuccess = 0
-            try:
-                # s3.Bucket(item[1]).download_file(item[1], item[2])
-                logger.info(f'Send download request for {item}')
-                s3.meta.client.download_file(item[1], item[2], item[2])
-                logger.info(f'download object successful : {item}')
-                dwnSuccess = 1
-            except Exception as e:
-                print(e)
-                logger.error(f'download failed for {item} with exception {e}')
-                # exit(1)
-            if dwnSuccess:
-                checkSumRead = hashlib.md5(open(str(item[2]), 'rb').read()).hexdigest()
-                if checkSumRead.strip() != str(item[3]):
-                    # print("checksum mismatch: bucket {} object {}".format(item[1],item[2]))
-                    logger.error(f'checksum mismatch for {item}, calculated checksum is {checkSumRead}')
-                    # exit(1)
-                rmLocalObject = "rm -rf ./" + str(item[2])
-                os.system(rmLocalObject)
-
-                logger.info(f'Send delete object {item}')
-                try:
-                    logger.info(f'Sending delete object {item}')
-                    s3.meta.client.delete_object(Bucket=item[1], Key=item[2])
-                    logger.info(f'Delete Successful {item}')
-                except Exception as e:
-                    logger.error(f'Delete failed for {item}')
-                else:
-                    deletedObjectList1.append(item)
-                    combinedDelList.append(item)
-                    logger.info(f'Added deleted object into delete list {item}')
-
-    with open(di_params.deleteOpFileName, 'a', newline='') as myfile:
-        wr = csv.writer(myfile, quoting=csv.QUOTE_ALL)
-        fcntl.flock(myfile, fcntl.LOCK_EX)
-        wr.writerows(deletedObjectList1)
-        fcntl.flock(myfile, fcntl.LOCK_UN)
+    for item in uploadedData:  # item: manifest entry of a live object
+        s3 = s3ObjectList[item['user']]
+        try:
+            logger.info(f'Send download request for {item}')
+            response = s3.meta.client.get_object(Bucket=item['bucket'], Key=item['key'])
+            checkSumRead = checksum_stream(response['Body'])['md5']
+            logger.info(f'download object successful : {item}')
+        except Exception as e:
+            logger.error(f'download failed for {item} with exception {e}')
+            continue
+        if checkSumRead != str(item['md5']).strip():
+            logger.error(f'checksum mismatch for {item}, calculated checksum is {checkSumRead}')
+
+        try:
+            logger.info(f'Sending delete object {item}')
+            s3.meta.client.delete_object(Bucket=item['bucket'], Key=item['key'])
+            logger.info(f'Delete Successful {item}')
+        except Exception as e:
+            logger.error(f'Delete failed for {item}')
+        else:
+            deletedObjectList1.append(item)
+            combinedDelList.append(item)
+            logger.info(f'Added deleted object into delete list {item}')
+
+    manifest.tombstone_many((item['bucket'], item['key']) for item in deletedObjectList1)
@@ -24,11 +24,8 @@ import datetime
 import time
 import sys
 import logging
-import hashlib
 import random
 from time import perf_counter_ns
-from hashlib import md5
-from pathlib import Path
 from fabric import Connection
 from fabric import Config
 from fabric import ThreadingGroup, SerialGroup
@@ -39,6 +36,7 @@ from commons.constants import POD_NAME_PREFIX, PROD_FAMILY_LC, PROD_TYPE_K8S
 from commons import params
 from commons.helpers.pods_helper import LogicalNode
 from commons.utils import assert_utils
+from commons.utils import checksum
 from commons import constants as const
 from commons.helpers.node_helper import Node
 from config import cmn_cfg
@@ -149,26 +147,7 @@ def sigint_handler(signum, frame):
 
 def read_file(filepath, size=0, algo=CKSUM_ALGO_1):
     """Find checksum of file as per algo."""
-    if not size:
-        sz = Path(filepath).stat().st_size
-
-    read_sz = 8192  # blk sz
-    c_sum = ''
-    if algo == CKSUM_ALGO_1:
-        file_hash = hashlib.md5()
-    elif algo == CKSUM_ALGO_2:
-        file_hash = hashlib.sha1()
-
-    with open(filepath, 'rb') as fp:
-        if sz < read_sz:
-            buf = fp.read(sz)
-        else:
-            buf = fp.read(read_sz)
-        while buf:
-            file_hash.update(buf)
-            buf = fp.read(read_sz)
-        c_sum = file_hash.hexdigest()
-    return c_sum.strip()  # not required. Recheck.
+    return checksum.checksum_file(filepath, algos=(algo,))[algo]
 
 
 def copy_local_to_s3_config(self, **kwargs) -> tuple:
@@ -248,9 +227,7 @@ def calc_checksum(buf: object):
     :param hash_algo: md5 or sha1
     :return:
     """
-    file_hash = md5()  # nosec
-    file_hash.update(buf)
-    return file_hash.hexdigest()
+    return checksum.checksum_buffer(buf)['md5']
 
 
 def kill_s3_process_in_k8s(master_node: LogicalNode, data_pods: list, namespace):
@@ -30,6 +30,7 @@ DATAGEN_HOME = '/var/log/datagen/'
 DATASET_FILES = "/var/log/datagen/createdfile.txt"
 USER_JSON = '_usersdata'
 UPLOADED_FILES = os.path.join(DATAGEN_HOME, "uploadInfo.csv")
+UPLOAD_MANIFEST = os.path.join(DATAGEN_HOME, "uploadInfo.db")
 deleteOpFileName = os.path.join(DATAGEN_HOME, "deleteInfo.csv")
 comDeleteOpFileName = os.path.join(DATAGEN_HOME, "combinedDeleteInfo.csv")
 uploadDoneFile = UPLOADED_FILES
@@ -18,13 +18,13 @@
 # please email opensource@seagate.com or cortx-questions@seagate.com.
 #
 import os
-import csv
 import logging
 import threading
 from multiprocessing import Value
 from commons import params
 from libs.di import uploader
 from libs.di.downloader import DataIntegrityValidator
+from libs.di.manifest import UploadManifest
 
 LOGGER = logging.getLogger(__name__)
 
@@ -70,16 +70,13 @@ class RunDataCheckManager(ASyncIO):
 
     def __check_upload(self):
         """
-        read upload file uploadInfo.csv
-        check users name in upload file response
+        read upload manifest uploadInfo.db
+        check users objects are recorded in it
         :return:
         """
-        upload_file = params.UPLOADED_FILES
+        upload_file = params.UPLOAD_MANIFEST
         if os.path.exists(upload_file):
-            with open(params.UPLOADED_FILES, newline='') as f:
-                reader = csv.reader(f)
-                uploaded_file_lst = [el for el in list(reader) if el[0] in self.users.keys()]
-            result = len(uploaded_file_lst) > 1
+            result = UploadManifest(upload_file).count(users=self.users.keys()) > 1
         else:
             result = False
 
@@ -156,7 +153,9 @@ class RunDataCheckManager(ASyncIO):
         """
         Function to start IO within test sequentially(write, read, verify)
         prefs = {
-            'prefix_dir': test_name
+            'prefix_dir': test_name,
+            'data_profile': 'di_mixed',  # optional, see config/di_data_profiles.yaml
+            'data_seed': 42  # optional, same seed uploads same data
         }
         :param users: user data includes username, accessKey, secretKey,
          account id etc
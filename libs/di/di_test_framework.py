@@ -19,8 +19,6 @@
 """DI checker test case. Eventually we want to delete this file."""
 
 import os
-import sys
-import queue
 import logging
 import csv
 import hashlib
@@ -30,15 +28,19 @@ import re
 import time
 import errno
 from pathlib import Path
-from boto3.s3.transfer import TransferConfig
-from commons import worker
+from botocore.config import Config
 from libs.di import di_params
 from libs.di.di_mgmt_ops import ManagementOPs
+from libs.di.downloader import DataIntegrityValidator
+from libs.di.parallel_verifier import ParallelVerifier
+from libs.di.manifest import UploadManifest
 from commons.utils import config_utils
+from commons.utils.checksum import file_md5
+from commons.utils.s3_perf_utils import botocore_config
+from commons.utils.s3_perf_utils import get_perf_profile
+from commons.utils.s3_perf_utils import transfer_config
 from commons import params
 from commons import cortxlogging
-if sys.platform != 'win32':
-    import fcntl
 
 LOGGER = logging.getLogger(__name__)
 uploadObjects = []
@@ -46,10 +48,6 @@ uploadObjects = []
 
 class Uploader(object):
     """S3 Uploads class."""
-    tsfrConfig = TransferConfig(multipart_threshold=1024 * 1024 * 16,
-                                max_concurrency=10,
-                                multipart_chunksize=1024 * 1024 * 16,
-                                use_threads=True)
 
     @staticmethod
     def upload(user, keys):
@@ -58,10 +56,13 @@ class Uploader(object):
         secret_key = keys[1]
         timestamp = time.strftime("%Y%m%d-%H%M%S")
         buckets = [user_name + '-' + timestamp + '-bucket' + str(i) for i in range(2)]
+        perf_profile = get_perf_profile(default='di')
+        tsfr_config = transfer_config(perf_profile)
 
         try:
             s3 = boto3.resource('s3', aws_access_key_id=access_key, aws_secret_access_key=secret_key,
-                                endpoint_url=params.S3_ENDPOINT, verify=False)
+                                endpoint_url=params.S3_ENDPOINT, verify=False,
+                                config=Config(**botocore_config(perf_profile)))
             LOGGER.info("S3 resource created for %s", user_name)
         except Exception as e:
             LOGGER.info(
@@ -69,6 +70,7 @@ class Uploader(object):
                 f'access key {access_key} secret key {secret_key} exception:{e}')
             return
 
+        manifest = UploadManifest(di_params.UPLOAD_MANIFEST)
         for bucket in buckets:
             try:
                 file1 = open(di_params.DATASET_FILES, "r")
@@ -94,28 +96,17 @@ class Uploader(object):
                     try:
                         s3.meta.client.upload_file(str(each_file_path),
                                                    bucket,
-                                                   os.path.basename(each_file_path))
+                                                   os.path.basename(each_file_path),
+                                                   Config=tsfr_config)
 
                     except Exception as e:
                         LOGGER.info(f'{each_file_path} in bucket {bucket} Upload caught exception: {e}')
                     else:
                         LOGGER.info(f'{each_file_path} in bucket {bucket} Upload Done')
-                        md5sum = hashlib.md5(open(each_file_path, 'rb').read()).hexdigest()
+                        md5sum = file_md5(each_file_path)
 
                         obj_name = os.path.basename(each_file_path)
-                        row_data = []
-                        uploadObjectList = []
-                        row_data.append(user_name)
-                        row_data.append(bucket)
-                        row_data.append(obj_name)
-                        row_data.append(md5sum)
-                        uploadObjectList.append(row_data)
-                        with open(di_params.UPLOADED_FILES, 'a', newline='') as myfile:
-                            wr = csv.writer(myfile, quoting=csv.QUOTE_NONE, delimiter=',', quotechar='',
-                                            escapechar='\\')
-                            fcntl.flock(myfile, fcntl.LOCK_EX)
-                            wr.writerows(uploadObjectList)
-                            fcntl.flock(myfile, fcntl.LOCK_UN)
+                        manifest.add(user_name, bucket, obj_name, md5sum)
 
     @staticmethod
     def start(users):
@@ -124,10 +115,7 @@ class Uploader(object):
             os.remove(di_params.uploadFinishedFileName)
         except Exception as e:
             LOGGER.info(f'file not able to remove: {e}')
-        try:
-            os.remove(di_params.UPLOADED_FILES)
-        except Exception as e:
-            LOGGER.info(f'file not able to remove: {e}')
+        UploadManifest(di_params.UPLOAD_MANIFEST).reset()
 
         users_path = os.path.join(params.LOG_DIR, params.USER_JSON)
         config_utils.create_content_json(users_path, users)
@@ -160,7 +148,9 @@ class DIChecker(object):
             try:
                 s3 = boto3.resource('s3', aws_access_key_id=access_key,
                                     aws_secret_access_key=secret_key,
-                                    endpoint_url=params.S3_ENDPOINT, verify=False)
+                                    endpoint_url=params.S3_ENDPOINT, verify=False,
+                                    config=Config(**botocore_config(
+                                        get_perf_profile(default='di'))))
             except Exception as e:
                 LOGGER.error(
                     f'could not create s3 object for user {user_name} with access '
@@ -247,75 +237,50 @@ class DIChecker(object):
             LOGGER.error(f'Exception occurred for item {kwargs} with exception {fault}')
 
     @classmethod
-    def verify_data_integrity(cls, users_data):
+    def connect(cls, users):
+        """S3 resources of users, used by verifier processes."""
+        cls.init_s3_conn(users)
+        return cls.s3ObjectList
+
+    @classmethod
+    def verify_data_integrity(cls, users_data, nprocs=params.DI_VERIFY_NPROCS, resume=False):
         """
         UploadInfo File format supported is
         #user7,user7-8844buckets0,naPcn6qP47SkUPkxbP_PtJUVF1iv.json,7e2db9e2f7621db0ddfde4d294e92eca
-        Downloads the file and compare checksum.
+        Streams the objects in nprocs processes and compare checksum.
+        :param resume: skip objects verified by an earlier interrupted run
         :return:
         """
         users = dict()
         for user, udict in users_data.items():
             users.update({user.replace('_', '-'):[udict['accesskey'], udict['secretkey']]})
-        ulen = len(users)
-        workers = worker.Workers()
-        workers.start_workers()
-        cls.init_s3_conn(users)
-        deletedFiles = list()
-        uploadedFiles = list()
-        deletedDict = dict()
         summary = dict()
-        with open(di_params.UPLOADED_FILES, newline='') as f:
-            reader = csv.reader(f)
-            uploadedFiles = list(reader)
-
-        if len(uploadedFiles) == 0:
+        manifest = UploadManifest(di_params.UPLOAD_MANIFEST)
+        if not manifest.count() and not manifest.count(deleted=True):
             print("uploaded data not found, exiting script")
             LOGGER.info("uploaded data not found, exiting script")
             exit(1)
+        summary['deleted_files'] = manifest.count(deleted=True)
 
-        if os.path.exists(di_params.deleteOpFileName):
-            with open(di_params.deleteOpFileName, newline='') as f:
-                reader = csv.reader(f)
-                deletedFiles = list(reader)
-        summary['deleted_files'] = len(deletedFiles)
-
-        for f in deletedFiles:
-            if len(f) == 4:
-                deletedDict[(f[0], f[1], f[2])] = f[3]
-            else:
-                LOGGER.error("Skipped considering deleted file {}".format(f))
-
-        for i in range(1, ulen + 1):
-            try:
-                if not os.path.exists(os.path.join(di_params.DOWNLOAD_HOME,
-                                                   ManagementOPs.user_prefix + str(i))):
-                    DIChecker.mkdirs(os.path.join(di_params.DOWNLOAD_HOME,
-                                                  ManagementOPs.user_prefix + str(i)))
-            except (OSError, Exception) as err:
-                LOGGER.error(str(err))
-                LOGGER.error(f"Error while creating directory for user {i}")
-
-        for ix, ent in enumerate(uploadedFiles, 1):
-            if (ent[0], ent[1], ent[2]) in deletedDict:
-                continue
-            workQ = queue.Queue()
-            workQ.func = cls.download_and_compare_chksum
+        records = list()
+        for ent in manifest.live_objects(users=users.keys()):
             kwargs = dict()
-            kwargs['user'] = ent[0]
-            kwargs['objectpath'] = ent[2]
-            kwargs['bucket'] = ent[1]
-            kwargs['objcsum'] = ent[3]
-            kwargs['accesskey'] = users.get(ent[0])[0]
-            kwargs['secret'] = users.get(ent[0])[1]
-            workQ.put(kwargs)
-            workers.wenque(workQ)
-            LOGGER.info(f"Enqueued item {ix} for download and checksum compare")
-            # if workQ is not None:
-            #    workQ.join()
-            # workQ = None
+            kwargs['user'] = ent['user']
+            kwargs['objectpath'] = ent['key']
+            kwargs['bucket'] = ent['bucket']
+            kwargs['objcsum'] = ent['md5']
+            kwargs['accesskey'] = users.get(ent['user'])[0]
+            kwargs['secret'] = users.get(ent['user'])[1]
+            records.append(kwargs)
+        ix = len(records) + summary['deleted_files']
         LOGGER.info(f"processed items {ix} for data integrity check")
 
+        verifier = ParallelVerifier(users, DataIntegrityValidator.verify_object,
+                                    connect=cls.connect, nprocs=nprocs)
+        result = verifier.run(records, resume=resume)
+        cls.failedFiles = result['failed_files']
+        cls.failedFilesServerError = result['server_errors']
+
         summary['failed_files'] = len(cls.failedFiles) + len(cls.failedFilesServerError)
         summary['uploaded_files'] = ix
         summary['checksum_verified'] = summary['uploaded_files'] - summary['deleted_files']
@@ -338,8 +303,6 @@ class DIChecker(object):
                 wr = csv.DictWriter(fp, keys)
                 wr.writerows(cls.failedFilesServerError)
 
-        workers.end_workers()
-        LOGGER.info('Workers shutdown completed successfully')
         LOGGER.info("Test run summary Uploaded files {}  "
                     "Deleted Files {} ".format(summary['uploaded_files'],
                                                summary['deleted_files']))
@@ -23,15 +23,13 @@ Simulates parallel downloads.
 import os
 import logging
 import csv
-import queue
-import hashlib
-from pathlib import Path
+import json
 from commons import params
-from commons import worker
-from commons.utils import system_utils
-from libs.di import di_base
 from libs.di.di_mgmt_ops import ManagementOPs
 from libs.di import uploader
+from libs.di import data_verifier
+from libs.di.parallel_verifier import ParallelVerifier
+from libs.di.manifest import UploadManifest
 
 LOGGER = logging.getLogger(__name__)
 
@@ -40,152 +38,147 @@ class DataIntegrityValidator:
     s3_objects = dict()
     failed_files = list()
     failed_files_server_error = list()
+    mismatch_report = list()
+    # compare objects with content regenerated from seed when upload info has it
+    verify_from_seed = True
+
+    @staticmethod
+    def mismatch_entry(kwargs, reason, **details):
+        """Structured mismatch report entry, credentials are left out."""
+        entry = dict(user=kwargs.get('user'), bucket=kwargs.get('bucket'),
+                     key=kwargs.get('objectpath'), reason=reason,
+                     expected_checksum=kwargs.get('objcsum'), seed=kwargs.get('seed'),
+                     size=kwargs.get('size'))
+        entry.update(details)
+        return entry
+
+    @staticmethod
+    def compare_with_seed(kwargs, s3):
+        """ Stream object with get_object and compare it chunk by chunk with content
+            regenerated from its seed.
+        """
+        response = s3.meta.client.get_object(Bucket=kwargs['bucket'], Key=kwargs['objectpath'])
+        result = data_verifier.compare_stream(response['Body'], kwargs['size'],
+                                              kwargs['seed'], kwargs['c_ratio'],
+                                              text=kwargs.get('text', False))
+        if result['match']:
+            LOGGER.info("object %s content matches seed %s", kwargs['objectpath'], kwargs['seed'])
+            return None, result['bytes_read']
+        LOGGER.error("object %s content does not match seed %s, first mismatch at offset %s",
+                     kwargs['objectpath'], kwargs['seed'], result['mismatch_offset'])
+        return DataIntegrityValidator.mismatch_entry(
+            kwargs, 'content_mismatch', mismatch_offset=result['mismatch_offset'],
+            bytes_read=result['bytes_read']), result['bytes_read']
+
+    @staticmethod
+    def compare_checksum(kwargs, s3):
+        """ Hash get_object stream, with concurrent ranged GETs for large objects, and
+            compare it with stored md5.
+        """
+        csum, nbytes = data_verifier.hash_object(s3.meta.client, kwargs['bucket'],
+                                                 kwargs['objectpath'])
+        if kwargs.get('objcsum', '').strip() == csum:
+            LOGGER.info("download object checksum %s matches provided checksum for file %s",
+                        csum, kwargs['objectpath'])
+            return None, nbytes
+        LOGGER.error("download object checksum %s does not matches provided checksum %s for "
+                     "file %s", csum, kwargs.get('objcsum'), kwargs['objectpath'])
+        return DataIntegrityValidator.mismatch_entry(
+            kwargs, 'checksum_mismatch', actual_checksum=csum, bytes_read=nbytes), nbytes
+
+    @staticmethod
+    def verify_object(kwargs, s3):
+        """ Verify one upload record with given s3 resource.
+            :return: mismatch entry or None and number of bytes verified, raises on read errors
+        """
+        if DataIntegrityValidator.verify_from_seed and kwargs.get('seed') is not None:
+            return DataIntegrityValidator.compare_with_seed(kwargs, s3)
+        return DataIntegrityValidator.compare_checksum(kwargs, s3)
 
     @staticmethod
     def download_and_compare_chksum(kwargs):
-        """ Download file with s3cmd "s3://bucket/ObjectPath" test_output_file
-            compare downloaded file's md5sum with prior stored
+        """ Stream object "s3://bucket/ObjectPath" and compare it with prior stored md5sum
+            or, when its seed is known, with content regenerated from seed.
+            Nothing is written to local disk.
         """
         try:
-            user = kwargs.get('user')
-            objectpath = kwargs.get('objectpath')
-            bucket = kwargs.get('bucket')
-            objcsum = kwargs.get('objcsum')
-            cwd = params.DOWNLOAD_HOME
-            basepath = os.path.join(cwd, user)
-            objpth = os.path.join(cwd, user, objectpath)
-            try:
-                if not os.path.exists(basepath):
-                    system_utils.mkdirs(basepath)
-            except (OSError, Exception) as fault:
-                LOGGER.error(f"Error {fault} while creating directory for user {user}")
-
-            try:
-                s3 = DataIntegrityValidator.s3_objects[user]
-            except Exception as fault:
-                print(fault)
-                LOGGER.error(f'No S3 Connection for user {kwargs} in S3 sessions list {fault}')
-                LOGGER.error(f"Won't be able to download object {kwargs} without connection")
-                return
-            try:
-                s3.meta.client.download_file(bucket, objectpath, objpth)
-                LOGGER.info(f'downloaded object : {kwargs}')
-            except Exception as e:
-                print(e)
-                LOGGER.error(f'Final object download failed for {kwargs} with exception {e}')
-                DataIntegrityValidator.failed_files_server_error.append(kwargs)
-            else:
-                print("Downloaded file '{}' from '{}'".format(objectpath, bucket))
-                filepath = objpth
-                sz = Path(filepath).stat().st_size
-                read_sz = 8192
-                csum = None
-                with open(filepath, 'rb') as fp:
-                    file_hash = hashlib.md5()
-                    if sz < read_sz:
-                        buf = fp.read(sz)
-                    else:
-                        buf = fp.read(read_sz)
-                    while buf:
-                        file_hash.update(buf)
-                        buf = fp.read(read_sz)
-                    csum = file_hash.hexdigest()
-                    try:
-                        os.unlink(filepath)
-                    except (OSError, Exception) as fault:
-                        LOGGER.error('Fault %s occurred duing unlink. Trying rm command', fault)
-                        rmLocalObject = "rm -rf " + str(filepath)
-                        os.system(rmLocalObject)
-
-                if objcsum == csum.strip():
-                    LOGGER.info(
-                        "download object checksum {} matches provided checksum {} for file {}".format(csum, objcsum,
-                                                                                                      objectpath))
-                else:
-                    LOGGER.error(
-                        "download object checksum {} does not matches provided checksum {} for file {}".format(csum,
-                                                                                                               objcsum,
-                                                                                                               objectpath))
-                    DataIntegrityValidator.failed_files.append(kwargs)
-                    if os.path.exists(filepath):
-                        os.remove(filepath)
+            s3 = DataIntegrityValidator.s3_objects[kwargs.get('user')]
+        except KeyError as fault:
+            LOGGER.error(f'No S3 Connection for user {kwargs} in S3 sessions list {fault}')
+            LOGGER.error(f"Won't be able to download object {kwargs} without connection")
+            return
+        try:
+            mismatch, _ = DataIntegrityValidator.verify_object(kwargs, s3)
         except Exception as fault:
-            LOGGER.exception(fault)
-            LOGGER.error(f'Exception occurred for item {kwargs} with exception {fault}')
+            LOGGER.error(f'Final object download failed for {kwargs} with exception {fault}')
+            DataIntegrityValidator.failed_files_server_error.append(kwargs)
+            DataIntegrityValidator.mismatch_report.append(
+                DataIntegrityValidator.mismatch_entry(kwargs, 'read_error', error=str(fault)))
+            return
+        if mismatch:
+            kwargs['mismatch_offset'] = mismatch.get('mismatch_offset', -1)
+            DataIntegrityValidator.failed_files.append(kwargs)
+            DataIntegrityValidator.mismatch_report.append(mismatch)
 
     @classmethod
-    def verify_data_integrity(cls, users):
+    def get_upload_records(cls, users):
         """
-        UploadInfo File format supported is
-        #user7,user7-8844buckets0,naPcn6qP47SkUPkxbP_PtJUVF1iv.json,7e2db9e2f7621db0ddfde4d294e92eca
-        Downloads the file and compare checksum.
-        :return:
+        Plan verification from upload manifest, tombstoned objects are skipped.
+        :return: records of users objects which are not deleted and count of deleted files
         """
-        workers = worker.Workers()
-        workers.start_workers()
-        cls.s3_objects = di_base.init_s3_connections(users=users)
-        deletedFiles = list()
-        uploadedFiles = list()
-        deletedDict = dict()
-        summary = dict()
-        with open(params.UPLOADED_FILES, newline='') as f:
-            reader = csv.reader(f)
-            # uploadedFiles = list(reader)
-            uploadedFiles = [el for el in list(reader) if el[0] in users.keys()]
+        manifest = UploadManifest(params.UPLOAD_MANIFEST)
+        records = list()
+        for ent in manifest.live_objects(users=users.keys()):
+            kwargs = dict()
+            kwargs['user'] = ent['user']
+            kwargs['objectpath'] = ent['key']
+            kwargs['bucket'] = ent['bucket']
+            kwargs['objcsum'] = ent['md5']
+            if ent['seed'] is not None:
+                kwargs['seed'] = ent['seed']
+                kwargs['size'] = ent['size']
+                kwargs['c_ratio'] = ent['c_ratio'] or 1
+                kwargs['text'] = bool(ent['text'])
+            kwargs['accesskey'] = users.get(ent['user'])['accesskey']
+            kwargs['secret'] = users.get(ent['user'])['secretkey']
+            records.append(kwargs)
+        return records, manifest.count(users=users.keys(), deleted=True)
 
-        if len(uploadedFiles) == 0:
+    @classmethod
+    def verify_data_integrity(cls, users, nprocs=params.DI_VERIFY_NPROCS, resume=False):
+        """
+        Verify uploaded objects of users recorded in upload manifest in nprocs processes.
+        Objects are compared with content regenerated from seed when
+        seed is known, otherwise with stored checksum.
+        :param users: users dict with accesskey and secretkey
+        :param nprocs: verifier processes
+        :param resume: skip objects verified by an earlier interrupted run
+        :return: summary dict
+        """
+        summary = dict()
+        if not os.path.exists(params.UPLOAD_MANIFEST):
+            LOGGER.info("uploaded data not found, exiting script")
+            return
+        records, summary['deleted_files'] = cls.get_upload_records(users)
+        if len(records) == 0:
             print("uploaded data not found, exiting script")
             LOGGER.info("uploaded data not found, exiting script")
-            workers.end_workers()
             return
 
-        if os.path.exists(params.DELETE_OP_FILE_NAME):
-            with open(params.DELETE_OP_FILE_NAME, newline='') as f:
-                reader = csv.reader(f)
-                deletedFiles = list(reader)
-        summary['deleted_files'] = len(deletedFiles)
-
-        for f in deletedFiles:
-            if len(f) == 4:
-                deletedDict[(f[0], f[1], f[2])] = f[3]
-            else:
-                LOGGER.error("Skipped considering deleted file {}".format(f))
-
-        for i in range(1, params.NUSERS + 1):
-            try:
-                if not os.path.exists(os.path.join(params.DOWNLOAD_HOME,
-                                                   ManagementOPs.user_prefix + str(i))):
-                    system_utils.mkdirs(os.path.join(params.DOWNLOAD_HOME,
-                                                     ManagementOPs.user_prefix + str(i)))
-            except (OSError, Exception) as exe:
-                LOGGER.error(f"Error {exe} while creating directory for user {i}")
-
-        for ix, ent in enumerate(uploadedFiles, 1):
-            if (ent[0], ent[1], ent[2]) in deletedDict:
-                continue
-            workQ = queue.Queue()
-            workQ.func = cls.download_and_compare_chksum
-            kwargs = dict()
-            kwargs['user'] = ent[0]
-            kwargs['objectpath'] = ent[2]
-            kwargs['bucket'] = ent[1]
-            kwargs['objcsum'] = ent[3]
-            kwargs['accesskey'] = users.get(ent[0])['accesskey']
-            kwargs['secret'] = users.get(ent[0])['secretkey']
-            workQ.put(kwargs)
-            workers.wenque(workQ)
-            LOGGER.info(f"Enqueued item {ix} for download and checksum compare")
-            # if workQ is not None:
-            #    workQ.join()
-            # workQ = None
-        LOGGER.info(f"processed items {ix} for data integrity check")
+        verifier = ParallelVerifier(users, cls.verify_object, nprocs=nprocs)
+        result = verifier.run(records, resume=resume)
+        cls.failed_files = result['failed_files']
+        cls.failed_files_server_error = result['server_errors']
+        cls.mismatch_report = result['mismatch_report']
 
         summary['failed_files'] = len(cls.failed_files) + len(cls.failed_files_server_error)
-        summary['uploaded_files'] = ix
-        summary['checksum_verified'] = summary['uploaded_files'] - summary['deleted_files']
+        summary['uploaded_files'] = len(records) + summary['deleted_files']
+        summary['checksum_verified'] = result['verified'] + result['failed']
+        summary['progress'] = {key: val for key, val in result.items()
+                               if not isinstance(val, list)}
 
         if len(cls.failed_files) > 0:
-            keys = cls.failed_files[0].keys()
+            keys = list(dict.fromkeys(key for item in cls.failed_files for key in item))
             with open(params.FAILED_FILES, 'w', newline='') as fp:
                 wr = csv.DictWriter(fp, keys)
                 wr.writerows(cls.failed_files)
@@ -196,14 +189,18 @@ class DataIntegrityValidator:
         for item in cls.failed_files_server_error:
             LOGGER.error(f'Server Error for {item}')
 
+        if cls.mismatch_report:
+            with open(params.DI_MISMATCH_REPORT, 'w') as fp:
+                json.dump(cls.mismatch_report, fp, indent=2)
+            LOGGER.error("Mismatch report of %s objects written to %s",
+                         len(cls.mismatch_report), params.DI_MISMATCH_REPORT)
+
         if len(cls.failed_files_server_error) > 0:
             keys = cls.failed_files_server_error[0].keys()
             with open(params.FAILED_FILES_SERVER_ERROR, 'w', newline='') as fp:
                 wr = csv.DictWriter(fp, keys)
                 wr.writerows(cls.failed_files_server_error)
 
-        workers.end_workers()
-        LOGGER.info('Workers shutdown completed successfully')
         LOGGER.info("Test run summary Uploaded files {}  "
                     "Deleted Files {} ".format(summary['uploaded_files'],
                                                summary['deleted_files']))
@@ -42,6 +42,8 @@ from config import DI_CFG
 # check and set pytest logging level as Globals.LOG_LEVEL
 LOGGER = logging.getLogger(__name__)
 
+FI_REQUEST_TIMEOUT = 10  # seconds per fault injection request to an S3 instance
+
 
 class EnableFailureInjection(ABC):
     """Abstract class to enable failure injection."""
@@ -75,6 +77,7 @@ class S3FailureInjection(EnableFailureInjection):
         self.connections = list()
         self._connections = list()  # Fabric connections
         self.ctg = None  # Common ThreadGroup connection
+        self.fi_report = dict()  # timing and failures of last k8s fault toggle
         hostnames = list()
         if self.cmn_cfg["product_family"] == PROD_FAMILY_LR and \
                 self.cmn_cfg["product_type"] == PROD_TYPE_NODE:
@@ -192,10 +195,44 @@ class S3FailureInjection(EnableFailureInjection):
                                                 s3_instances_per_node=s3_instances_per_node)
             return True if all(status) else False
 
-    # pylint: disable=too-many-nested-blocks
+    def _get_s3_targets_k8s(self) -> list:
+        """ip:port of every S3 instance of data pods, discovered with a single kubectl call."""
+        targets = list()
+        output = self.master_node_list[0].execute_cmd(cmd=commands.KUBECTL_GET_PODS_CONTAINERS,
+                                                      read_lines=True)
+        for line in output:
+            fields = line.split()
+            if len(fields) < 2 or POD_NAME_PREFIX not in fields[0]:
+                continue
+            s3_instance = len([name for name in fields[2:] if "cortx-s3-0" in name])
+            targets.extend(f'{fields[1]}:{28070 + each + 1}' for each in range(s3_instance))
+        return targets
+
+    def _fanout_fault_k8s(self, targets: list, fault_type: str, fault_op: str) -> dict:
+        """
+        PUT fault injection header to all targets concurrently with one remote command.
+        :return: target -> (success, end time on master node, response)
+        """
+        cmd = ' '.join(commands.FI_FANOUT_TARGET.format(
+            timeout=FI_REQUEST_TIMEOUT, op=fault_op, flag=fault_type, target=target)
+                       for target in targets) + ' wait'
+        resp = self.master_node_list[0].execute_cmd(cmd=cmd, read_lines=True)
+        results = {target: (False, None, 'no response') for target in targets}
+        for line in resp:
+            fields = str(line).strip().split(' ', 4)
+            if len(fields) < 4 or fields[0] != 'FI_RESULT' or fields[1] not in results:
+                continue
+            out = fields[4] if len(fields) == 5 else ''
+            # S3 server replies with empty body when fault flag is set
+            success = fields[2] == '0' and not out
+            results[fields[1]] = (success, float(fields[3]), out)
+        return results
+
     def _set_fault_k8s(self, fault_type: str, fault_operation: bool):
         """
-        sets the following faults
+        sets the following faults on all S3 instances concurrently, instances flipped
+        before a failure are reverted so that fault state stays uniform across cluster.
+        Timing of last call is kept in self.fi_report.
         S3_FI_FLAG_DC_ON_WRITE = 'di_data_corrupted_on_write'
         S3_FI_FLAG_CSUM_CORRUPT = 'di_obj_md5_corrupted'
 
@@ -207,33 +244,33 @@ class S3FailureInjection(EnableFailureInjection):
         """
         try:
             fault_op = commands.FI_ENABLE if fault_operation else commands.FI_DISABLE
-            data_pods = self.master_node_list[0].get_all_pods_and_ips(POD_NAME_PREFIX)
-            LOGGER.debug("Data pods and ips : %s", data_pods)
-            for pod_name, pod_ip in data_pods.items():
-                s3_containers = self.master_node_list[0].get_container_of_pod(pod_name,
-                                                                              "cortx-s3-0")
-                s3_instance = len(s3_containers)
-                for each in range(0, s3_instance):
-                    retries = 3
-                    s3_port = 28070 + each + 1
-                    cmd = f'curl -X PUT -H "x-seagate-faultinjection: ' \
-                          f'{fault_op},always,{fault_type},0,0" {pod_ip}:{s3_port}'
-                    while retries > 0:
-                        try:
-                            resp = self.master_node_list[0].execute_cmd(cmd=cmd, read_lines=True)
-                            LOGGER.debug("http server resp : %s", resp)
-                            if "not allowed against this resource" in str(resp):
-                                return False
-                            if not resp:
-                                break
-                        except IOError as ex:
-                            LOGGER.error("Exception: %s", ex)
-                            LOGGER.error("remaining retrying: %s", retries)
-                            retries -= 1
-                            time.sleep(2)
-                    if retries == 0:
-                        return False
-            return True
+            start = time.time()
+            targets = self._get_s3_targets_k8s()
+            LOGGER.debug("S3 instances : %s", targets)
+            if not targets:
+                LOGGER.error("No S3 instances found for fault %s", fault_type)
+                return False
+            discovered = time.time()
+            results = self._fanout_fault_k8s(targets, fault_type, fault_op)
+            end_times = [end_time for _, end_time, _ in results.values() if end_time]
+            failed = {target: out for target, (success, _, out) in results.items()
+                      if not success}
+            self.fi_report = dict(
+                fault=fault_type, operation=fault_op, instances=len(targets),
+                failed=failed, discovery_time=round(discovered - start, 3),
+                toggle_time=round(time.time() - discovered, 3),
+                flip_window=round(max(end_times) - min(end_times), 3) if end_times else None)
+            LOGGER.info("Fault injection report: %s", self.fi_report)
+            if not failed:
+                return True
+            LOGGER.error("Fault %s %s failed on %s", fault_type, fault_op, failed)
+            flipped = [target for target in targets if target not in failed]
+            if flipped:
+                revert_op = commands.FI_DISABLE if fault_operation else commands.FI_ENABLE
+                reverted = self._fanout_fault_k8s(flipped, fault_type, revert_op)
+                LOGGER.info("Reverted fault on %s instances, failed on %s", len(flipped),
+                            [target for target, result in reverted.items() if not result[0]])
+            return False
         except IOError as ex:
             LOGGER.error("Exception: %s", ex)
             return False
@@ -0,0 +1,320 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+#
+# Copyright (c) 2022 Seagate Technology LLC and/or its Affiliates
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published
+# by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+#
+# For any questions about this software or licensing,
+# please email opensource@seagate.com or cortx-questions@seagate.com.
+#
+"""Rate controlled background IO load.
+Writes seeded objects and reads them back with verification on a fixed user/bucket pool
+at a target ops/sec and bytes/sec. Rate is halved when own latency exceeds the target
+and scaled down further by the latency pressure foreground tests report through a file.
+"""
+import json
+import logging
+import math
+import os
+import random
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any
+from typing import Iterable
+from typing import Tuple
+
+from commons import params
+from commons.utils.s3_perf_utils import get_perf_profile
+from libs.di import di_base
+from libs.di.data_generator import DataGenerator
+from libs.di.data_verifier import compare_stream
+
+LOGGER = logging.getLogger(__name__)
+
+MIN_RATE_SCALE = 0.05
+RATE_RECOVERY_STEP = 0.1
+
+
+class RateLimiter:
+    """Token bucket, rate <= 0 is unlimited. Burst is one second worth of tokens."""
+
+    def __init__(self, rate: float) -> None:
+        self.lock = threading.Lock()
+        self.rate = rate
+        self.tokens = 0.0
+        self.last = time.monotonic()
+
+    def set_rate(self, rate: float) -> None:
+        """Change rate, tokens accumulated so far are kept."""
+        with self.lock:
+            self._refill()
+            self.rate = rate
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        if self.rate > 0:
+            self.tokens = min(self.tokens + (now - self.last) * self.rate, max(self.rate, 1.0))
+        self.last = now
+
+    def acquire(self, amount: float = 1, event: threading.Event = None) -> bool:
+        """
+        Take amount tokens, waiting for them when needed. Amount larger than burst goes
+        into debt so that large objects are allowed but delay following ones.
+        :return: False when event was set while waiting
+        """
+        while True:
+            with self.lock:
+                if self.rate <= 0:
+                    return True
+                self._refill()
+                if self.tokens >= min(amount, max(self.rate, 1.0)):
+                    self.tokens -= amount
+                    return True
+                wait = (min(amount, max(self.rate, 1.0)) - self.tokens) / self.rate
+            if event is not None:
+                if event.wait(wait):
+                    return False
+            else:
+                time.sleep(wait)
+
+
+def report_latency_pressure(pressure: float, path: str = params.BG_IO_PRESSURE_FILE) -> None:
+    """
+    Foreground tests call this to ask background load to back off.
+    :param pressure: 0 for full background rate up to 1 for minimum rate
+    """
+    tmp_path = f'{path}.{os.getpid()}.tmp'
+    with open(tmp_path, 'w') as fp:
+        fp.write(str(min(max(float(pressure), 0.0), 1.0)))
+    os.replace(tmp_path, path)
+
+
+def read_latency_pressure(path: str = params.BG_IO_PRESSURE_FILE) -> float:
+    """Latency pressure reported by foreground tests, 0 when none reported."""
+    try:
+        with open(path) as fp:
+            return min(max(float(fp.read().strip() or 0), 0.0), 1.0)
+    except (OSError, ValueError):
+        return 0.0
+
+
+def pick_size(size_dist: Iterable[Tuple[int, int]], rng: random.Random) -> int:
+    """Object size from (size, weight) distribution."""
+    sizes, weights = zip(*size_dist)
+    return rng.choices(sizes, weights=weights)[0]
+
+
+class BackgroundLoad:
+    """
+    Usage:
+    load = BackgroundLoad(users_buckets, ops_per_sec=20, bytes_per_sec=50 * MB)
+    thread = threading.Thread(target=load.run, args=(event,))
+    ...
+    report_latency_pressure(0.5)  # from a foreground test
+    """
+
+    def __init__(self,
+                 users: dict,
+                 ops_per_sec: float = params.BG_IO_OPS_PER_SEC,
+                 bytes_per_sec: float = params.BG_IO_BYTES_PER_SEC,
+                 size_dist: Iterable[Tuple[int, int]] = params.BG_IO_SIZE_DIST,
+                 read_ratio: float = params.BG_IO_READ_RATIO,
+                 nworkers: int = params.BG_IO_NWORKERS,
+                 latency_target: float = params.BG_IO_LATENCY_TARGET,
+                 interval: int = params.BG_IO_METRICS_INTERVAL,
+                 pressure_file: str = params.BG_IO_PRESSURE_FILE,
+                 metrics_file: str = params.BG_IO_METRICS_FILE,
+                 prefix: str = 'bg-io',
+                 pool_size: int = 10000) -> None:
+        """
+        :param users: user -> dict with accesskey, secretkey and buckets
+        :param ops_per_sec: target operations per second, <= 0 is unlimited
+        :param bytes_per_sec: target bytes per second, <= 0 is unlimited
+        :param size_dist: (size, weight) tuples of object sizes
+        :param read_ratio: fraction of operations reading back a written object
+        :param nworkers: concurrent operations
+        :param latency_target: seconds, rate backs off when p99 of an interval exceeds it
+        :param interval: seconds between rate adjustments and metrics records
+        :param pressure_file: file where foreground tests report latency pressure
+        :param metrics_file: JSON lines file of interval metrics, None to only log
+        :param prefix: key prefix of written objects
+        :param pool_size: most recent written objects kept for reads and final check
+        """
+        self.users = users
+        self.targets = [(user, bucket) for user, udict in users.items()
+                        for bucket in udict.get('buckets', [])]
+        self.ops_per_sec = ops_per_sec
+        self.bytes_per_sec = bytes_per_sec
+        self.size_dist = tuple(size_dist)
+        self.read_ratio = read_ratio
+        self.nworkers = nworkers
+        self.latency_target = latency_target
+        self.interval = interval
+        self.pressure_file = pressure_file
+        self.metrics_file = metrics_file
+        self.prefix = prefix
+        self.ops_limiter = RateLimiter(ops_per_sec)
+        self.bytes_limiter = RateLimiter(bytes_per_sec)
+        self.scale = 1.0
+        self.written = deque(maxlen=pool_size)
+        self.lock = threading.Lock()
+        self.window = self._new_window()
+        self.totals = dict(ops=0, puts=0, gets=0, bytes=0, errors=0, mismatches=0)
+        self.mismatches = list()
+
+    @staticmethod
+    def _new_window() -> dict:
+        return dict(ops=0, bytes=0, errors=0, mismatches=0, latencies=list())
+
+    def _client(self, user: str) -> Any:
+        keys = self.users[user]
+        return di_base.get_s3_conn(keys['accesskey'], keys['secretkey'], user,
+                                   nworkers=self.nworkers).meta.client
+
+    def _put(self, rng: random.Random, gen: DataGenerator, size: int) -> dict:
+        user, bucket = rng.choice(self.targets)
+        seed = DataGenerator.get_random_seed()
+        entry = dict(user=user, bucket=bucket, key=f'{self.prefix}/{seed}-{size}', seed=seed,
+                     size=size, c_ratio=gen.compression_ratio)
+        self._client(user).put_object(Bucket=bucket, Key=entry['key'],
+                                      Body=gen.stream(size, seed))
+        with self.lock:
+            self.written.append(entry)
+        return entry
+
+    def _get(self, entry: dict) -> dict:
+        response = self._client(entry['user']).get_object(Bucket=entry['bucket'],
+                                                          Key=entry['key'])
+        return compare_stream(response['Body'], entry['size'], entry['seed'],
+                              c_ratio=entry['c_ratio'])
+
+    def _record(self, kind: str, nbytes: int, latency: float, error: str = None,
+                mismatch: dict = None) -> None:
+        with self.lock:
+            self.window['ops'] += 1
+            self.window['bytes'] += nbytes
+            self.window['latencies'].append(latency)
+            self.totals['ops'] += 1
+            self.totals[kind] += 1
+            self.totals['bytes'] += nbytes
+            if error:
+                self.window['errors'] += 1
+                self.window['last_error'] = error
+                self.totals['errors'] += 1
+            if mismatch:
+                self.window['mismatches'] += 1
+                self.totals['mismatches'] += 1
+                self.mismatches.append(mismatch)
+
+    def _worker(self, event: threading.Event) -> None:
+        rng = random.Random()
+        gen = DataGenerator(c_ratio=1)
+        while not event.is_set():
+            with self.lock:
+                entry = rng.choice(self.written) if self.written and \
+                    rng.random() < self.read_ratio else None
+            size = entry['size'] if entry else pick_size(self.size_dist, rng)
+            if not self.ops_limiter.acquire(1, event) or \
+                    not self.bytes_limiter.acquire(size, event):
+                return
+            kind = 'gets' if entry else 'puts'
+            start = time.perf_counter()
+            try:
+                if entry:
+                    result = self._get(entry)
+                    mismatch = None if result['match'] else dict(entry, **result)
+                    self._record(kind, result['bytes_read'], time.perf_counter() - start,
+                                 mismatch=mismatch)
+                else:
+                    self._put(rng, gen, size)
+                    self._record(kind, size, time.perf_counter() - start)
+            except Exception as error:
+                LOGGER.debug("Background %s failed: %s", kind, error)
+                self._record(kind, 0, time.perf_counter() - start, error=str(error))
+
+    def adjust(self, p99: float, pressure: float) -> float:
+        """
+        Halve rate when p99 latency exceeds target, recover additively otherwise, and
+        scale by reported pressure.
+        :return: effective fraction of target rates
+        """
+        if self.latency_target and p99 > self.latency_target:
+            self.scale = max(self.scale / 2, MIN_RATE_SCALE)
+        else:
+            self.scale = min(self.scale + RATE_RECOVERY_STEP, 1.0)
+        factor = max(self.scale * (1 - pressure), MIN_RATE_SCALE)
+        self.ops_limiter.set_rate(self.ops_per_sec * factor)
+        self.bytes_limiter.set_rate(self.bytes_per_sec * factor)
+        return factor
+
+    def metrics(self) -> dict:
+        """Close current window, adjust rates and return window metrics."""
+        with self.lock:
+            window, self.window = self.window, self._new_window()
+        latencies = sorted(window.pop('latencies'))
+        p99 = latencies[max(0, math.ceil(0.99 * len(latencies)) - 1)] if latencies else 0
+        pressure = read_latency_pressure(self.pressure_file)
+        factor = self.adjust(p99, pressure)
+        window.update(time=time.time(), ops_per_sec=round(window['ops'] / self.interval, 2),
+                      mb_per_sec=round(window['bytes'] / self.interval / 2 ** 20, 2),
+                      latency_p50=round(latencies[len(latencies) // 2], 4) if latencies else 0,
+                      latency_p99=round(p99, 4), pressure=pressure, rate_factor=round(factor, 3))
+        return window
+
+    def _emit(self, window: dict) -> None:
+        LOGGER.info("Background IO %s", window)
+        if self.metrics_file:
+            with open(self.metrics_file, 'a') as fp:
+                fp.write(json.dumps(window) + '\n')
+
+    def verify_written(self) -> list:
+        """Read back every object in the pool, return mismatched or unreadable entries."""
+        def check(entry):
+            try:
+                result = self._get(entry)
+            except Exception as error:
+                return dict(entry, error=str(error))
+            return None if result['match'] else dict(entry, **result)
+
+        with ThreadPoolExecutor(max_workers=max(1, self.nworkers)) as executor:
+            return [result for result in executor.map(check, list(self.written)) if result]
+
+    def run(self, event: threading.Event, verify: bool = False) -> dict:
+        """
+        Generate load until event is set.
+        :param event: stop event
+        :param verify: read back and verify all pooled objects after stopping
+        :return: totals, read mismatches and failures of final verification
+        """
+        if not self.targets:
+            raise ValueError('Background IO needs at least one user bucket')
+        LOGGER.info("Starting background IO at %s ops/s %s B/s on %s buckets",
+                    self.ops_per_sec, self.bytes_per_sec, len(self.targets))
+        workers = [threading.Thread(target=self._worker, args=(event,), daemon=True)
+                   for _ in range(self.nworkers)]
+        for worker in workers:
+            worker.start()
+        while not event.wait(self.interval):
+            self._emit(self.metrics())
+        for worker in workers:
+            worker.join()
+        # settings used by the run, keeps benchmark results comparable
+        summary = dict(self.totals, mismatch_report=list(self.mismatches),
+                       perf_profile=get_perf_profile(default='di'))
+        if verify:
+            summary['verify_failures'] = self.verify_written()
+        LOGGER.info("Background IO stopped %s", {key: val for key, val in summary.items()
+                                                 if not isinstance(val, list)})
+        return summary
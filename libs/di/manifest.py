@@ -0,0 +1,206 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+#
+# Copyright (c) 2022 Seagate Technology LLC and/or its Affiliates
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published
+# by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+#
+# For any questions about this software or licensing,
+# please email opensource@seagate.com or cortx-questions@seagate.com.
+#
+"""Upload manifest of DI runs.
+Every uploaded object is a row of a SQLite DB indexed on (bucket, key) and user with its
+checksum, seed, size, compression ratio, version and timestamps. Deletes leave a
+tombstone. Many uploader and destructive step processes append concurrently, the
+verifier plans a pass with one indexed query.
+"""
+import csv
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import Iterable
+from typing import Iterator
+
+LOGGER = logging.getLogger(__name__)
+
+# Seconds a writer waits for a lock held by another process
+DB_BUSY_TIMEOUT = 120
+# Upload info CSV columns, seed, size, c_ratio and text are optional
+CSV_COLUMNS = ('user', 'bucket', 'key', 'md5', 'seed', 'size', 'c_ratio', 'text')
+
+
+class UploadManifest:
+    """
+    Usage:
+    manifest = UploadManifest(params.UPLOAD_MANIFEST)
+    manifest.add_many([dict(user='u1', bucket='b1', key='k1', md5='..', seed=1, size=4096)])
+    for entry in manifest.live_objects(users=['u1']):
+        ...
+    manifest.tombstone('b1', 'k1')
+    """
+
+    SCHEMA = (
+        "CREATE TABLE IF NOT EXISTS objects (user TEXT NOT NULL, bucket TEXT NOT NULL, "
+        "key TEXT NOT NULL, md5 TEXT, seed INTEGER, size INTEGER, c_ratio INTEGER, "
+        "version INTEGER NOT NULL DEFAULT 1, created REAL, updated REAL, deleted REAL, "
+        "text INTEGER NOT NULL DEFAULT 0, PRIMARY KEY (bucket, key))",
+        "CREATE INDEX IF NOT EXISTS objects_user ON objects (user, deleted)",
+    )
+    # columns added after first release, added to manifests created before them
+    MIGRATIONS = (('text', "ALTER TABLE objects ADD COLUMN text INTEGER NOT NULL DEFAULT 0"),)
+    COLUMNS = ('user', 'bucket', 'key', 'md5', 'seed', 'size', 'c_ratio', 'version',
+               'created', 'updated', 'deleted', 'text')
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self._local = threading.local()
+
+    def _db(self) -> sqlite3.Connection:
+        """Connection of calling thread, reopened after fork."""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None or self._local.pid != os.getpid():
+            dirname = os.path.dirname(self.path)
+            if dirname:
+                os.makedirs(dirname, exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=DB_BUSY_TIMEOUT, isolation_level=None)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            for stmt in self.SCHEMA:
+                conn.execute(stmt)
+            columns = {row[1] for row in conn.execute("PRAGMA table_info(objects)")}
+            for column, stmt in self.MIGRATIONS:
+                if column not in columns:
+                    try:
+                        conn.execute(stmt)
+                    except sqlite3.OperationalError:
+                        LOGGER.debug("Column %s added by another process", column)
+            self._local.conn, self._local.pid = conn, os.getpid()
+        return conn
+
+    def close(self) -> None:
+        """Close connection of calling thread."""
+        conn = getattr(self._local, 'conn', None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+    def reset(self) -> None:
+        """Remove all entries, done at start of a fresh run."""
+        self._db().execute("DELETE FROM objects")
+
+    def add_many(self, entries: Iterable[dict]) -> int:
+        """
+        Record uploads in one transaction. Re-upload of a key bumps its version and
+        clears its tombstone.
+        :param entries: dicts with user, bucket, key, md5 and optional seed, size, c_ratio,
+        text
+        :return: number of entries recorded
+        """
+        now = time.time()
+        count = 0
+        conn = self._db()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            for entry in entries:
+                values = (entry['user'], entry.get('md5'), entry.get('seed'),
+                          entry.get('size'), entry.get('c_ratio'), int(bool(entry.get('text'))),
+                          now, entry['bucket'], entry['key'])
+                cur = conn.execute(
+                    "UPDATE objects SET user=?, md5=?, seed=?, size=?, c_ratio=?, text=?, "
+                    "version=version + 1, updated=?, deleted=NULL WHERE bucket=? AND key=?",
+                    values)
+                if not cur.rowcount:
+                    conn.execute(
+                        "INSERT INTO objects (user, md5, seed, size, c_ratio, text, created, "
+                        "updated, bucket, key) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                        values[:7] + values[6:])
+                count += 1
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        return count
+
+    def add(self, user: str, bucket: str, key: str, md5: str, **kwargs) -> None:
+        """Record a single upload, see add_many."""
+        self.add_many([dict(user=user, bucket=bucket, key=key, md5=md5, **kwargs)])
+
+    def tombstone_many(self, keys: Iterable[tuple]) -> int:
+        """Mark (bucket, key) pairs deleted."""
+        conn = self._db()
+        with_now = [(time.time(), bucket, key) for bucket, key in keys]
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.executemany("UPDATE objects SET deleted=? WHERE bucket=? AND key=?", with_now)
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        return len(with_now)
+
+    def tombstone(self, bucket: str, key: str) -> None:
+        """Mark an object deleted."""
+        self.tombstone_many([(bucket, key)])
+
+    def _rows(self, sql: str, args: tuple) -> Iterator[dict]:
+        for row in self._db().execute(sql, args):
+            yield dict(zip(self.COLUMNS, row))
+
+    def get(self, bucket: str, key: str) -> dict:
+        """Entry of an object including tombstoned ones, None if never uploaded."""
+        return next(self._rows("SELECT {} FROM objects WHERE bucket=? AND key=?".format(
+            ', '.join(self.COLUMNS)), (bucket, key)), None)
+
+    def _where(self, users: Iterable[str], deleted: bool) -> tuple:
+        clauses = ["deleted IS NOT NULL" if deleted else "deleted IS NULL"]
+        args = tuple()
+        if users is not None:
+            users = tuple(users)
+            clauses.append("user IN ({})".format(', '.join('?' * len(users))))
+            args = users
+        return ' AND '.join(clauses), args
+
+    def live_objects(self, users: Iterable[str] = None) -> Iterator[dict]:
+        """Objects which are not deleted, optionally of given users only."""
+        where, args = self._where(users, deleted=False)
+        return self._rows("SELECT {} FROM objects WHERE {}".format(
+            ', '.join(self.COLUMNS), where), args)
+
+    def deleted_objects(self, users: Iterable[str] = None) -> Iterator[dict]:
+        """Tombstoned objects."""
+        where, args = self._where(users, deleted=True)
+        return self._rows("SELECT {} FROM objects WHERE {}".format(
+            ', '.join(self.COLUMNS), where), args)
+
+    def count(self, users: Iterable[str] = None, deleted: bool = False) -> int:
+        """Number of live or deleted objects."""
+        where, args = self._where(users, deleted)
+        return self._db().execute(
+            "SELECT COUNT(*) FROM objects WHERE {}".format(where), args).fetchone()[0]
+
+    def import_csv(self, csv_path: str) -> int:
+        """Load an upload info CSV of user,bucket,key,md5[,seed,size,c_ratio,text] rows."""
+        with open(csv_path, newline='') as fp:
+            entries = [{col: (int(val) if val and col in ('seed', 'size', 'c_ratio', 'text') else
+                              val or None) for col, val in zip(CSV_COLUMNS, row)}
+                       for row in csv.reader(fp) if len(row) >= 4]
+        return self.add_many(entries)
+
+    def export_csv(self, csv_path: str, users: Iterable[str] = None) -> str:
+        """Write live objects as upload info CSV rows for tools reading the old format."""
+        with open(csv_path, 'w', newline='') as fp:
+            writer = csv.writer(fp)
+            for entry in self.live_objects(users):
+                writer.writerow([entry[col] for col in CSV_COLUMNS])
+        return csv_path
@@ -0,0 +1,234 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+#
+# Copyright (c) 2022 Seagate Technology LLC and/or its Affiliates
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published
+# by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+#
+# For any questions about this software or licensing,
+# please email opensource@seagate.com or cortx-questions@seagate.com.
+#
+"""Process parallel and resumable verification of uploaded objects.
+Upload records are partitioned over processes, each process verifies its partition
+with a thread pool and its own S3 connections. Verified keys are checkpointed so that
+an interrupted run can be resumed, failed and unreachable objects are re-verified.
+"""
+import csv
+import glob
+import logging
+import multiprocessing as mp
+import os
+import queue
+import threading
+import time
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any
+from typing import Callable
+from typing import Iterable
+
+from commons import params
+from libs.di import di_base
+
+LOGGER = logging.getLogger(__name__)
+
+CHECKPOINT_PREFIX = 'verified-'
+
+
+def record_key(record: dict) -> tuple:
+    """Identity of an upload record."""
+    return record['user'], record['bucket'], record['objectpath']
+
+
+def _verify_partition(part: int, records: list, users: dict, verify: Callable,
+                      connect: Callable, nthreads: int, checkpoint: str,
+                      counters: dict, results: Any) -> None:
+    """Process target, verify records of a partition and put outcome in results queue."""
+    s3_objects = connect(users)
+    lock = threading.Lock()
+    failed, errors, report = list(), list(), list()
+
+    def verify_one(record):
+        try:
+            mismatch, nbytes = verify(record, s3_objects[record['user']])
+        except Exception as fault:
+            LOGGER.error("Verification of %s failed with %s", record_key(record), fault)
+            with lock:
+                errors.append(record)
+                report.append(dict(user=record['user'], bucket=record['bucket'],
+                                   key=record['objectpath'], reason='read_error',
+                                   error=str(fault)))
+            with counters['errors'].get_lock():
+                counters['errors'].value += 1
+            return
+        with counters['bytes'].get_lock():
+            counters['bytes'].value += nbytes
+        if mismatch:
+            with lock:
+                failed.append(record)
+                report.append(mismatch)
+            with counters['failed'].get_lock():
+                counters['failed'].value += 1
+            return
+        with lock:
+            writer.writerow(record_key(record))
+        with counters['verified'].get_lock():
+            counters['verified'].value += 1
+
+    with open(checkpoint, 'a', newline='', buffering=1) as fp:
+        writer = csv.writer(fp)
+        with ThreadPoolExecutor(max_workers=nthreads) as executor:
+            list(executor.map(verify_one, records))
+    results.put((part, failed, errors, report))
+
+
+class ParallelVerifier:
+    """
+    Verify upload records in nprocs processes with nthreads threads each.
+    Usage:
+    verifier = ParallelVerifier(users, DataIntegrityValidator.verify_object)
+    summary = verifier.run(records, resume=True)
+    """
+
+    def __init__(self,
+                 users: dict,
+                 verify: Callable,
+                 connect: Callable = di_base.init_s3_connections,
+                 nprocs: int = params.DI_VERIFY_NPROCS,
+                 nthreads: int = params.NWORKERS,
+                 checkpoint_dir: str = params.DI_CHECKPOINT_DIR,
+                 progress_interval: int = 30) -> None:
+        """
+        :param users: users dict passed to connect
+        :param verify: picklable callable(record, s3) returning (mismatch entry or None, nbytes)
+        :param connect: picklable callable(users) returning user -> s3 resource dict
+        :param nprocs: number of processes
+        :param nthreads: threads per process
+        :param checkpoint_dir: directory of verified key checkpoints
+        :param progress_interval: seconds between progress logs
+        """
+        self.users = users
+        self.verify = verify
+        self.connect = connect
+        self.nprocs = max(1, nprocs)
+        self.nthreads = nthreads
+        self.checkpoint_dir = checkpoint_dir
+        self.progress_interval = progress_interval
+        self.counters = {name: mp.Value('q', 0) for name in
+                         ('verified', 'failed', 'errors', 'bytes')}
+        self.total = 0
+        self.skipped = 0
+        self.start_time = None
+
+    def checkpoint_files(self) -> list:
+        """Checkpoint files of all partitions."""
+        return glob.glob(os.path.join(self.checkpoint_dir, CHECKPOINT_PREFIX + '*.csv'))
+
+    def load_checkpoint(self) -> set:
+        """Keys verified by previous runs."""
+        verified = set()
+        for path in self.checkpoint_files():
+            with open(path, newline='') as fp:
+                verified.update(tuple(row) for row in csv.reader(fp) if len(row) == 3)
+        return verified
+
+    def reset(self) -> None:
+        """Forget checkpoints, next run verifies all records."""
+        for path in self.checkpoint_files():
+            os.remove(path)
+
+    def progress(self) -> dict:
+        """Live counters and throughput of current run."""
+        elapsed = time.time() - self.start_time if self.start_time else 0
+        stats = {name: counter.value for name, counter in self.counters.items()}
+        done = stats['verified'] + stats['failed'] + stats['errors']
+        stats.update(total=self.total, skipped=self.skipped, elapsed=round(elapsed, 2),
+                     objects_per_sec=round(done / elapsed, 2) if elapsed else 0,
+                     mb_per_sec=round(stats['bytes'] / elapsed / 2 ** 20, 2) if elapsed else 0)
+        return stats
+
+    def partition(self, records: Iterable[dict]) -> list:
+        """Stable partitioning on record key so a resumed run keeps the same layout."""
+        parts = [list() for _ in range(self.nprocs)]
+        for record in records:
+            key = '/'.join(record_key(record)).encode('utf-8')
+            parts[zlib.crc32(key) % self.nprocs].append(record)
+        return parts
+
+    def _partition_died(self, part: int, exitcode: int, records: list, checkpoint: str,
+                        summary: dict) -> None:
+        """Records of a dead partition which are not checkpointed are server errors."""
+        verified = set()
+        if os.path.exists(checkpoint):
+            with open(checkpoint, newline='') as fp:
+                verified.update(tuple(row) for row in csv.reader(fp) if len(row) == 3)
+        lost = [record for record in records if record_key(record) not in verified]
+        LOGGER.error("Verifier process of partition %s exited with %s, %s records not "
+                     "verified, resume to verify them", part, exitcode, len(lost))
+        summary['server_errors'].extend(lost)
+        summary['mismatch_report'].extend(
+            dict(user=record['user'], bucket=record['bucket'], key=record['objectpath'],
+                 reason='verifier_died', error=f'exit code {exitcode}') for record in lost)
+        with self.counters['errors'].get_lock():
+            self.counters['errors'].value += len(lost)
+
+    def run(self, records: Iterable[dict], resume: bool = False) -> dict:
+        """
+        Verify records and return summary with progress counters, failed records,
+        records which could not be read and structured mismatch report.
+        :param records: upload records, dicts with user, bucket, objectpath and checksum/seed
+        :param resume: skip records verified by a previous run, otherwise start afresh
+        """
+        os.makedirs(self.checkpoint_dir, exist_ok=True)
+        if not resume:
+            self.reset()
+        verified = self.load_checkpoint()
+        records = list(records)
+        todo = [record for record in records if record_key(record) not in verified]
+        self.total, self.skipped = len(records), len(records) - len(todo)
+        LOGGER.info("Verifying %s records in %s processes, %s verified earlier",
+                    len(todo), self.nprocs, self.skipped)
+        self.start_time = time.time()
+        results = mp.Queue()
+        procs, partitions = dict(), dict()
+        for part, part_records in enumerate(self.partition(todo)):
+            if not part_records:
+                continue
+            checkpoint = os.path.join(self.checkpoint_dir, f'{CHECKPOINT_PREFIX}{part}.csv')
+            partitions[part] = (part_records, checkpoint)
+            procs[part] = mp.Process(target=_verify_partition, args=(
+                part, part_records, self.users, self.verify, self.connect, self.nthreads,
+                checkpoint, self.counters, results))
+            procs[part].start()
+        summary = dict(failed_files=list(), server_errors=list(), mismatch_report=list())
+        pending = set(procs)
+        while pending:
+            try:
+                part, failed, errors, report = results.get(timeout=self.progress_interval)
+            except queue.Empty:
+                LOGGER.info("Verification progress %s", self.progress())
+                for part in list(pending):
+                    if not procs[part].is_alive() and procs[part].exitcode != 0:
+                        pending.discard(part)
+                        self._partition_died(part, procs[part].exitcode,
+                                             *partitions[part], summary)
+                continue
+            pending.discard(part)
+            summary['failed_files'].extend(failed)
+            summary['server_errors'].extend(errors)
+            summary['mismatch_report'].extend(report)
+        for proc in procs.values():
+            proc.join()
+        summary.update(self.progress())
+        LOGGER.info("Verification done %s", {key: val for key, val in summary.items()
+                                             if not isinstance(val, list)})
+        return summary
@@ -21,40 +21,27 @@
 """Multithreaded and greenlet based Upload tasks. Upload files and data blobs."""
 
 import os
-import sys
 import queue
-import random
 import logging
-import csv
-import hashlib
 import time
 import multiprocessing as mp
 from multiprocessing import Manager, Event
-from boto3.s3.transfer import TransferConfig
 from commons.utils import config_utils
+from commons.utils.s3_perf_utils import get_perf_profile
+from commons.utils.s3_perf_utils import transfer_config
 from commons.worker import Workers
 from commons import params
 from libs.di import di_base
 from libs.di import data_man
-from libs.di import data_generator
+from libs.di.data_profile import DataProfile
 from commons.params import USER_JSON
 
-try:
-    if sys.platform in ['linux', 'linux2']:
-        import fcntl
-except ModuleNotFoundError as error:
-    logging.error(error)
-
 uploadObjects = []
 LOGGER = logging.getLogger(__name__)
 
 
 class Uploader:
     """Simulates Uploads client upto 10k."""
-    tsfrConfig = TransferConfig(multipart_threshold=1024 * 1024 * 16,
-                                max_concurrency=320,
-                                multipart_chunksize=1024 * 1024 * 16,
-                                use_threads=True)
 
     def __init__(self):
         self.change_manager = data_man.DataManager()
@@ -62,10 +49,16 @@ class Uploader:
     def upload(self, user, keys, buckets, files_count, prefs, stop_event, future_obj):
         user_name = user.replace('_', '-')
         timestamp = time.strftime(params.DT_PATTERN_PREFIX)
-        s3connections = di_base.init_s3_conn(user_name=user_name,
-                                             keys=keys,
-                                             nworkers=params.NWORKERS)
-        pool_len = len(s3connections)
+        # single connection shared by all workers, its pool is sized to the worker count
+        s3 = di_base.get_s3_conn(keys[0], keys[1], user_name, nworkers=params.NWORKERS)
+        # object sizes, compression, dedupe and text mix come from the data profile
+        prefs_dict = prefs if isinstance(prefs, dict) else dict()
+        profile = DataProfile.load(prefs_dict.get('data_profile', params.DI_DATA_PROFILE))
+        specs = profile.objects(files_count * len(buckets), seed=prefs_dict.get('data_seed'))
+        LOGGER.info("Uploading %s data", profile)
+        perf_profile = get_perf_profile(default='di')
+        LOGGER.info("Using S3 perf profile %s", perf_profile)
+        tsfr_config = transfer_config(perf_profile)
 
         workers = Workers()
         workers.start_workers(func=self._upload)
@@ -79,9 +72,10 @@ class Uploader:
                     kwargs = dict()
                     kwargs['user'] = user
                     kwargs['bucket'] = bucket
-                    kwargs['s3connections'] = s3connections
-                    kwargs['pool_len'] = pool_len
+                    kwargs['s3'] = s3
+                    kwargs['tsfr_config'] = tsfr_config
                     kwargs['file_number'] = ix
+                    kwargs['spec'] = next(specs)
                     kwargs['prefs'] = prefs
                     workQ.put(kwargs)
                     workers.wenque(workQ)
@@ -99,55 +93,38 @@ class Uploader:
         workers.end_workers()
         LOGGER.info('Upload Workers shutdown completed successfully')
         if len(uploadObjects) > 0:
-            with open(params.UPLOADED_FILES, 'a', newline='') as fp:
-                wr = csv.writer(
-                    fp, quoting=csv.QUOTE_NONE, delimiter=',', quotechar='',
-                    escapechar='\\')
-                fcntl.flock(fp, fcntl.LOCK_EX)
-                wr.writerows(uploadObjects)
-                fcntl.flock(fp, fcntl.LOCK_UN)
+            self.change_manager.manifest.add_many(uploadObjects)
+        # user meta json is a dump of manifest entries of the user
+        self.change_manager.export_to_json(user)
         LOGGER.info(f'Upload completed for user {user}')
 
     def _upload(self, kwargs):
         bucket = kwargs['bucket']
         m = kwargs['file_number']
-        s3connections = kwargs['s3connections']
-        pool_len = kwargs['pool_len']
+        s3 = kwargs['s3']
         user_name = kwargs['user']
-        prefs = kwargs['prefs']
-        prefix = prefs.get('prefix_dir', 'test-1')  # todo revisit
-
-        # todo get random compression ratio and process prefs
-        # get random size
-        seed = data_generator.DataGenerator.get_random_seed()
-        size = random.sample(data_generator.SMALL_BLOCK_SIZES, 1)[0]
-        gen = data_generator.DataGenerator(c_ratio=2)
-        buf, csum = gen.generate(size, seed=seed)
-        file_path = gen.save_buf_to_file(buf, csum, 1024 * 1024, prefix)
-        s3 = s3connections[random.randint(0, pool_len - 1)]
+        spec = kwargs['spec']
+        seed, size, c_ratio = spec['seed'], spec['size'], spec['c_ratio']
+        gen = DataProfile.generator(spec)
+        # md5 is computed chunk by chunk and object is streamed, memory is bounded by chunk
+        # and part sizes rather than object size
+        md5sum = gen.checksum(size, seed, csum_algo='md5')
+        obj_name = gen.get_object_name(md5sum)
         try:
-            s3.meta.client.upload_file(str(file_path),
-                                       bucket,
-                                       os.path.basename(file_path),
-                                       Config=Uploader.tsfrConfig)
-            print(f'uploaded file {file_path} for user {user_name}')
+            s3.meta.client.upload_fileobj(gen.stream(size, seed),
+                                          bucket,
+                                          obj_name,
+                                          Config=kwargs['tsfr_config'])
+            print(f'uploaded object {obj_name} for user {user_name}')
         except Exception as e:
             LOGGER.info(
-                f'{file_path} in bucket {bucket} Upload caught exception: {e}')
+                f'{obj_name} in bucket {bucket} Upload caught exception: {e}')
         else:
-            LOGGER.info(f'{file_path} in bucket {bucket} Upload Done')
-            with open(file_path, 'rb') as fp:
-                md5sum = hashlib.md5(fp.read()).hexdigest()
-            obj_name = os.path.basename(file_path)
-            stat_info = os.stat(file_path)
-            row_data = [user_name, bucket, obj_name, md5sum]
-            uploadObjects.append(row_data)
-            file_object = dict(name=obj_name, checksum=md5sum, seed=seed,
-                               size=size, mtime=stat_info.st_mtime)
-            self.change_manager.add_file_to_bucket(
-                user_name, bucket, file_object)
-            if os.path.exists(file_path):
-                os.remove(file_path)
+            LOGGER.info(f'{obj_name} in bucket {bucket} Upload Done')
+            # seed, size and compression ratio let verifier regenerate expected content
+            uploadObjects.append(dict(user=user_name, bucket=bucket, key=obj_name, md5=md5sum,
+                                      seed=seed, size=size, c_ratio=c_ratio,
+                                      text=spec['text']))
 
     def start(self, users, buckets, files_count, prefs, stop_event, future_obj=None):
         LOGGER.info(f'Starting uploads for users {users}')
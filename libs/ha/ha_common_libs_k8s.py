@@ -41,8 +41,8 @@ from commons.constants import Rest as Const
 from commons.exceptions import CTException
 from commons.helpers.pods_helper import LogicalNode
 from commons.utils import config_utils
+from commons.utils.checksum import checksum_files
 from commons.utils import system_utils
-from commons.utils.system_utils import run_local_cmd
 from config import CMN_CFG, HA_CFG
 from config.s3 import S3_BLKBOX_CFG
 from config.s3 import S3_CFG
@@ -251,11 +251,14 @@ class HAK8s:
                                        secret_key=details['secretkey'])
                     bucket_list = s3_del.bucket_list()[1]
                     for _bucket in bucket_list:
-                        obj_list = s3_del.object_list(_bucket)
-                        LOGGER.debug("List of object response for %s bucket is %s", _bucket,
-                                     obj_list)
-                        response = s3_del.delete_multiple_objects(_bucket, obj_list[1], quiet=True)
-                        LOGGER.debug("Delete multiple objects response %s", response)
+                        for obj_list in s3_del.iter_object_pages(_bucket):
+                            if not obj_list:
+                                continue
+                            LOGGER.debug("Deleting %s objects of %s bucket", len(obj_list),
+                                         _bucket)
+                            response = s3_del.delete_multiple_objects(_bucket, obj_list,
+                                                                      quiet=True)
+                            LOGGER.debug("Delete multiple objects response %s", response)
                 return True, "Successfully performed Objects Delete operation"
             for details in s3_data.values():
                 s3_del = S3TestLib(endpoint_url=S3_CFG["s3_url"],
@@ -590,6 +593,39 @@ class HAK8s:
             LOGGER.error("Error in %s: %s", HAK8s.partial_multipart_upload.__name__, error)
             return False, error
 
+    def resume_partial_multipart_upload(self, s3_data, bucket_name, object_name, mpu_id,
+                                        **kwargs):
+        """
+        Helper function to finish a multipart upload interrupted e.g. by a pod failure.
+        Parts stored before interruption are taken over from list parts, the rest are
+        uploaded in parallel and the upload is completed.
+        :param s3_data: s3 account details
+        :param bucket_name: Name of the bucket
+        :param object_name: Name of the object
+        :param mpu_id: Multipart upload id
+        :keyword multipart_obj_size: Size of the file in MB
+        :keyword total_parts: Total parts, split as by create_multiple_data_parts
+        :keyword multipart_obj_path: Path of the file being uploaded
+        :keyword complete: Complete the upload, default True
+        :return: (bool, upload report with throughput and part latencies or error)
+        """
+        try:
+            part_size = 1048576 * (int(kwargs.get("multipart_obj_size")) //
+                                   int(kwargs.get("total_parts")))
+            s3_mp_test_obj = S3MultipartTestLib(access_key=s3_data["s3_acc"]["accesskey"],
+                                                secret_key=s3_data["s3_acc"]["secretkey"],
+                                                endpoint_url=S3_CFG["s3_url"])
+            resp = s3_mp_test_obj.resume_multipart_upload(
+                mpu_id, bucket_name, object_name, kwargs.get("multipart_obj_path"), part_size,
+                complete=kwargs.get("complete", True))
+            LOGGER.info("Resumed upload %s: %s parts taken over, %s uploaded", mpu_id,
+                        resp[1]["resumed"], resp[1]["uploaded"])
+            return resp
+        except BaseException as error:
+            LOGGER.error("Error in %s: %s", HAK8s.resume_partial_multipart_upload.__name__,
+                         error)
+            return False, error
+
     @staticmethod
     def create_multiple_data_parts(multipart_obj_path, multipart_obj_size, total_parts):
         """
@@ -817,12 +853,8 @@ class HAK8s:
         :param compare: Flag to compare checksums of files
         :return: List of md5 content or bool for md5 comparison
         """
-        md5_list = []
-        for file in file_list:
-            cmd = common_cmd.MD5SUM.format("-t", file)
-            resp = run_local_cmd(cmd=cmd)
-            md5 = (resp[1].split())[0]
-            md5_list.append(md5.replace("b'", ""))
+        checksums = checksum_files(file_list)
+        md5_list = [checksums[file]['md5'] for file in file_list]
 
         if not compare:
             return md5_list
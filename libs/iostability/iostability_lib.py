@@ -80,16 +80,9 @@ class IOStabilityLib:
                 if skip_cleanup:
                     # delete only objects, to be used for degraded mode.
                     self.log.info("Delete Created Objects")
-                    resp = self.s3t_obj.object_list(bucket_name=bucket_name)
-                    obj_list = resp[1]
-                    while len(obj_list):
-                        if len(obj_list) > 1000:
-                            self.s3t_obj.delete_multiple_objects(bucket_name,
-                                                                 obj_list=obj_list[0:1000])
-                            obj_list = obj_list[1000:]
-                        else:
+                    for obj_list in self.s3t_obj.iter_object_pages(bucket_name=bucket_name):
+                        if obj_list:
                             self.s3t_obj.delete_multiple_objects(bucket_name=bucket_name,
                                                                  obj_list=obj_list)
-                            obj_list = []
                     self.log.info("Objects deletion completed")
             loop += 1
@@ -27,6 +27,7 @@ from typing import Union
 import boto3
 
 from config.s3 import S3_CFG
+from libs.s3.s3_core_lib import evict_s3_connections
 
 LOGGER = logging.getLogger(__name__)
 
@@ -145,6 +146,7 @@ class IamLib(IAMRest):
         response = self.iam.delete_access_key(
             AccessKeyId=access_key_id, UserName=user_name)
         LOGGER.debug(response)
+        evict_s3_connections(access_key_id)
 
         return response
 
@@ -34,6 +34,7 @@ from config.s3 import S3_CFG
 from libs.s3 import LDAP_USERNAME, LDAP_PASSWD, ACCESS_KEY, SECRET_KEY
 from libs.s3.iam_core_lib import IamLib
 from libs.s3.s3_core_lib import S3Lib
+from libs.s3.s3_core_lib import evict_s3_connections
 
 LOGGER = logging.getLogger(__name__)
 
@@ -588,6 +589,8 @@ class IamTestLib(IamLib):
         # Adding sleep in sec due to ldap sync issue EOS-5924
         time.sleep(S3_CFG["delete_account_delay"])
         LOGGER.info(response)
+        if access_key:
+            evict_s3_connections(access_key)
         if "Account cannot be deleted" in response:
             LOGGER.error("Error in %s: %s",
                          IamTestLib.delete_account.__name__,
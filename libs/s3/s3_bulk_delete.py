@@ -0,0 +1,220 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+#
+# Copyright (c) 2022 Seagate Technology LLC and/or its Affiliates
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published
+# by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+#
+# For any questions about this software or licensing,
+# please email opensource@seagate.com or cortx-questions@seagate.com.
+#
+
+
+"""Bulk deletion of buckets with their contents.
+List pages are streamed into concurrent DeleteObjects batches of up to 1000 keys, versions
+and delete markers of versioned buckets are included and incomplete multipart uploads are
+aborted so the bucket itself can be removed. Buckets are processed in parallel with bounded
+concurrency, every batch of every bucket runs on one shared pool sized to the connection
+pool of the client.
+"""
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import as_completed
+from typing import Iterable
+from typing import Iterator
+
+from botocore.exceptions import ClientError
+
+LOGGER = logging.getLogger(__name__)
+
+# Max keys of a DeleteObjects request and page size of listings
+DELETE_BATCH = 1000
+# List and delete passes per bucket before giving up on a bucket which is not empty
+MAX_PASSES = 3
+# Buckets deleted in parallel
+MAX_BUCKETS = 4
+
+
+def bucket_versioned(s3_client, bucket: str) -> bool:
+    """True if versioning of a bucket was ever enabled, its versions need to be listed."""
+    try:
+        status = s3_client.get_bucket_versioning(Bucket=bucket).get("Status")
+    except ClientError as error:
+        LOGGER.debug("Versioning status of %s not available: %s", bucket, error)
+        return False
+    return status in ("Enabled", "Suspended")
+
+
+def key_batches(s3_client, bucket: str, versions: bool = None) -> Iterator[list]:
+    """
+    Object identifiers of a bucket as DeleteObjects batches, streamed page by page.
+    :param versions: list versions and delete markers, by versioning status when None
+    """
+    if versions is None:
+        versions = bucket_versioned(s3_client, bucket)
+    config = {"PageSize": DELETE_BATCH}
+    if versions:
+        pages = s3_client.get_paginator("list_object_versions").paginate(
+            Bucket=bucket, PaginationConfig=config)
+    else:
+        pages = s3_client.get_paginator("list_objects_v2").paginate(
+            Bucket=bucket, PaginationConfig=config)
+    for page in pages:
+        if versions:
+            batch = [{"Key": obj["Key"], "VersionId": obj["VersionId"]}
+                     for obj in page.get("Versions", []) + page.get("DeleteMarkers", [])]
+        else:
+            batch = [{"Key": obj["Key"]} for obj in page.get("Contents", [])]
+        for index in range(0, len(batch), DELETE_BATCH):
+            yield batch[index:index + DELETE_BATCH]
+
+
+class BulkDelete:
+    """
+    Usage:
+    bulk = BulkDelete(s3_test_obj.s3_client)
+    summary = bulk.delete_buckets(["bkt-1", "bkt-2"])
+    LOGGER.info("%s objects/sec", summary["objects_per_sec"])
+    """
+
+    def __init__(self, s3_client, nworkers: int = None, max_buckets: int = MAX_BUCKETS) -> None:
+        """
+        :param s3_client: boto3 s3 client
+        :param nworkers: concurrent S3 requests, connection pool size of client when not given
+        :param max_buckets: buckets deleted in parallel
+        """
+        self.s3_client = s3_client
+        self.nworkers = nworkers or s3_client.meta.config.max_pool_connections
+        self.max_buckets = max_buckets
+        # listing stays at most two batches per worker ahead of deletes
+        self._inflight = threading.BoundedSemaphore(2 * self.nworkers)
+
+    def _submit(self, executor: ThreadPoolExecutor, func, *args):
+        """Submit a request, blocks while too many are queued."""
+        self._inflight.acquire()
+        try:
+            future = executor.submit(func, *args)
+        except BaseException:
+            self._inflight.release()
+            raise
+        future.add_done_callback(lambda _: self._inflight.release())
+        return future
+
+    def _delete_batch(self, bucket: str, batch: list) -> tuple:
+        """Delete a batch, return number deleted and per key errors."""
+        response = self.s3_client.delete_objects(
+            Bucket=bucket, Delete={"Objects": batch, "Quiet": True})
+        errors = response.get("Errors", [])
+        return len(batch) - len(errors), errors
+
+    def abort_uploads(self, bucket: str, executor: ThreadPoolExecutor) -> int:
+        """Abort incomplete multipart uploads of a bucket, return number aborted."""
+        futures = list()
+        for page in self.s3_client.get_paginator("list_multipart_uploads").paginate(
+                Bucket=bucket):
+            for upload in page.get("Uploads", []):
+                futures.append(self._submit(
+                    executor, lambda key, upload_id: self.s3_client.abort_multipart_upload(
+                        Bucket=bucket, Key=key, UploadId=upload_id),
+                    upload["Key"], upload["UploadId"]))
+        for future in futures:
+            future.result()
+        return len(futures)
+
+    def empty_bucket(self, bucket: str, executor: ThreadPoolExecutor,
+                     versions: bool = None) -> tuple:
+        """
+        One list and delete pass over a bucket, batches are deleted while listing continues.
+        :return: number of deleted objects and per key errors
+        """
+        futures = [self._submit(executor, self._delete_batch, bucket, batch)
+                   for batch in key_batches(self.s3_client, bucket, versions)]
+        deleted, errors = 0, list()
+        for future in futures:
+            count, batch_errors = future.result()
+            deleted += count
+            errors.extend(batch_errors)
+        return deleted, errors
+
+    def delete_bucket(self, bucket: str, executor: ThreadPoolExecutor = None) -> dict:
+        """
+        Delete a bucket with all its objects, versions, delete markers and uploads.
+        Objects written while deleting are picked up by another pass.
+        :param executor: pool running requests, a private one when not given
+        :return: dict with bucket, objects, uploads, elapsed, objects_per_sec and response
+        of DeleteBucket
+        """
+        start = time.perf_counter()
+        stats = dict(bucket=bucket, objects=0, uploads=0)
+        own_executor = executor is None
+        if own_executor:
+            executor = ThreadPoolExecutor(max_workers=self.nworkers)
+        try:
+            versions = bucket_versioned(self.s3_client, bucket)
+            for attempt in range(1, MAX_PASSES + 1):
+                stats["uploads"] += self.abort_uploads(bucket, executor)
+                deleted, errors = self.empty_bucket(bucket, executor, versions)
+                stats["objects"] += deleted
+                if errors:
+                    LOGGER.warning("%s keys of %s could not be deleted, first error: %s",
+                                   len(errors), bucket, errors[0])
+                try:
+                    stats["response"] = self.s3_client.delete_bucket(Bucket=bucket)
+                    break
+                except ClientError as error:
+                    if error.response["Error"]["Code"] != "BucketNotEmpty" or \
+                            attempt == MAX_PASSES:
+                        raise
+                    LOGGER.info("Bucket %s not empty after pass %s", bucket, attempt)
+        finally:
+            if own_executor:
+                executor.shutdown()
+        stats["elapsed"] = time.perf_counter() - start
+        stats["objects_per_sec"] = stats["objects"] / stats["elapsed"]
+        LOGGER.info("Deleted bucket %s with %s objects and %s uploads in %.2fs, %.1f objects/sec",
+                    bucket, stats["objects"], stats["uploads"], stats["elapsed"],
+                    stats["objects_per_sec"])
+        return stats
+
+    def delete_buckets(self, buckets: Iterable[str]) -> dict:
+        """
+        Delete buckets with their contents, max_buckets at a time.
+        :return: dict with deleted buckets, failed buckets and their errors, objects,
+        uploads, elapsed and objects_per_sec
+        """
+        buckets = list(buckets)
+        summary = dict(deleted=list(), failed=dict(), objects=0, uploads=0)
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=self.nworkers) as executor, \
+                ThreadPoolExecutor(max_workers=max(1, min(self.max_buckets,
+                                                          len(buckets)))) as bucket_executor:
+            futures = {bucket_executor.submit(self.delete_bucket, bucket, executor): bucket
+                       for bucket in buckets}
+            for future in as_completed(futures):
+                bucket = futures[future]
+                try:
+                    stats = future.result()
+                except Exception as error:
+                    LOGGER.error("Failed to delete bucket %s: %s", bucket, error)
+                    summary["failed"][bucket] = error
+                    continue
+                summary["deleted"].append(bucket)
+                summary["objects"] += stats["objects"]
+                summary["uploads"] += stats["uploads"]
+        summary["elapsed"] = time.perf_counter() - start
+        summary["objects_per_sec"] = summary["objects"] / summary["elapsed"]
+        LOGGER.info("Deleted %s of %s buckets with %s objects in %.2fs, %.1f objects/sec",
+                    len(summary["deleted"]), len(buckets), summary["objects"],
+                    summary["elapsed"], summary["objects_per_sec"])
+        return summary
@@ -21,17 +21,112 @@
 
 """Python Library using boto3 module to perform Bucket and object Operations."""
 
+import copy
 import os
 import logging
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterator
 from typing import Union
 from botocore.config import Config
 
 import boto3
 from config import S3_CFG, CMN_CFG
 from commons.constants import S3_ENGINE_RGW
+from commons.utils.s3_perf_utils import botocore_config
+from commons.utils.s3_perf_utils import get_perf_profile
+from libs.s3.s3_bulk_delete import BulkDelete
+from libs.s3.s3_bulk_delete import MAX_BUCKETS
 
 LOGGER = logging.getLogger(__name__)
 
+# Keys per ListObjectsV2 page, max allowed by S3
+LIST_PAGE_SIZE = 1000
+
+# (pid, connection params, config) -> boto3 client shared by S3Rest instances and threads
+_S3_CONNECTIONS = dict()
+_S3_CONNECTIONS_LOCK = threading.Lock()
+# boto3 resources are not thread safe, every thread keeps its own in .resources keyed as
+# clients. They go away with the thread, .generation drops them after an eviction.
+_S3_RESOURCES = threading.local()
+_S3_GENERATION = 0
+
+
+def _clear_s3_connections():
+    """Forget connections inherited from parent, runs in child after fork."""
+    global _S3_CONNECTIONS_LOCK, _S3_RESOURCES
+    _S3_CONNECTIONS.clear()
+    _S3_CONNECTIONS_LOCK = threading.Lock()
+    _S3_RESOURCES = threading.local()
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_clear_s3_connections)
+
+
+def _freeze(value):
+    """Hashable form of connection parameters."""
+    if isinstance(value, dict):
+        return tuple(sorted((key, _freeze(val)) for key, val in value.items()))
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(val) for val in value)
+    return value
+
+
+def _new_s3_connection(kind: str, config: dict, params: dict):
+    """New boto3 s3 client or resource."""
+    session = boto3.session.Session()
+    factory = session.client if kind == "client" else session.resource
+    # botocore updates nested config dicts in place, keep caller's config intact
+    return factory("s3", config=Config(**copy.deepcopy(config or {})), **params)
+
+
+def get_s3_connection(kind: str, config: dict = None, **params):
+    """
+    Cached boto3 s3 client or resource. Service model loading and endpoint resolution
+    are done once per distinct (credentials, endpoint, region, ssl, config).
+    Clients are shared by all threads of a process, resources are not thread safe and
+    are cached per thread.
+    :param kind: "client" or "resource"
+    :param config: botocore Config keyword arguments
+    :param params: boto3 client/resource keyword arguments
+    """
+    key = (os.getpid(), _freeze(params), _freeze(config or {}))
+    if kind == "resource":
+        if getattr(_S3_RESOURCES, "generation", None) != _S3_GENERATION:
+            _S3_RESOURCES.resources = dict()
+            _S3_RESOURCES.generation = _S3_GENERATION
+        conn = _S3_RESOURCES.resources.get(key)
+        if conn is None:
+            conn = _S3_RESOURCES.resources[key] = _new_s3_connection(kind, config, params)
+        return conn
+    conn = _S3_CONNECTIONS.get(key)
+    if conn is not None:
+        return conn
+    with _S3_CONNECTIONS_LOCK:
+        conn = _S3_CONNECTIONS.get(key)
+        if conn is None:
+            conn = _S3_CONNECTIONS[key] = _new_s3_connection(kind, config, params)
+    return conn
+
+
+def evict_s3_connections(access_key: str = None) -> int:
+    """
+    Drop cached clients of an access key, all of them when not given, and per thread
+    resources of all threads. Call when credentials are deleted.
+    :return: number of evicted clients
+    """
+    global _S3_GENERATION
+    with _S3_CONNECTIONS_LOCK:
+        keys = [key for key in _S3_CONNECTIONS
+                if access_key is None or dict(key[1]).get("aws_access_key_id") == access_key]
+        for key in keys:
+            del _S3_CONNECTIONS[key]
+        _S3_GENERATION += 1
+    LOGGER.debug("Evicted %s s3 connections of %s", len(keys), access_key or "all keys")
+    return len(keys)
+
 
 # pylint:disable=too-few-public-methods
 class S3Rest:
@@ -47,7 +142,8 @@ class S3Rest:
         method initializes members of S3Lib.
 
         Different instances need to be create as per different parameter values like access_key,
-        secret_key etc.
+        secret_key etc. Instances with same parameters share cached boto3 client, resource is
+        cached per thread and created on first use in a thread.
         :param access_key: access key.
         :param secret_key: secret key.
         :param endpoint_url: endpoint url.
@@ -55,6 +151,7 @@ class S3Rest:
         :param region: region.
         :param aws_session_token: aws_session_token.
         :param debug: debug mode.
+        :param perf_profile: S3 perf profile name, active profile when not given.
         """
         init_s3_connection = kwargs.get("init_s3_connection", True)
         if S3_ENGINE_RGW == CMN_CFG["s3_engine"]:
@@ -63,7 +160,8 @@ class S3Rest:
             region = kwargs.get("region", None)
         aws_session_token = kwargs.get("aws_session_token", None)
         debug = kwargs.get("debug", S3_CFG["debug"])
-        config = Config(retries={'max_attempts': 6})
+        self.perf_profile = get_perf_profile(kwargs.get("perf_profile"))
+        config = botocore_config(self.perf_profile)
         self.use_ssl = kwargs.get("use_ssl", S3_CFG["use_ssl"])
         val_cert = kwargs.get("validate_certs", S3_CFG["validate_certs"])
         self.s3_cert_path = s3_cert_path if val_cert else False
@@ -74,39 +172,42 @@ class S3Rest:
         if debug:
             # Uncomment to enable debug
             boto3.set_stream_logger(name="botocore")
+        self._s3_params = None
+        self._s3_resource = None  # set only when a resource is assigned by caller
         try:
             if init_s3_connection:
-                self.s3_resource = boto3.resource("s3",
-                                                  use_ssl=self.use_ssl,
-                                                  verify=self.s3_cert_path,
-                                                  aws_access_key_id=access_key,
-                                                  aws_secret_access_key=secret_key,
-                                                  endpoint_url=endpoint_url,
-                                                  region_name=region,
-                                                  aws_session_token=aws_session_token,
-                                                  config=config)
-                self.s3_client = boto3.client("s3",
-                                              use_ssl=self.use_ssl,
-                                              verify=self.s3_cert_path,
-                                              aws_access_key_id=access_key,
-                                              aws_secret_access_key=secret_key,
-                                              endpoint_url=endpoint_url,
-                                              region_name=region,
-                                              aws_session_token=aws_session_token,
-                                              config=config)
+                self._s3_params = dict(use_ssl=self.use_ssl,
+                                       verify=self.s3_cert_path,
+                                       aws_access_key_id=access_key,
+                                       aws_secret_access_key=secret_key,
+                                       endpoint_url=endpoint_url,
+                                       region_name=region,
+                                       aws_session_token=aws_session_token)
+                self._s3_config = config
+                self.s3_client = get_s3_connection("client", config, **self._s3_params)
             else:
                 LOGGER.info("Skipped: create s3 client, resource object with boto3.")
         except Exception as error:
             if "unreachable network" not in str(error):
                 LOGGER.critical(error)
 
+    @property
+    def s3_resource(self):
+        """boto3 s3 resource of calling thread, created or taken from cache."""
+        if self._s3_resource is not None:
+            return self._s3_resource
+        if self._s3_params is None:
+            raise AttributeError("s3 connection is not initialized")
+        return get_s3_connection("resource", self._s3_config, **self._s3_params)
+
+    @s3_resource.setter
+    def s3_resource(self, resource) -> None:
+        self._s3_resource = resource
+
     def __del__(self):
-        """Destroy all core objects."""
-        try:
-            del self.s3_client
-            del self.s3_resource
-        except NameError as error:
-            LOGGER.warning(error)
+        """Drop references to core objects, cached ones stay usable for other instances."""
+        self.__dict__.pop("s3_client", None)
+        self.__dict__.pop("_s3_resource", None)
 
 
 class S3Lib(S3Rest):
@@ -216,9 +317,8 @@ class S3Lib(S3Rest):
         :param bucket_name: Name of the bucket.
         :return: response.
         """
-        bucket = self.s3_resource.Bucket(bucket_name)
-        response_obj = [obj.key for obj in bucket.objects.all()]
-        LOGGER.debug(response_obj)
+        response_obj = list(self.iter_objects(bucket_name))
+        LOGGER.debug("Listed %s objects of bucket %s", len(response_obj), bucket_name)
 
         return response_obj
 
@@ -235,19 +335,144 @@ class S3Lib(S3Rest):
         :param maxkeys: Sets the maximum number of keys returned in the response.
         :return: List of objects of a bucket having specified prefix.
         """
-        resp = None
-        if prefix:
-            resp = self.s3_client.list_objects(
-                Bucket=bucket_name, Prefix=prefix)
-        if maxkeys:
-            resp = self.s3_client.list_objects(
-                Bucket=bucket_name, MaxKeys=maxkeys)
-        LOGGER.debug("Resp is : %s", str(resp))
-        obj_lst = [obj['Key'] for obj in resp['Contents']]
+        obj_lst = list(self.iter_objects(bucket_name, prefix=prefix or "", max_keys=maxkeys))
         LOGGER.debug(obj_lst)
 
         return obj_lst
 
+    def _list_pages(self,
+                    bucket_name: str,
+                    prefix: str = "",
+                    delimiter: str = None,
+                    page_size: int = LIST_PAGE_SIZE,
+                    max_keys: int = None) -> Iterator[dict]:
+        """Raw ListObjectsV2 pages, fetched one at a time as they are consumed."""
+        kwargs = dict(Bucket=bucket_name, Prefix=prefix)
+        if delimiter:
+            kwargs["Delimiter"] = delimiter
+        config = {"PageSize": page_size}
+        if max_keys:
+            config["MaxItems"] = max_keys
+        return self.s3_client.get_paginator("list_objects_v2").paginate(
+            PaginationConfig=config, **kwargs)
+
+    def iter_object_pages(self,
+                          bucket_name: str = None,
+                          prefix: str = "",
+                          delimiter: str = None,
+                          page_size: int = LIST_PAGE_SIZE,
+                          keys_only: bool = True) -> Iterator[list]:
+        """
+        Objects of a bucket page by page, only one page is held in memory.
+
+        :param bucket_name: Name of the bucket.
+        :param prefix: List keys starting with prefix only.
+        :param delimiter: Skip keys below delimiter, see iter_common_prefixes.
+        :param page_size: Keys per list request, at most 1000.
+        :param keys_only: Yield keys, else object dicts with Key, Size, ETag etc.
+        :return: generator of lists of keys or object dicts.
+        """
+        for page in self._list_pages(bucket_name, prefix, delimiter, page_size):
+            contents = page.get("Contents", [])
+            yield [obj["Key"] for obj in contents] if keys_only else contents
+
+    def iter_objects(self,
+                     bucket_name: str = None,
+                     prefix: str = "",
+                     delimiter: str = None,
+                     page_size: int = LIST_PAGE_SIZE,
+                     max_keys: int = None,
+                     keys_only: bool = True) -> Iterator:
+        """
+        Objects of a bucket one by one with constant memory, see iter_object_pages.
+
+        :param max_keys: Stop after max_keys objects.
+        :return: generator of keys or object dicts.
+        """
+        for page in self._list_pages(bucket_name, prefix, delimiter, page_size, max_keys):
+            for obj in page.get("Contents", []):
+                yield obj["Key"] if keys_only else obj
+
+    def iter_common_prefixes(self,
+                             bucket_name: str = None,
+                             prefix: str = "",
+                             delimiter: str = "/") -> Iterator[str]:
+        """
+        Common prefixes of keys below prefix, i.e. "directories" of a bucket.
+
+        :return: generator of prefixes including trailing delimiter.
+        """
+        for page in self._list_pages(bucket_name, prefix, delimiter):
+            for common_prefix in page.get("CommonPrefixes", []):
+                yield common_prefix["Prefix"]
+
+    def iter_objects_parallel(self,
+                              bucket_name: str = None,
+                              prefixes: list = None,
+                              delimiter: str = "/",
+                              nworkers: int = None,
+                              page_size: int = LIST_PAGE_SIZE,
+                              keys_only: bool = True) -> Iterator:
+        """
+        Objects of a bucket listed by prefix partitions concurrently, in no particular order.
+
+        Partitions are common prefixes of delimiter when not given, keys which are not below
+        any of them are yielded first. Given prefixes must not overlap.
+        :param prefixes: Key prefixes listed concurrently.
+        :param delimiter: Delimiter discovering partitions.
+        :param nworkers: Concurrent list requests, connection pool size of perf profile.
+        :return: generator of keys or object dicts.
+        """
+        if prefixes is None:
+            prefixes = list()
+            for page in self._list_pages(bucket_name, delimiter=delimiter, page_size=page_size):
+                for obj in page.get("Contents", []):
+                    yield obj["Key"] if keys_only else obj
+                prefixes.extend(cp["Prefix"] for cp in page.get("CommonPrefixes", []))
+        if not prefixes:
+            return
+        nworkers = min(nworkers or self.perf_profile["max_pool_connections"], len(prefixes))
+        pages = queue.Queue(maxsize=2 * nworkers)
+        stop = threading.Event()
+
+        def put(item) -> bool:
+            """Queue item unless consumer went away."""
+            while not stop.is_set():
+                try:
+                    pages.put(item, timeout=1)
+                    return True
+                except queue.Full:
+                    continue
+            return False
+
+        def list_partition(partition: str) -> None:
+            if stop.is_set():
+                return
+            try:
+                for page in self.iter_object_pages(bucket_name, partition,
+                                                   page_size=page_size, keys_only=keys_only):
+                    if not put(page):
+                        return
+                put(None)
+            except Exception as error:
+                put(error)
+
+        with ThreadPoolExecutor(max_workers=nworkers) as executor:
+            for partition in prefixes:
+                executor.submit(list_partition, partition)
+            try:
+                pending = len(prefixes)
+                while pending:
+                    item = pages.get()
+                    if item is None:
+                        pending -= 1
+                    elif isinstance(item, Exception):
+                        raise item
+                    else:
+                        yield from item
+            finally:
+                stop.set()
+
     def head_bucket(self, bucket_name: str = None) -> dict:
         """
         To determine if a bucket exists and you have permission to access it.
@@ -341,21 +566,27 @@ class S3Lib(S3Rest):
         :param force: Value for delete bucket with object or without object.
         :return: response.
         """
-        bucket = self.s3_resource.Bucket(bucket_name)
         if force:
-            self.object_list(bucket_name)
             LOGGER.info(
                 "This might cause data loss as you have opted for bucket deletion with "
                 "objects in it")
-            response = bucket.objects.all().delete()
-            LOGGER.debug(
-                "Objects deleted successfully from bucket %s, response: %s", bucket_name, response)
-            self.object_list(bucket_name)
-        response = bucket.delete()
+            response = BulkDelete(self.s3_client).delete_bucket(bucket_name)["response"]
+        else:
+            response = self.s3_resource.Bucket(bucket_name).delete()
         LOGGER.debug("Bucket '%s' deleted successfully. Response: %s", bucket_name, response)
 
         return response
 
+    def delete_buckets(self, bucket_list: list, max_buckets: int = MAX_BUCKETS) -> dict:
+        """
+        Deleting buckets along with objects, versions and uploads, buckets in parallel.
+
+        :param bucket_list: List of bucket names.
+        :param max_buckets: Buckets deleted in parallel.
+        :return: summary with deleted and failed buckets, objects and objects_per_sec.
+        """
+        return BulkDelete(self.s3_client, max_buckets=max_buckets).delete_buckets(bucket_list)
+
     def get_bucket_size(self, bucket_name: str = None) -> dict:
         """
         Getting size of bucket.
@@ -24,7 +24,8 @@ import os
 import sys
 import logging
 import threading
-from boto3.s3.transfer import TransferConfig
+from commons.utils.s3_perf_utils import get_perf_profile
+from commons.utils.s3_perf_utils import transfer_config
 from libs.s3.s3_core_lib import S3Lib
 
 LOGGER = logging.getLogger(__name__)
@@ -280,11 +281,8 @@ class MultipartUsingBoto(S3Lib):
 
     @staticmethod
     def get_transfer_config():
-        """Create a transfer config."""
-        config = TransferConfig(multipart_threshold=1024 * 1024,
-                                max_concurrency=10,
-                                multipart_chunksize=1024 * 1024,
-                                use_threads=True)
+        """Create a transfer config from active S3 perf profile, multipart by default."""
+        config = transfer_config(get_perf_profile(default='multipart'))
 
         return config
 
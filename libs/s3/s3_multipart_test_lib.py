@@ -23,12 +23,12 @@
 import os
 import logging
 from hashlib import md5
+from random import shuffle
 from numpy.random import permutation
 
 from botocore.exceptions import ClientError
 from commons import errorcodes as err
 from commons.exceptions import CTException
-from commons.greenlet_worker import GeventPool
 from commons.utils.system_utils import create_file
 from commons.utils.system_utils import cal_percent
 from commons.utils import s3_utils
@@ -37,6 +37,8 @@ from config.s3 import S3_CFG
 from libs.s3 import ACCESS_KEY, SECRET_KEY
 from libs.s3.s3_multipart import Multipart
 from libs.s3.s3_common_test_lib import S3BackgroundIO
+from libs.s3.s3_parallel_multipart import PART_ATTEMPTS
+from libs.s3.s3_parallel_multipart import ParallelMultipartUpload
 
 LOGGER = logging.getLogger(__name__)
 
@@ -242,27 +244,28 @@ class S3MultipartTestLib(Multipart):
                               object_name: str = None,
                               **kwargs) -> tuple:
         """
-        Upload parts for a specific multipart upload ID in parallel.
+        Upload parts for a specific multipart upload ID in parallel. A part failing to upload
+        is logged and skipped, list_parts response shows parts which made it.
 
         :param upload_id: Multipart Upload ID.
         :param bucket_name: Name of the bucket.
         :param object_name: Name of the object.
+        :keyword parts: dict of part number -> [data, content_md5] or s3_utils.PartView,
+        part data is read only when a thread is available to upload it.
+        :keyword parallel_thread: Parts uploaded in parallel.
+        :keyword random: upload parts in random order.
         :return: (Boolean, List of uploaded parts).
         """
         try:
             parts = kwargs.get("parts", None)
-            parallel_thread = kwargs.get("parallel_thread", 5)
-            gevent_pool = GeventPool(parallel_thread)
+            mpu = ParallelMultipartUpload(self.s3_client, bucket_name, object_name, parts,
+                                          upload_id=upload_id, attempts=1,
+                                          nworkers=kwargs.get("parallel_thread", 5))
             part_number_list = list(parts.keys())
-
-            for part_number in part_number_list:
-                part = parts.get(part_number, None)
-                gevent_pool.wait_available()
-                gevent_pool.spawn(super().upload_part,
-                                  part[0], bucket_name,
-                                  object_name, upload_id=upload_id,
-                                  part_number=part_number, content_md5=part[1])
-            gevent_pool.join_group()
+            if kwargs.get("random", False):
+                shuffle(part_number_list)
+            # a failed part is logged and left out, as greenlet uploads did
+            mpu.upload(part_number_list, stop_on_error=False)
             response = self.list_parts(upload_id, bucket_name, object_name)
             return response
         except BaseException as error:
@@ -271,6 +274,60 @@ class S3MultipartTestLib(Multipart):
                          error)
             raise CTException(err.S3_CLIENT_ERROR, error)
 
+    def upload_file_parallel(self,
+                             bucket_name: str = None,
+                             object_name: str = None,
+                             file_path: str = None,
+                             part_size: int = 5242880,
+                             **kwargs) -> tuple:
+        """
+        Multipart upload of a file, parts are read with pread and uploaded by a thread pool
+        with per part retries.
+
+        :param bucket_name: Name of the bucket.
+        :param object_name: Name of the object.
+        :param file_path: Path of file to upload.
+        :param part_size: Part size in bytes, last part holds the remainder.
+        :keyword upload_id: Resume this upload, parts already stored are not uploaded again.
+        :keyword complete: Complete upload once all parts are uploaded, default True.
+        :keyword nworkers: Parts uploaded in parallel.
+        :keyword attempts: Attempts of a part upload.
+        :keyword perf_profile: S3 perf profile name, multipart profile when not selected.
+        :return: (Boolean, report with upload_id, parts, throughput, part latencies etc.)
+        """
+        mpu = None
+        try:
+            mpu = ParallelMultipartUpload.from_file(
+                self.s3_client, bucket_name, object_name, file_path, part_size,
+                upload_id=kwargs.get("upload_id"), nworkers=kwargs.get("nworkers"),
+                attempts=kwargs.get("attempts", PART_ATTEMPTS),
+                perf_profile=kwargs.get("perf_profile"))
+            response = mpu.run(complete=kwargs.get("complete", True))
+        except BaseException as error:
+            LOGGER.error("Error in %s: upload %s, %s",
+                         S3MultipartTestLib.upload_file_parallel.__name__,
+                         mpu.upload_id if mpu else None, error)
+            raise CTException(err.S3_CLIENT_ERROR, error)
+
+        return True, response
+
+    def resume_multipart_upload(self,
+                                upload_id: str = None,
+                                bucket_name: str = None,
+                                object_name: str = None,
+                                file_path: str = None,
+                                part_size: int = 5242880,
+                                **kwargs) -> tuple:
+        """
+        Continue an interrupted multipart upload of a file and complete it, only parts
+        missing in list parts or not matching the file are uploaded.
+
+        :param upload_id: Multipart Upload ID.
+        :return: (Boolean, report), see upload_file_parallel.
+        """
+        return self.upload_file_parallel(bucket_name, object_name, file_path, part_size,
+                                         upload_id=upload_id, **kwargs)
+
     def upload_parts_sequential(self,
                                 upload_id: int = None,
                                 bucket_name: str = None,
@@ -283,12 +340,17 @@ class S3MultipartTestLib(Multipart):
         :param bucket_name: Name of the bucket.
         :param object_name: Name of the object.
         # :param chunks: No. of parts to be uploaded with details.
+        :keyword parts: dict of part number -> [data, content_md5] or s3_utils.PartView.
+        :keyword random: upload parts in random order.
         :return: (Boolean, List of uploaded parts).
         """
         try:
             parts = kwargs.get("parts", None)
             parts_details = []
-            for part_number in parts:
+            part_number_list = list(parts.keys())
+            if kwargs.get("random", False):
+                shuffle(part_number_list)
+            for part_number in part_number_list:
                 LOGGER.info("Uploading part: %s", part_number)
                 resp = super().upload_part(parts[part_number][0], bucket_name, object_name,
                                            upload_id=upload_id, part_number=part_number,
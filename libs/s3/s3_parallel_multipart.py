@@ -0,0 +1,255 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+#
+# Copyright (c) 2022 Seagate Technology LLC and/or its Affiliates
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published
+# by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+#
+# For any questions about this software or licensing,
+# please email opensource@seagate.com or cortx-questions@seagate.com.
+#
+
+
+"""Parallel multipart upload engine.
+Parts are s3_utils.PartView slices of a file read with os.pread by the worker uploading
+them, so memory is bounded by the number of workers and not by object size. Parts are
+uploaded through a bounded thread pool with per part retries, an interrupted upload is
+resumed from ListParts and uploads only missing or mismatching parts.
+"""
+import base64
+import logging
+import math
+import time
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import as_completed
+from hashlib import md5
+from itertools import repeat
+
+from commons.utils.s3_perf_utils import get_perf_profile
+from commons.utils.s3_utils import plan_parts
+
+LOGGER = logging.getLogger(__name__)
+
+# Attempts of a part upload and delay before first retry, doubled on every retry
+PART_ATTEMPTS = 3
+RETRY_DELAY = 1
+
+
+def _percentile(values: list, percent: float) -> float:
+    """Nearest rank percentile of sorted values."""
+    if not values:
+        return 0.0
+    return values[max(0, math.ceil(percent / 100 * len(values)) - 1)]
+
+
+class ParallelMultipartUpload:
+    """
+    Usage:
+    mpu = ParallelMultipartUpload(s3_mp_test_obj.s3_client, "bkt", "obj",
+                                  parts=s3_utils.plan_parts(path, repeat(part_size)))
+    report = mpu.run()
+    # interrupted, e.g. by a pod failure, continue same upload later on
+    report = ParallelMultipartUpload(client, "bkt", "obj", parts=parts,
+                                     upload_id=report["upload_id"]).run()
+    """
+
+    def __init__(self, s3_client, bucket: str, key: str, parts: dict,
+                 upload_id: str = None, **kwargs) -> None:
+        """
+        :param s3_client: boto3 s3 client
+        :param bucket: Name of the bucket
+        :param key: Name of the object
+        :param parts: dict of part number -> PartView or [data, content_md5]
+        :param upload_id: Upload to resume, a new upload is created when not given
+        :keyword nworkers: Parts uploaded in parallel, max_concurrency of perf profile
+        capped by client connection pool by default
+        :keyword attempts: Attempts of a part upload
+        :keyword perf_profile: S3 perf profile name, "multipart" when not selected otherwise
+        """
+        self.s3_client = s3_client
+        self.bucket = bucket
+        self.key = key
+        self.parts = parts
+        self.upload_id = upload_id
+        self.perf_profile = get_perf_profile(kwargs.get("perf_profile"), default="multipart")
+        self.nworkers = kwargs.get("nworkers") or min(
+            self.perf_profile["max_concurrency"], s3_client.meta.config.max_pool_connections)
+        self.attempts = kwargs.get("attempts", PART_ATTEMPTS)
+        # part number -> ETag of parts uploaded by this or an interrupted run
+        self.etags = dict()
+        self.latencies = dict()
+        self.retries = 0
+        self.resumed = 0
+
+    @classmethod
+    def from_file(cls, s3_client, bucket: str, key: str, file_path: str, part_size: int,
+                  **kwargs) -> 'ParallelMultipartUpload':
+        """Upload of a file in part_size parts, last part holds the remainder."""
+        return cls(s3_client, bucket, key, plan_parts(file_path, repeat(part_size)), **kwargs)
+
+    def create(self) -> str:
+        """Initiate multipart upload."""
+        self.upload_id = self.s3_client.create_multipart_upload(
+            Bucket=self.bucket, Key=self.key)["UploadId"]
+        LOGGER.info("Initiated multipart upload %s of %s/%s", self.upload_id, self.bucket,
+                    self.key)
+        return self.upload_id
+
+    def uploaded_parts(self) -> dict:
+        """Parts already stored for upload_id, part number -> ListParts entry."""
+        stored = dict()
+        for page in self.s3_client.get_paginator("list_parts").paginate(
+                Bucket=self.bucket, Key=self.key, UploadId=self.upload_id):
+            for part in page.get("Parts", []):
+                stored[part["PartNumber"]] = part
+        return stored
+
+    def resume(self, verify: bool = True) -> list:
+        """
+        Take over parts stored by an interrupted run.
+        :param verify: Take over a part only if its ETag matches md5 of planned data,
+        else size match is enough and part data is not read
+        :return: part numbers which still need to be uploaded
+        """
+        for number, part in self.uploaded_parts().items():
+            planned = self.parts.get(number)
+            if planned is None:
+                continue
+            if verify:
+                if part["ETag"].strip('"') != self._digest(planned):
+                    LOGGER.info("Part %s of upload %s does not match, uploading again",
+                                number, self.upload_id)
+                    continue
+            elif part["Size"] != self._length(planned):
+                continue
+            self.etags[number] = part["ETag"]
+            self.resumed += 1
+        pending = [number for number in self.parts if number not in self.etags]
+        LOGGER.info("Resuming upload %s, %s parts stored, %s pending", self.upload_id,
+                    self.resumed, len(pending))
+        return pending
+
+    @staticmethod
+    def _length(part) -> int:
+        return part.length if hasattr(part, "length") else len(part[0])
+
+    @staticmethod
+    def _digest(part) -> str:
+        if hasattr(part, "digest"):
+            return part.digest.hex()
+        if part[1]:
+            return base64.b64decode(part[1]).hex()
+        return md5(part[0]).hexdigest()
+
+    def _upload_part(self, number: int) -> tuple:
+        """Upload a part with retries, return ETag, latency of successful attempt, retries."""
+        part = self.parts[number]
+        attempt = 1
+        while True:
+            try:
+                kwargs = dict(Body=part[0], Bucket=self.bucket, Key=self.key,
+                              UploadId=self.upload_id, PartNumber=number)
+                if part[1]:
+                    kwargs["ContentMD5"] = part[1]
+                start = time.perf_counter()
+                response = self.s3_client.upload_part(**kwargs)
+                return response["ETag"], time.perf_counter() - start, attempt - 1
+            except Exception as error:
+                if attempt >= self.attempts:
+                    raise
+                LOGGER.warning("Part %s attempt %s failed: %s", number, attempt, error)
+                time.sleep(RETRY_DELAY * 2 ** (attempt - 1))
+                attempt += 1
+
+    def upload(self, numbers: list = None, stop_on_error: bool = True) -> dict:
+        """
+        Upload parts in parallel.
+        :param numbers: part numbers to upload, all not yet uploaded ones by default
+        :param stop_on_error: stop at first part failing all its attempts and raise its
+        error, else log failed parts and go on with the rest
+        :return: dict of part number -> ETag of all uploaded parts
+        """
+        if numbers is None:
+            numbers = [number for number in self.parts if number not in self.etags]
+        with ThreadPoolExecutor(max_workers=max(1, min(self.nworkers, len(numbers)))) as \
+                executor:
+            futures = {executor.submit(self._upload_part, number): number
+                       for number in numbers}
+            try:
+                for future in as_completed(futures):
+                    number = futures[future]
+                    try:
+                        self.etags[number], self.latencies[number], retries = future.result()
+                    except Exception as error:
+                        if stop_on_error:
+                            raise
+                        LOGGER.error("Part %s of upload %s failed: %s", number,
+                                     self.upload_id, error)
+                        continue
+                    self.retries += retries
+            except BaseException:
+                for future in futures:
+                    future.cancel()
+                raise
+        return self.etags
+
+    def complete(self) -> dict:
+        """Complete upload with ETags of all parts in part number order."""
+        missing = sorted(set(self.parts) - set(self.etags))
+        if missing:
+            raise ValueError(f"Parts {missing} of upload {self.upload_id} are not uploaded")
+        parts = [{"PartNumber": number, "ETag": self.etags[number]}
+                 for number in sorted(self.etags)]
+        return self.s3_client.complete_multipart_upload(
+            Bucket=self.bucket, Key=self.key, UploadId=self.upload_id,
+            MultipartUpload={"Parts": parts})
+
+    def report(self, elapsed: float) -> dict:
+        """Per part latencies and aggregate throughput of parts uploaded by this run."""
+        latencies = sorted(self.latencies.values())
+        nbytes = sum(self._length(self.parts[number]) for number in self.latencies)
+        return dict(upload_id=self.upload_id, parts=len(self.etags), uploaded=len(latencies),
+                    resumed=self.resumed, retries=self.retries, bytes=nbytes, elapsed=elapsed,
+                    throughput=nbytes / elapsed if elapsed else 0.0,
+                    latency_p50=_percentile(latencies, 50),
+                    latency_p99=_percentile(latencies, 99),
+                    latency_max=latencies[-1] if latencies else 0.0,
+                    part_latency=dict(self.latencies), workers=self.nworkers,
+                    perf_profile=self.perf_profile["name"])
+
+    def run(self, complete: bool = True, verify: bool = True) -> dict:
+        """
+        Create or resume the upload, upload pending parts and complete it.
+        An upload failing here is left in place to be resumed with its upload_id.
+        :param complete: Complete the upload once all parts are uploaded
+        :param verify: See resume
+        :return: report, with response of CompleteMultipartUpload when completed
+        """
+        start = time.perf_counter()
+        pending = self.resume(verify) if self.upload_id else None
+        if self.upload_id is None:
+            self.create()
+        try:
+            self.upload(pending)
+        except Exception as error:
+            LOGGER.error("Multipart upload %s of %s/%s interrupted, %s of %s parts uploaded: "
+                         "%s", self.upload_id, self.bucket, self.key, len(self.etags),
+                         len(self.parts), error)
+            raise
+        response = self.complete() if complete else None
+        report = self.report(time.perf_counter() - start)
+        report["response"] = response
+        LOGGER.info("Uploaded %s parts of %s/%s, %s resumed, %s retries, %.2f MiB/s, part "
+                    "latency p50 %.3fs p99 %.3fs", report["uploaded"], self.bucket, self.key,
+                    report["resumed"], report["retries"], report["throughput"] / 2 ** 20,
+                    report["latency_p50"], report["latency_p99"])
+        return report
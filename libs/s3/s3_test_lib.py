@@ -25,14 +25,13 @@ import time
 from random import randint
 from time import perf_counter
 
-import boto3
 from botocore import UNSIGNED
-from botocore.client import Config
 from botocore.exceptions import ClientError
 
 from commons import commands
 from commons import errorcodes as err
 from commons.exceptions import CTException
+from commons.utils.s3_perf_utils import botocore_config
 from commons.utils.s3_utils import poll
 from commons.utils.system_utils import create_file
 from commons.utils.system_utils import run_local_cmd
@@ -41,6 +40,7 @@ from libs.s3 import ACCESS_KEY, SECRET_KEY
 from libs.s3.s3_acl_test_lib import S3AclTestLib
 from libs.s3.s3_bucket_policy_test_lib import S3BucketPolicyTestLib
 from libs.s3.s3_core_lib import S3Lib
+from libs.s3.s3_core_lib import get_s3_connection
 
 LOGGER = logging.getLogger(__name__)
 
@@ -442,26 +442,34 @@ class S3TestLib(S3Lib):
 
         return True, response
 
-    def delete_multiple_buckets(self, bucket_list: list = None) -> tuple:
+    def delete_multiple_buckets(self, bucket_list: list = None, **kwargs) -> tuple:
         """
-        Delete multiple empty/non-empty buckets.
+        Delete multiple empty/non-empty buckets, buckets are deleted in parallel.
 
         :param bucket_list: List of bucket names.
+        :keyword max_buckets: Buckets deleted in parallel.
         :return: True or False and deleted and non-deleted buckets.
         """
         LOGGER.info("Deleting multiple empty/non-empty buckets")
         response_dict = {"Deleted": [], "CouldNotDelete": []}
-        for bucket in bucket_list:
-            response = self.delete_bucket(bucket, True)
-            if response[0]:
-                response_dict["Deleted"].append(bucket)
-            else:
-                LOGGER.error(
-                    "Error in %s: %s",
-                    S3TestLib.delete_multiple_buckets.__name__,
-                    response[1])
-                response_dict["CouldNotDelete"].append(bucket)
+        if not bucket_list:
+            return True, response_dict
+        try:
+            summary = self.delete_buckets(bucket_list, **kwargs)
+        except Exception as error:
+            LOGGER.error("Error in %s: %s",
+                         S3TestLib.delete_multiple_buckets.__name__,
+                         error)
+            raise CTException(err.S3_CLIENT_ERROR, error)
+        response_dict["Deleted"] = summary["deleted"]
+        response_dict["CouldNotDelete"] = list(summary["failed"])
+        LOGGER.info("############# BUCKETS DELETION TIME : %f, OBJECTS/SEC : %f #############",
+                    summary["elapsed"], summary["objects_per_sec"])
         if response_dict["CouldNotDelete"]:
+            LOGGER.error(
+                "Error in %s: %s",
+                S3TestLib.delete_multiple_buckets.__name__,
+                summary["failed"])
             LOGGER.error("Failed to delete bucket")
             return False, response_dict
 
@@ -476,7 +484,7 @@ class S3TestLib(S3Lib):
         all_buckets = self.bucket_list()
         response = self.delete_multiple_buckets(all_buckets[1])
 
-        return True, response
+        return response[0], response
 
     def create_multiple_buckets_with_objects(
             self,
@@ -820,15 +828,7 @@ class S3LibNoAuth(S3TestLib, S3AclTestLib, S3BucketPolicyTestLib):
                          endpoint_url,
                          s3_cert_path,
                          **kwargs)
-        self.s3_client = boto3.client(
-            "s3",
-            verify=s3_cert_path,
-            endpoint_url=endpoint_url,
-            config=Config(
-                signature_version=UNSIGNED))
-        self.s3_resource = boto3.resource(
-            "s3",
-            verify=s3_cert_path,
-            endpoint_url=endpoint_url,
-            config=Config(
-                signature_version=UNSIGNED))
+        # anonymous client and per thread resources with connection settings of perf profile
+        self._s3_config = dict(botocore_config(self.perf_profile), signature_version=UNSIGNED)
+        self._s3_params = dict(verify=s3_cert_path, endpoint_url=endpoint_url)
+        self.s3_client = get_s3_connection("client", self._s3_config, **self._s3_params)
@@ -32,6 +32,7 @@ from botocore.exceptions import BotoCoreError, ClientError, ConnectionClosedErro
 from locust import events
 
 from commons.utils import system_utils
+from commons.utils.checksum import file_md5
 from core.runner import InMemoryDB
 from scripts.locust import LOCUST_CFG
 
@@ -193,7 +194,7 @@ class LocustUtils:
         :param object_size: Size of the object
         """
         object_name = self.create_file(object_size)
-        checksum = system_utils.calculate_checksum(object_name)[1]
+        checksum = file_md5(object_name)
         log_prefix = f"{bucket_name}/{object_name}"
         LOGGER.info("Uploading %s checksum %s", log_prefix, checksum)
         start_time = time.time()
@@ -260,7 +261,7 @@ class LocustUtils:
             events.request_success.fire(request_type="get", name="download_object",
                                         response_time=self.total_time(start_time),
                                         response_length=10)
-            checksum = system_utils.calculate_checksum(download_path)[1]
+            checksum = file_md5(download_path)
             if checksum_original != checksum:
                 LOGGER.error("Checksum does not matched for %s. Stored Checksum %s "
                              "Calculated Checksum %s", log_prefix, checksum_original, checksum)
@@ -23,10 +23,13 @@ Runs test sequentially or in parallel and report the results to DB and Jira.
 import os
 import sys
 import subprocess
+import threading
 import argparse
 import csv
 import json
 import logging
+import time
+import xml.etree.ElementTree as ET
 import requests
 from datetime import datetime
 from multiprocessing import Process
@@ -73,6 +76,11 @@ def parse_args():
                         help="Build type (Release/Dev)")
     parser.add_argument("-tg", "--target", type=str,
                         default='', help="Target setup details")
+    parser.add_argument("-tgs", "--targets", nargs='+', type=str, default=[],
+                        help="Space separated pool of compatible targets to shard tests across")
+    parser.add_argument("-nt", "--num_targets", type=int, default=None,
+                        help="Number of targets to acquire from targets pool for sharded run, "
+                             "defaults to size of targets pool")
     parser.add_argument("-ll", "--log_level", type=int, default=10,
                         help="log level value as defined below" +
                              "CRITICAL = 50" +
@@ -88,7 +96,8 @@ def parse_args():
                         help="Force sequential run if you face problems with parallel run")
     parser.add_argument("-i", "--data_integrity_chk", type=str_to_bool,
                         default=False, help="Helps set DI check enabled so that tests "
-                                            "perform additional checksum check")
+                                            "perform additional checksum check, parallel DI IO "
+                                            "runs against --target only")
     parser.add_argument("-tt", "--test_type", nargs='+', type=str,
                         default=['ALL'], help="Space separated test types")
     parser.add_argument("--xml_report", type=str_to_bool, default=False,
@@ -103,7 +112,15 @@ def parse_args():
                         help="Use HTTPS/SSL connection for S3 endpoint.")
     parser.add_argument("-hc", "--health_check", type=str_to_bool, default=True,
                         help="Decide whether to do health check.")
-    return parser.parse_args()
+    args = parser.parse_args()
+    if args.num_targets is not None and not args.targets:
+        parser.error("--num_targets requires --targets")
+    if args.targets:
+        if args.num_targets is None:
+            args.num_targets = len(args.targets)
+        elif not 1 <= args.num_targets <= len(args.targets):
+            parser.error("--num_targets should be between 1 and number of --targets")
+    return args
 
 
 def initialize_loghandler(log, level=logging.DEBUG) -> None:
@@ -130,9 +147,16 @@ def str_to_bool(val):
         raise argparse.ArgumentTypeError('Boolean value expected.')
 
 
-def run_pytest_cmd(args, te_tag=None, parallel_exe=False, env=None, re_execution=False):
-    """Form a pytest command for execution."""
-    env['TARGET'] = args.target
+def build_pytest_cmd(args, te_tag=None, parallel_exe=False, env=None, re_execution=False,
+                     target=None, test_list_file=None):
+    """
+    Form a pytest command for execution.
+    :param target: Target for this pytest process, defaults to args.target.
+    :param test_list_file: Test list csv of a shard passed as --test_list.
+    """
+    target = target if target else args.target
+    env['TARGET'] = target
+    shard = target + "_" if target and target != args.target else ''
     build, build_type = args.build, args.build_type
 
     run_type = ''
@@ -156,6 +180,7 @@ def run_pytest_cmd(args, te_tag=None, parallel_exe=False, env=None, re_execution
     te_id = ''
     if args.te_ticket:
         te_id = str(args.te_ticket) + "_"
+    te_id = te_id + shard
     if re_execution:
         te_tag = None
         report_name = "--html=log/re_non_parallel_" + te_id +\
@@ -183,8 +208,11 @@ def run_pytest_cmd(args, te_tag=None, parallel_exe=False, env=None, re_execution
     if args.te_ticket:
         cmd_line = cmd_line + ["--te_tkt=" + str(args.te_ticket)]
 
-    if args.target:
-        cmd_line = cmd_line + ["--target=" + args.target]
+    if target:
+        cmd_line = cmd_line + ["--target=" + target]
+
+    if test_list_file:
+        cmd_line = cmd_line + ["--test_list=" + test_list_file]
 
     if te_tag:
         tag = '-m ' + te_tag
@@ -218,13 +246,25 @@ def run_pytest_cmd(args, te_tag=None, parallel_exe=False, env=None, re_execution
                            '--use_ssl=' + str(args.use_ssl),
                            '--csm_checks=' + str(args.csm_checks),
                            '--health_check=' + str(args.health_check)]
+    return cmd_line
+
+
+def run_pytest_cmd(args, te_tag=None, parallel_exe=False, env=None, re_execution=False):
+    """Form a pytest command and execute it."""
+    cmd_line = build_pytest_cmd(args, te_tag=te_tag, parallel_exe=parallel_exe, env=env,
+                                re_execution=re_execution)
     LOGGER.debug('Running pytest command %s', cmd_line)
     prc = subprocess.Popen(cmd_line, env=env)
     prc.communicate()
-    if prc.returncode == 3:
+    check_pytest_returncode(prc.returncode)
+
+
+def check_pytest_returncode(returncode):
+    """Exit test runner when pytest reported bad health of deployment."""
+    if returncode == 3:
         print('Exiting test runner due to bad health of deployment')
         sys.exit(1)
-    if prc.returncode == 4:
+    if returncode == 4:
         print('Exiting test runner due to health check script error')
         sys.exit(2)
 
@@ -290,29 +330,41 @@ def get_tests_from_te(jira_obj, args, test_type=None):
     return test_list, tag
 
 
-def trigger_unexecuted_tests(args, test_list):
+def get_unexecuted_tests(args, test_list):
     """
-    Check if some tests are not executed in earlier TE
-    Rerun those tests in seqential manner.
+    Get selected tests which are still in TODO state in TE.
+    :return: unexecuted tests and TE tag
     """
     jira_id, jira_pwd = runner.get_jira_credential()
     jira_obj = JiraTask(jira_id, jira_pwd)
     te_test_list, tag = get_tests_from_te(jira_obj, args, ['TODO'])
-    if len(te_test_list) != 0:
-        # check if there are any selected tests with todo status
-        unexecuted_test_list = [test for test in test_list if test in te_test_list]
-        if len(unexecuted_test_list) != 0:
-            # run those selected todo tests sequential
-            args.parallel_exe = False
-            with open(os.path.join(os.getcwd(), params.LOG_DIR_NAME,
-                                   params.JIRA_DIST_TEST_LIST), 'w') as test_file:
-                write = csv.writer(test_file)
-                for test in unexecuted_test_list:
-                    write.writerow([test])
-            _env = os.environ.copy()
-            _env['pytest_run'] = 'distributed'
-            run_pytest_cmd(args, te_tag=tag, parallel_exe=args.parallel_exe,
-                           env=_env, re_execution=True)
+    # check if there are any selected tests with todo status
+    return [test for test in test_list if test in te_test_list], tag
+
+
+def write_test_list_csv(test_list, test_list_file):
+    """Write test list csv read by pytest selection."""
+    with open(test_list_file, 'w') as test_file:
+        write = csv.writer(test_file)
+        for test in test_list:
+            write.writerow([test])
+
+
+def trigger_unexecuted_tests(args, test_list):
+    """
+    Check if some tests are not executed in earlier TE
+    Rerun those tests in seqential manner.
+    """
+    unexecuted_test_list, tag = get_unexecuted_tests(args, test_list)
+    if len(unexecuted_test_list) != 0:
+        # run those selected todo tests sequential
+        args.parallel_exe = False
+        write_test_list_csv(unexecuted_test_list, os.path.join(
+            os.getcwd(), params.LOG_DIR_NAME, params.JIRA_DIST_TEST_LIST))
+        _env = os.environ.copy()
+        _env['pytest_run'] = 'distributed'
+        run_pytest_cmd(args, te_tag=tag, parallel_exe=args.parallel_exe,
+                       env=_env, re_execution=True)
 
 
 def create_test_meta_data_file(args, test_list, jira_obj=None):
@@ -424,14 +476,16 @@ def trigger_tests_from_kafka_msg(args, kafka_msg):
     LOGGER.debug("Executed tests %s on target %s", kafka_msg.test_list, args.target)
 
 
-def read_selected_tests_csv():
+def read_selected_tests_csv(target=None):
     """
     Read tests which were selected for last execution
+    :param target: Target of a shard, selection of a sharded run is kept per target.
     """
     tests = list()
+    shard = target + "_" if target else ''
     try:
-        with open(os.path.join(os.getcwd(), params.LOG_DIR_NAME, params.JIRA_SELECTED_TESTS)) \
-                as test_file:
+        with open(os.path.join(os.getcwd(), params.LOG_DIR_NAME,
+                               shard + params.JIRA_SELECTED_TESTS)) as test_file:
             reader = csv.reader(test_file)
             test_list = list(reader)
             for test_row in test_list:
@@ -478,7 +532,10 @@ def trigger_tests_from_te(args):
         if te_label is not None and "stop_on_first_error" in te_label:
             args.stop_on_first_error = True
 
-        if not args.force_serial_run:
+        if args.targets:
+            # Shard tests across several compatible targets from single client.
+            trigger_sharded_tests(args, test_list, te_tag)
+        elif not args.force_serial_run:
             # First execute all tests with parallel tag which are mentioned in given tag.
             run_pytest_cmd(args, te_tag, True, env=_env)
 
@@ -516,6 +573,140 @@ def acquire_target(target, client, lock_type, convert_to_shared=False):
     return found_target
 
 
+def acquire_targets(target_list, count, client, poll_interval=60):
+    """
+    Acquire exclusive lock on up to count free targets from compatible target list.
+    Waits till at least one target is acquired.
+    """
+    lock_task = LockingServer()
+    acquired_targets = list()
+    HealthCheck(runner.get_db_credential()).health_check(target_list)
+    LOGGER.info("Acquiring %s targets from %s for sharded execution.", count, target_list)
+    while not acquired_targets:
+        while len(acquired_targets) < count:
+            candidates = [tgt for tgt in target_list if tgt not in acquired_targets]
+            target = lock_task.find_free_target(candidates, common_cnst.EXCLUSIVE_LOCK)
+            if target == "":
+                break
+            acquired_target = acquire_target(target, client, common_cnst.EXCLUSIVE_LOCK)
+            if acquired_target == "":
+                break
+            acquired_targets.append(acquired_target)
+        if not acquired_targets:
+            time.sleep(poll_interval)
+    LOGGER.info("Acquired targets %s for sharded execution.", acquired_targets)
+    return acquired_targets
+
+
+def shard_test_list(test_list, shards):
+    """Split test list round robin into given number of shards."""
+    return [test_list[idx::shards] for idx in range(shards) if test_list[idx::shards]]
+
+
+def merge_junit_reports(report_files, merged_report):
+    """Merge junit xml reports of all shards in single report."""
+    merged = None
+    for report_file in report_files:
+        if not os.path.exists(report_file):
+            LOGGER.warning("Shard report %s not found", report_file)
+            continue
+        root = ET.parse(report_file).getroot()
+        suites = [root] if root.tag == 'testsuite' else list(root)
+        if merged is None:
+            merged = ET.Element('testsuites')
+        merged.extend(suites)
+    if merged is not None:
+        ET.ElementTree(merged).write(merged_report, encoding='utf-8', xml_declaration=True)
+    return merged_report
+
+
+def run_shard(args, te_tag, target, shard_file, result):
+    """
+    Execute a shard on its target in the same phases as an unsharded TE run: tests with
+    parallel tag, then TODO tests left by parallel run, then tests without parallel tag.
+    Return codes of phases are stored in result, a bad health return code stops the shard.
+    """
+    phases = [('parallel', True)]
+    if not args.force_serial_run:
+        phases.append(('unexecuted', False))
+    phases.append(('non_parallel', False))
+    result['returncodes'] = dict()
+    for phase, parallel_exe in phases:
+        _env = os.environ.copy()
+        re_execution = phase == 'unexecuted'
+        test_list_file, tag = shard_file, te_tag
+        if re_execution:
+            unexecuted, tag = get_unexecuted_tests(args, read_selected_tests_csv(target))
+            if not unexecuted:
+                continue
+            test_list_file = os.path.join(os.getcwd(), params.LOG_DIR_NAME,
+                                          target + "_" + params.JIRA_DIST_TEST_LIST)
+            write_test_list_csv(unexecuted, test_list_file)
+            _env['pytest_run'] = 'distributed'
+        cmd_line = build_pytest_cmd(args, te_tag=tag, parallel_exe=parallel_exe, env=_env,
+                                    re_execution=re_execution, target=target,
+                                    test_list_file=test_list_file)
+        LOGGER.debug('Running %s phase pytest command %s on target %s', phase, cmd_line, target)
+        prc = subprocess.Popen(cmd_line, env=_env)
+        prc.communicate()
+        result['returncodes'][phase] = prc.returncode
+        if prc.returncode in (3, 4):
+            break
+
+
+def trigger_sharded_tests(args, test_list, te_tag):
+    """
+    Acquire several compatible targets and shard test list across them.
+    Every target runs its shard in its own pytest processes (and xdist workers) started
+    with its own --target so that config and S3 endpoints of that target are loaded by the
+    workers. Targets should have lb configured as /etc/hosts can point to only one setup.
+    Parallel DI IO (--data_integrity_chk) runs in testrunner process and so loads only
+    --target, config of testrunner process can not be switched to other acquired targets.
+    """
+    current_time_ms = datetime.utcnow().strftime('%Y-%m-%d_%H:%M:%S.%f')
+    client = system_utils.get_host_name() + "_" + current_time_ms
+    targets = acquire_targets(args.targets, args.num_targets, client)
+    if args.data_integrity_chk:
+        LOGGER.warning("Parallel DI IO runs only against target %s, no DI load on %s",
+                       args.target, [tgt for tgt in targets if tgt != args.target])
+    shards = shard_test_list(test_list, len(targets))
+    threads = dict()
+    summary = dict()
+    try:
+        for target, shard in zip(targets, shards):
+            shard_file = os.path.join(os.getcwd(), params.LOG_DIR_NAME,
+                                      target + "_" + params.JIRA_TEST_LIST)
+            write_test_list_csv(shard, shard_file)
+            summary[target] = dict(tests=shard)
+            threads[target] = threading.Thread(target=run_shard, args=(
+                args, te_tag, target, shard_file, summary[target]))
+            threads[target].start()
+        for target, thread in threads.items():
+            thread.join()
+            LOGGER.info("Executed %s tests on target %s with return codes %s",
+                        len(summary[target]['tests']), target,
+                        summary[target].get('returncodes'))
+    finally:
+        lock_task = LockingServer()
+        for target in targets:
+            if not lock_task.unlock_target(target, client):
+                LOGGER.error("Error in releasing lock on target %s", target)
+    config_utils.create_content_json(
+        os.path.join(os.getcwd(), params.LOG_DIR_NAME, params.LATEST_LOG_FOLDER,
+                     "shard_summary.json"), summary, ensure_ascii=False)
+    if args.xml_report:
+        te_id = str(args.te_ticket) + "_" if args.te_ticket else ''
+        for prefix in ("parallel_", "non_parallel_"):
+            merge_junit_reports(
+                [os.path.join("log", prefix + te_id + target + "_report.xml")
+                 for target in threads],
+                os.path.join("log", prefix + te_id + "report.xml"))
+    for target in threads:
+        for returncode in summary[target].get('returncodes', dict()).values():
+            check_pytest_returncode(returncode)
+    return summary
+
+
 def get_available_target(kafka_msg, client):
     """
     Check available target from target list
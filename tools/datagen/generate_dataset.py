@@ -16,17 +16,23 @@
 # For any questions about this software or licensing,
 # please email opensource@seagate.com or cortx-questions@seagate.com.
 #
-"""Data generator by honouring the data distribution."""
-import random
+"""Dataset generator honouring a data profile.
+Sizes, compression, dedupe and text/binary mix come from a named profile of
+config/di_data_profiles.yaml or a dataset-*.cfg size distribution, file content is
+generated by DataGenerator from per file seeds so a dataset is reproducible from its seed.
+"""
 import os
-import sys
+import random
 import string
-from multiprocessing import Process, Value, Lock
-from struct import pack
+import sys
+from multiprocessing import Lock
+from multiprocessing import Process
 from platform import system
-from struct import unpack
 
-randmax = 2147483647 / 256
+from commons import params
+from libs.di.data_profile import DataProfile
+
+REPO_ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..')
 
 fileextbin1k = 646 * ['dat'] + 1074 * ['png'] + 105 * ['sol'] + 89 * ['jpg'] + 72 * ['lex'] + 7739 * ['gif'] + 947 * [
     'cookie'] + 642 * ['aae'] + 324 * ['sth'] + 285 * ['tbl'] + 262 * ['old'] + 248 * ['vcrd'] + 150 * [
@@ -101,75 +107,30 @@ fileslevel = len(files_depth_dist)
 
 
 def randname(min=4, max=10):
-    a = ''
-    for i in range(random.randrange(min, max)):
-        a = a + random.choice(string.ascii_letters + string.digits)
-    return a
-
-
-def randfilename(size, min=5, max=40):
-    fname = ''
-    for i in range(random.randrange(min, max)):
-        fname += random.choice(string.ascii_letters + string.digits + '_-')
-
-    if size < 1024:
-        ext = random.choice(fileexttxt1k + fileextbin1k)
-    elif (size >= 1024) & (size < 10240):
-        ext = random.choice(fileexttxt10k + fileextbin10k)
-    elif (size >= 10240) & (size < 102400):
-        ext = random.choice(fileexttxt100k + fileextbin100k)
-    elif (size >= 102400) & (size < 1024 * 1024):
-        ext = random.choice(fileexttxt1m + fileextbin1m)
-    elif (size >= 1024 * 1024) & (size < 1024 * 10240):
-        ext = random.choice(fileexttxt10m + fileextbin10m)
-    elif (size >= 1024 * 10240) & (size < 10240 * 10240):
-        ext = random.choice(fileexttxt100m + fileextbin100m)
-    elif (size >= 10240 * 10240) & (size < 1024 * 1024 * 1024):
-        ext = random.choice(fileexttxt1g + fileextbin1g)
-    elif size >= 1024 * 1024 * 1024:
-        ext = random.choice(fileextbin10g)
-    return fname, ext
-
-
-def randtext(bytes):
-    a = ''
-    for it in range(bytes / 8):
-        a += ''.join(random.choice(string.printable) for _ in range(4)) + 4 * ' '
-    if (bytes % 8) == 0:
-        pass
-    else:
-        b = ''.join(random.choice(string.printable) for _ in range(4)) + 4 * ' '
-        a += b[0:bytes % 8]
-    return a
-
-
-def randbytes(bytes):
-    a = ''.join(pack('q', random.randrange(randmax))
-                for _ in range(bytes / 8))
-    if (bytes % 8) == 0:
-        pass
-    else:
-        a += (''.join(pack('q', random.randrange(randmax))))[0:bytes % 8]
-    return a
-
-
-def bufferbin(size):
-    buf = ''
-    for i in range(size / 8):
-        buf = buf + pack('q', random.randrange(randmax))
-    return buf
-
-
-def buffertext(bytes):
-    a = ''
-    for it in range(bytes / 8):
-        a += ''.join(random.choice(string.printable) for _ in range(4)) + 4 * ' '
-    if (bytes % 8) == 0:
-        pass
-    else:
-        b = ''.join(random.choice(string.printable) for _ in range(4)) + 4 * ' '
-        a += b[0:bytes % 8]
-    return a
+    return ''.join(random.choice(string.ascii_letters + string.digits)
+                   for _ in range(random.randrange(min, max)))
+
+
+# (upper size bound, text extensions, binary extensions)
+EXTENSIONS = ((1024, fileexttxt1k, fileextbin1k),
+              (10240, fileexttxt10k, fileextbin10k),
+              (102400, fileexttxt100k, fileextbin100k),
+              (1024 * 1024, fileexttxt1m, fileextbin1m),
+              (1024 * 10240, fileexttxt10m, fileextbin10m),
+              (10240 * 10240, fileexttxt100m, fileextbin100m),
+              (1024 * 1024 * 1024, fileexttxt1g, fileextbin1g),
+              (float('inf'), fileexttxt10g, fileextbin10g))
+
+
+def randfilename(size, text, rng, min=5, max=40):
+    """Random name and an extension typical for size and content type."""
+    fname = ''.join(rng.choice(string.ascii_letters + string.digits + '_-')
+                    for _ in range(rng.randrange(min, max)))
+    for upper, txt_exts, bin_exts in EXTENSIONS:
+        if size < upper:
+            exts = (txt_exts if text else bin_exts) or txt_exts + bin_exts
+            return fname, rng.choice(exts)
+    return fname, ''
 
 
 def make_dirs(name, number):
@@ -216,109 +177,60 @@ def make_dirtree(topdir, depth, number):
     return all_dirs
 
 
-def create_fileset(fsize_percent, randseed, numfiles, alldirs, lock):
+def create_fileset(specs, randseed, alldirs, lock):
+    """Write files of given object specs, print (path, size, md5) of each file."""
     mycwd = os.getcwd()
-    isWindows = False
-    if system() == 'Windows':
-        isWindows = True
-    fs = 0
-    random.seed(randseed)
-    block = 1024 * 1024 * 40
-    buftxt = buffertext(block)
-    bufbin = bufferbin(block)
-    for fs_pc in fsize_percent:
-        isize = fs_pc[0] - fs
-        for fno in range(int(round(fs_pc[1] * numfiles / 100))):
-            randno = random.randrange(randmax)
-            if (isize > 1):
-                size = fs + isize * randno / randmax
-            else:
-                size = fs + isize
-            filename, ext = randfilename(size)
-            dira = random.choice(alldirs)
-            if ext:
-                filename = filename + '.' + ext
-            lock.acquire()
-            printstring = (str(dira + '/' + filename), size)
-            print(printstring)
-            lock.release()
-
-            if isWindows:
-                dira = '\\\\?\\' + mycwd + '\\' + dira.replace('/', '\\')
-                filename = dira + '\\' + filename
-            else:
-                filename = dira + '/' + filename
-
-            try:
-                os.makedirs(dira)
-            except:
-                pass
-            f = open(filename, 'wb', 512 * 1024)
-            if (size < 1024):
-                iosize = 128
-            elif (size >= 1024) & (size < 1024 * 1024):
-                iosize = 4096
-            elif (size >= 1024 * 1024):
-                iosize = 1024 * 64
-
-            sizew = size / iosize
-            randn = len(bufbin[:-iosize])
-            for z in range(0, sizew, 1):
-                noff = random.randrange(randn)
-                if ext in binary:
-                    f.write(bufbin[noff:noff + iosize])
-                else:
-                    f.write(buftxt[noff:noff + iosize])
-            x = size - f.tell()
-            if (x > 0):
-                if ext in binary:
-                    f.write(randbytes(x))
-                else:
-                    f.write(randtext(x))
-            f.close()
-        fs = fs_pc[0]
+    is_windows = system() == 'Windows'
+    rng = random.Random(randseed)
+    for spec in specs:
+        filename, ext = randfilename(spec['size'], spec['text'], rng)
+        dira = rng.choice(alldirs)
+        if ext:
+            filename = filename + '.' + ext
+        if is_windows:
+            dira = '\\\\?\\' + mycwd + '\\' + dira.replace('/', '\\')
+            path = dira + '\\' + filename
+        else:
+            path = dira + '/' + filename
+        os.makedirs(dira, exist_ok=True)
+        md5 = DataProfile.generator(spec).write_to_file(path, spec['size'], spec['seed'],
+                                                        csum_algo='md5')
+        with lock:
+            print((path, spec['size'], md5), flush=True)
     return 1
 
 
+def load_profile(name):
+    """Profile from a dataset cfg file or a named profile."""
+    if os.path.isfile(name):
+        return DataProfile.from_dataset_cfg(name, text_ratio=0.3)
+    return DataProfile.load(name, os.path.join(REPO_ROOT, params.DI_DATA_PROFILES))
+
+
 if __name__ == "__main__":
-    if (len(sys.argv) < 4):
-        print("generate_dataset.py dataset-S.cfg N_files Rand_seed Ndirs Depth")
-        exit()
+    if len(sys.argv) < 6:
+        print("generate_dataset.py <dataset-S.cfg|profile name> N_files Rand_seed Ndirs Depth"
+              " [N_procs]")
+        sys.exit(1)
 
-    infile = sys.argv[1]
+    profile = load_profile(sys.argv[1])
     nfiles = int(sys.argv[2])
     randnew = int(sys.argv[3])
     ndirs = int(sys.argv[4])
     depth = int(sys.argv[5])
-    randseed = 143
-
-    percent = []
-    fsize = []
-
-    f = open(infile)
-    fsize_percent = [[float(x) if '.' in x else int(x) for x in line.split()] for line in f]
+    nprocs = int(sys.argv[6]) if len(sys.argv) > 6 else 2
+    print(profile)
 
-    print("")
-    print("")
-    print("")
-    print("")
-    random.seed(randseed)
-    # topdira=str(random.randrange(randmax))
+    random.seed(143)
     topdira = randname()
-    try:
-        os.mkdir(topdira)
-    except:
-        pass
+    os.makedirs(topdira, exist_ok=True)
     alldirs = make_dirtree(topdira, depth, ndirs)
-    nthr = 2
-    nf = nfiles / nthr
-    randseed = randnew
-    randseed = randseed + 110
+    specs = list(profile.objects(nfiles, seed=randnew))
     lock = Lock()
-    for i in range(nthr):
-        if (i == nthr - 1) & (nf < nfiles):
-            nf = nfiles - (nthr - 1) * nf
-        fileset = Process(target=create_fileset,
-                          args=(fsize_percent, randseed, nf, alldirs, lock))
-        fileset.start()
-        randseed = randseed + 10
+    procs = [Process(target=create_fileset,
+                     args=(specs[i::nprocs], randnew + 110 + 10 * i, alldirs, lock))
+             for i in range(nprocs)]
+    for proc in procs:
+        proc.start()
+    for proc in procs:
+        proc.join()
@@ -0,0 +1,56 @@
+#
+# Copyright (c) 2022 Seagate Technology LLC and/or its Affiliates
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published
+# by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+#
+# For any questions about this software or licensing,
+# please email opensource@seagate.com or cortx-questions@seagate.com.
+"""Test single pass checksum library."""
+import hashlib
+import io
+import os
+
+import pytest
+
+from commons.utils import checksum
+
+
+def _etag(data, part_size):
+    digests = [hashlib.md5(data[off:off + part_size]).digest()
+               for off in range(0, len(data), part_size)] or [hashlib.md5(b'').digest()]
+    return hashlib.md5(b''.join(digests)).hexdigest() + '-' + str(len(digests))
+
+
+@pytest.mark.parametrize("size", [0, 1000, 3 * 4096 + 5])
+def test_checksum_file_single_pass(tmp_path, size):
+    data = os.urandom(size)
+    path = tmp_path / 'obj'
+    path.write_bytes(data)
+    result = checksum.checksum_file(str(path), ('md5', 'sha256'), part_size=4096, read_size=3000)
+    assert result['md5'] == hashlib.md5(data).hexdigest()
+    assert result['sha256'] == hashlib.sha256(data).hexdigest()
+    assert result[checksum.ETAG] == _etag(data, 4096)
+    assert checksum.checksum_stream(io.BytesIO(data), part_size=0)[checksum.ETAG] == \
+        _etag(data, max(size, 1))
+
+
+def test_checksum_files(tmp_path):
+    paths = []
+    for idx in range(5):
+        path = tmp_path / str(idx)
+        path.write_bytes(os.urandom(idx * 1000))
+        paths.append(str(path))
+    results = checksum.checksum_files(paths, nworkers=3)
+    assert list(results) == paths
+    for path in paths:
+        with open(path, 'rb') as fp:
+            assert results[path]['md5'] == hashlib.md5(fp.read()).hexdigest()
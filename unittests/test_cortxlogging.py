@@ -0,0 +1,116 @@
+#
+# Copyright (c) 2022 Seagate Technology LLC and/or its Affiliates
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published
+# by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+#
+# For any questions about this software or licensing,
+# please email opensource@seagate.com or cortx-questions@seagate.com.
+"""Test queue based cortx logging."""
+import logging
+import threading
+
+from commons import cortxlogging
+from commons.cortxlogging import LazyMessage
+from commons.cortxlogging import TruncateFilter
+
+
+class ListHandler(logging.Handler):
+    """Keep formatted messages and the threads which emitted them."""
+
+    def __init__(self):
+        super().__init__()
+        self.messages = list()
+        self.threads = set()
+
+    def emit(self, record):
+        self.messages.append(self.format(record))
+        self.threads.add(threading.get_ident())
+
+
+def queued_logger(name, **kwargs):
+    log = logging.getLogger(name)
+    log.propagate = False
+    log.setLevel(logging.INFO)
+    handler = ListHandler()
+    cortxlogging.add_queue_handler(log, handler, **kwargs)
+    return log, handler
+
+
+def test_records_of_all_threads_are_written_at_stop():
+    log, handler = queued_logger('test_cortxlogging.threads')
+
+    def work(worker):
+        for idx in range(200):
+            log.info("worker %s record %s", worker, idx)
+
+    threads = [threading.Thread(target=work, args=(worker,)) for worker in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    cortxlogging.stop_queue_listeners()
+    assert len(handler.messages) == 8 * 200
+    assert sorted(handler.messages) == sorted("worker {} record {}".format(worker, idx)
+                                              for worker in range(8) for idx in range(200))
+
+
+def test_args_are_rendered_at_logging_call():
+    log, handler = queued_logger('test_cortxlogging.args')
+    body = {'state': 'before'}
+    log.info("body %s", body)
+    body['state'] = 'after'
+    cortxlogging.stop_queue_listeners()
+    assert handler.messages == ["body {'state': 'before'}"]
+
+
+def test_truncate_filter_truncates_and_samples():
+    log, handler = queued_logger('test_cortxlogging.truncate', max_length=10, sample_every=2)
+    log.info("short")
+    for idx in range(4):
+        log.info("%s", str(idx) * 25)
+    cortxlogging.stop_queue_listeners()
+    assert handler.messages == ["short",
+                                "0000000000... [15 chars truncated]",
+                                "2222222222... [15 chars truncated]"]
+    record = logging.LogRecord('name', logging.INFO, __file__, 1, "x" * 20, None, None)
+    assert TruncateFilter(max_length=20).filter(record) and record.msg == "x" * 20
+
+
+def test_lazy_message_is_rendered_only_when_emitted():
+    log, handler = queued_logger('test_cortxlogging.lazy')
+    calls = list()
+
+    def render(value):
+        calls.append(threading.get_ident())
+        return value
+
+    log.debug("dropped %s", LazyMessage(render, 'debug'))
+    log.info("kept %s", LazyMessage(render, 'info'))
+    cortxlogging.stop_queue_listeners()
+    assert handler.messages == ["kept info"]
+    assert calls and set(calls) <= handler.threads
+    assert threading.get_ident() not in calls
+
+
+def test_rotated_log_is_compressed_when_listener_stops(tmp_path):
+    log = logging.getLogger('test_cortxlogging.rotate')
+    log.propagate = False
+    log.setLevel(logging.INFO)
+    handler = cortxlogging.CortxRotatingFileHandler(str(tmp_path / "cortx-test.log"),
+                                                    maxBytes=1000, backupCount=5)
+    cortxlogging.add_queue_handler(log, handler)
+    for idx in range(30):
+        log.info("record %s %s", idx, "x" * 50)
+    cortxlogging.stop_queue_listeners()
+    handler.close()
+    rotated = [path.name for path in tmp_path.iterdir() if path.name != "cortx-test.log"]
+    assert rotated and all(name.endswith(".gz") for name in rotated)
@@ -0,0 +1,106 @@
+#
+# Copyright (c) 2022 Seagate Technology LLC and/or its Affiliates
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published
+# by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+#
+# For any questions about this software or licensing,
+# please email opensource@seagate.com or cortx-questions@seagate.com.
+"""Test DI data generator."""
+import hashlib
+import io
+import zlib
+
+import pytest
+
+from libs.di.data_generator import BLOCK_SIZE
+from libs.di.data_generator import DataGenerator
+from libs.di.data_generator import TEXT_ALPHABET
+from libs.di.data_verifier import compare_stream
+from libs.di.data_verifier import hash_object
+
+
+@pytest.mark.parametrize("c_ratio", [1, 2, 4])
+def test_generate_compression_ratio(c_ratio):
+    gen = DataGenerator(c_ratio=c_ratio)
+    buf, csum = gen.generate(2 * BLOCK_SIZE + 4096, seed=10)
+    assert len(buf) == 2 * BLOCK_SIZE + 4096
+    assert hashlib.sha1(buf).hexdigest() == csum
+    ratio = len(buf) / len(zlib.compress(bytes(buf)))
+    assert abs(ratio - c_ratio) < 0.1 * c_ratio
+
+
+def test_generate_is_deterministic():
+    gen = DataGenerator(c_ratio=2)
+    assert gen.generate(4096, seed=1) == gen.generate(4096, seed=1)
+    assert gen.generate(4096, seed=1)[1] != gen.generate(4096, seed=2)[1]
+    assert gen.generate(0, seed=1)[0] == b''
+
+
+def test_fill_range_matches_object():
+    gen = DataGenerator(c_ratio=3)
+    size = BLOCK_SIZE + 12345
+    buf, _ = gen.generate(size, seed=5)
+    for start, end in [(0, 17), (BLOCK_SIZE - 3, BLOCK_SIZE + 40), (1000, size)]:
+        view = bytearray(end - start)
+        gen.fill(view, 5, size, start)
+        assert view == buf[start:end]
+
+
+def test_stream_and_chunks_match_generate():
+    gen = DataGenerator(c_ratio=2)
+    size = 3 * BLOCK_SIZE + 77
+    buf, csum = gen.generate(size, seed=3, csum_algo='md5')
+    chunks = [bytes(chunk) for chunk in gen.iter_chunks(size, 3, chunk_size=BLOCK_SIZE // 3)]
+    assert b''.join(chunks) == buf
+    assert gen.checksum(size, 3, csum_algo='md5') == csum
+    stream = gen.stream(size, 3)
+    stream.seek(BLOCK_SIZE - 10)
+    assert stream.read(20) == buf[BLOCK_SIZE - 10:BLOCK_SIZE + 10]
+
+
+def test_compare_stream_reports_first_mismatch():
+    gen = DataGenerator(c_ratio=2)
+    size = 2 * BLOCK_SIZE + 100
+    buf, _ = gen.generate(size, seed=7)
+    result = compare_stream(io.BytesIO(bytes(buf)), size, 7, c_ratio=2, chunk_size=BLOCK_SIZE // 2)
+    assert result == dict(match=True, mismatch_offset=-1, bytes_read=size)
+    buf[BLOCK_SIZE + 5000] ^= 0xff
+    result = compare_stream(io.BytesIO(bytes(buf)), size, 7, c_ratio=2)
+    assert not result['match'] and result['mismatch_offset'] == BLOCK_SIZE + 5000
+    result = compare_stream(io.BytesIO(bytes(buf[:1000])), size, 7, c_ratio=2)
+    assert result['mismatch_offset'] == 1000
+    result = compare_stream(io.BytesIO(bytes(buf[10:60])), size, 7, c_ratio=2, offset=10, length=50)
+    assert result['match']
+
+
+def test_hash_object_ranged_reads_in_order():
+    data = bytes(DataGenerator(c_ratio=1).generate(10 * 1000 + 17, seed=9)[0])
+
+    class Client:
+        """get_object serving byte ranges of data."""
+        def get_object(self, Bucket, Key, Range):
+            start, end = map(int, Range[len('bytes='):].split('-'))
+            return {'Body': io.BytesIO(data[start:end + 1]),
+                    'ContentRange': 'bytes {}-{}/{}'.format(start, end, len(data))}
+
+    expected = (hashlib.md5(data).hexdigest(), len(data))
+    assert hash_object(Client(), 'bkt', 'key', range_size=1000, nworkers=3) == expected
+    assert hash_object(Client(), 'bkt', 'key') == expected
+
+
+def test_text_objects_are_printable_and_verifiable():
+    gen = DataGenerator(c_ratio=2, text=True)
+    size = BLOCK_SIZE + 333
+    buf, _ = gen.generate(size, seed=3)
+    assert bytes(buf).translate(None, TEXT_ALPHABET) == b''
+    assert compare_stream(io.BytesIO(bytes(buf)), size, 3, c_ratio=2, text=True)['match']
+    assert not compare_stream(io.BytesIO(bytes(buf)), size, 3, c_ratio=2)['match']
@@ -0,0 +1,60 @@
+#
+# Copyright (c) 2022 Seagate Technology LLC and/or its Affiliates
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published
+# by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+#
+# For any questions about this software or licensing,
+# please email opensource@seagate.com or cortx-questions@seagate.com.
+"""Test DI client data manager."""
+import json
+
+from commons import params
+from libs.di.data_man import DataManager
+
+
+def file_dict(name, checksum, seed=1, size=1024):
+    return dict(name=name, checksum=checksum, seed=seed, size=size, mtime=0)
+
+
+def test_data_manager_is_view_of_manifest(tmp_path):
+    manager = DataManager(str(tmp_path / "manifest.db"))
+    manager.add_file_to_bucket('user1', 'bkt1', file_dict('b.txt', 'efgh'))
+    manager.add_file_to_bucket('user1', 'bkt1', file_dict('a.txt', 'abcd'))
+    manager.add_file_to_bucket('user1', 'bkt2', file_dict('c.txt', 'ijkl', seed=3))
+    manager.add_file_to_bucket('user2', 'bkt3', file_dict('d.txt', 'mnop'))
+    manager.add_file_to_bucket('user1', 'bkt1', file_dict('a.txt', 'mabcd', seed=7))
+    manager.add_file_to_bucket('user1', None, file_dict('e.txt', 'qrst'))
+    assert manager.get_file('user1', 'bkt1', 'a.txt')['checksum'] == 'mabcd'
+    assert manager.get_file('user1', 'bkt1', 'a.txt')['seed'] == 7
+    assert manager.get_file('user2', 'bkt1', 'a.txt') is None
+    assert [entry['name'] for entry in manager.get_bucket_files('user1', 'bkt1')] == \
+        ['a.txt', 'b.txt']
+    assert manager.manifest.count() == 4
+    assert manager.manifest.get('bkt1', 'a.txt')['version'] == 2
+    manager.delete_file_from_bucket('user1', 'bkt1', 'b.txt')
+    assert manager.get_file('user1', 'bkt1', 'b.txt') is None
+    buckets = manager.get_all_buckets_data_for_user('user1')
+    assert [(bkt['name'], [entry['name'] for entry in bkt['files']]) for bkt in buckets] == \
+        [('bkt1', ['a.txt']), ('bkt2', ['c.txt'])]
+    assert manager.get_all_buckets_data_for_user('user3') is None
+
+
+def test_export_to_json(tmp_path, monkeypatch):
+    monkeypatch.setattr(params, 'META_DATA_HOME', str(tmp_path / "meta"))
+    manager = DataManager(str(tmp_path / "manifest.db"))
+    manager.add_file_to_bucket('user1', 'bkt1', file_dict('a.txt', 'abcd', seed=5, size=10))
+    with open(manager.export_to_json('user1')) as meta:
+        data = json.load(meta)
+    assert data['name'] == 'user1'
+    assert data['buckets'][0]['name'] == 'bkt1'
+    entry = data['buckets'][0]['files'][0]
+    assert (entry['name'], entry['checksum'], entry['seed'], entry['sz']) == ('a.txt', 'abcd', 5, 10)
@@ -0,0 +1,43 @@
+#
+# Copyright (c) 2022 Seagate Technology LLC and/or its Affiliates
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published
+# by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+#
+# For any questions about this software or licensing,
+# please email opensource@seagate.com or cortx-questions@seagate.com.
+"""Test DI data profiles."""
+import pytest
+
+from libs.di.data_profile import DataProfile
+
+
+def test_data_profile_is_reproducible_and_honours_mix():
+    profile = DataProfile('mix', sizes=[(1, 100, 1), (1000, 1000, 1)],
+                          compression=[(1, 1), (4, 1)], dedupe_ratio=2, text_ratio=0.5)
+    specs = list(profile.objects(2000, seed=11))
+    assert specs == list(profile.objects(2000, seed=11))
+    assert all(1 <= spec['size'] <= 100 or spec['size'] == 1000 for spec in specs)
+    assert {spec['c_ratio'] for spec in specs} == {1, 4}
+    unique = {(spec['seed'], spec['size'], spec['c_ratio'], spec['text']) for spec in specs}
+    assert 1.8 < len(specs) / len(unique) < 2.2
+    assert 0.4 < sum(spec['text'] for spec in specs) / len(specs) < 0.6
+    with pytest.raises(ValueError):
+        DataProfile('bad', sizes=[(1, 1, 1)], dedupe_ratio=0.5)
+
+
+def test_data_profile_max_size_caps_ranges():
+    profile = DataProfile('capped', sizes=[(1, 100, 1), (50, 5000, 1), (6000, 9000, 1)],
+                          max_size=1000)
+    assert profile.sizes == [(1, 100, 1), (50, 1000, 1)]
+    assert all(spec['size'] <= 1000 for spec in profile.objects(500, seed=3))
+    with pytest.raises(ValueError):
+        DataProfile('bad', sizes=[(2000, 3000, 1)], max_size=1000)
@@ -0,0 +1,53 @@
+#
+# Copyright (c) 2022 Seagate Technology LLC and/or its Affiliates
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published
+# by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+#
+# For any questions about this software or licensing,
+# please email opensource@seagate.com or cortx-questions@seagate.com.
+"""Test DI range read verifier."""
+import io
+import random
+
+import pytest
+
+from libs.di.data_generator import BLOCK_SIZE
+from libs.di.data_generator import DataGenerator
+from libs.di.data_verifier import plan_ranges
+from libs.di.data_verifier import RangeVerifier
+from libs.di.data_verifier import RANDOM
+from libs.di.data_verifier import STRIDED
+
+
+@pytest.mark.parametrize("mode", [RANDOM, STRIDED])
+def test_range_verifier_reports_mismatch_offsets(mode):
+    size = 3 * BLOCK_SIZE + 11
+    data = bytearray(DataGenerator(c_ratio=2).generate(size, seed=5)[0])
+    data[BLOCK_SIZE] ^= 0xff
+
+    class Client:
+        """get_object serving byte ranges of data."""
+        def get_object(self, Bucket, Key, Range):
+            start, end = map(int, Range[len('bytes='):].split('-'))
+            return {'Body': io.BytesIO(bytes(data[start:end + 1]))}
+
+    ranges = plan_ranges(size, count=5, range_size=BLOCK_SIZE, mode=mode, rng=random.Random(1))
+    assert ranges and all(0 <= start <= end < size for start, end in ranges)
+    entry = dict(user='u1', bucket='bkt', key='key', seed=5, size=size, c_ratio=2)
+    summary = RangeVerifier({'u1': Client()}, range_size=BLOCK_SIZE, ranges_per_object=5,
+                            mode=mode, rng=random.Random(1)).run([entry, dict(entry, seed=None)])
+    assert summary['total'] == len(ranges) and not summary['errors']
+    for result in summary['ranges']:
+        corrupt = result['start'] <= BLOCK_SIZE <= result['end']
+        assert result['match'] != corrupt
+        assert result['mismatch_offset'] == (BLOCK_SIZE if corrupt else -1)
+    assert len(summary['mismatches']) == len([r for r in ranges if r[0] <= BLOCK_SIZE <= r[1]])
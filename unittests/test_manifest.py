@@ -0,0 +1,80 @@
+#
+# Copyright (c) 2022 Seagate Technology LLC and/or its Affiliates
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published
+# by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+#
+# For any questions about this software or licensing,
+# please email opensource@seagate.com or cortx-questions@seagate.com.
+"""Test DI upload manifest."""
+import sqlite3
+
+from libs.di.manifest import UploadManifest
+
+# objects table as created before text column was added
+OLD_SCHEMA = (
+    "CREATE TABLE objects (user TEXT NOT NULL, bucket TEXT NOT NULL, "
+    "key TEXT NOT NULL, md5 TEXT, seed INTEGER, size INTEGER, c_ratio INTEGER, "
+    "version INTEGER NOT NULL DEFAULT 1, created REAL, updated REAL, deleted REAL, "
+    "PRIMARY KEY (bucket, key))")
+
+
+def test_add_tombstone_and_reupload(tmp_path):
+    manifest = UploadManifest(str(tmp_path / "manifest.db"))
+    manifest.add_many([dict(user='u1', bucket='b1', key='k1', md5='m1', seed=1, size=10),
+                       dict(user='u1', bucket='b1', key='k2', md5='m2'),
+                       dict(user='u2', bucket='b2', key='k1', md5='m3', text=True)])
+    assert manifest.count() == 3 and manifest.count(users=['u1']) == 2
+    manifest.tombstone('b1', 'k1')
+    assert manifest.count() == 2 and manifest.count(deleted=True) == 1
+    assert {(ent['bucket'], ent['key']) for ent in manifest.live_objects()} == \
+        {('b1', 'k2'), ('b2', 'k1')}
+    assert [ent['key'] for ent in manifest.live_objects(users=['u2'])] == ['k1']
+    assert [ent['key'] for ent in manifest.deleted_objects()] == ['k1']
+    assert manifest.get('b2', 'k1')['text'] == 1
+    deleted = manifest.get('b1', 'k1')
+    assert deleted['deleted'] is not None and deleted['version'] == 1
+    manifest.add('u1', 'b1', 'k1', 'm4', seed=2, size=20)
+    entry = manifest.get('b1', 'k1')
+    assert entry['deleted'] is None and entry['version'] == 2
+    assert (entry['md5'], entry['seed'], entry['size']) == ('m4', 2, 20)
+    assert manifest.count() == 3 and manifest.count(users=[]) == 0
+    assert manifest.get('b9', 'k9') is None
+    manifest.reset()
+    assert manifest.count() == 0 and manifest.count(deleted=True) == 0
+
+
+def test_old_schema_db_is_migrated(tmp_path):
+    path = str(tmp_path / "manifest.db")
+    conn = sqlite3.connect(path)
+    conn.execute(OLD_SCHEMA)
+    conn.execute("INSERT INTO objects (user, bucket, key, md5) VALUES ('u1', 'b1', 'k1', 'm1')")
+    conn.commit()
+    conn.close()
+    manifest = UploadManifest(path)
+    assert [(ent['key'], ent['text']) for ent in manifest.live_objects()] == [('k1', 0)]
+    manifest.add('u1', 'b1', 'k2', 'm2', text=True)
+    assert manifest.get('b1', 'k2')['text'] == 1
+    # another process opening migrated DB does not migrate again
+    assert UploadManifest(path).count() == 2
+
+
+def test_csv_round_trip(tmp_path):
+    manifest = UploadManifest(str(tmp_path / "manifest.db"))
+    manifest.add_many([dict(user='u1', bucket='b1', key='k1', md5='m1', seed=5, size=10,
+                            c_ratio=2),
+                       dict(user='u1', bucket='b1', key='k2', md5='m2')])
+    manifest.tombstone('b1', 'k2')
+    csv_path = manifest.export_csv(str(tmp_path / "upload.csv"))
+    copy = UploadManifest(str(tmp_path / "copy.db"))
+    assert copy.import_csv(csv_path) == 1
+    entry = copy.get('b1', 'k1')
+    assert (entry['md5'], entry['seed'], entry['size'], entry['c_ratio']) == ('m1', 5, 10, 2)
@@ -0,0 +1,140 @@
+#
+# Copyright (c) 2022 Seagate Technology LLC and/or its Affiliates
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published
+# by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+#
+# For any questions about this software or licensing,
+# please email opensource@seagate.com or cortx-questions@seagate.com.
+"""Test parallel multipart upload engine."""
+from hashlib import md5
+from itertools import repeat
+
+import boto3
+import pytest
+from botocore.exceptions import ClientError
+from botocore.stub import Stubber
+
+from commons.utils.s3_utils import plan_parts
+from libs.s3 import s3_parallel_multipart
+from libs.s3.s3_parallel_multipart import ParallelMultipartUpload
+from libs.s3.s3_parallel_multipart import _percentile
+
+DATA = bytes(range(25))
+UPLOAD = dict(Bucket='bkt', Key='obj', UploadId='upload-1')
+
+
+@pytest.fixture(name="client")
+def fixture_client():
+    client = boto3.client('s3', region_name='us-east-1', aws_access_key_id='key',
+                          aws_secret_access_key='secret')
+    with Stubber(client) as stubber:
+        client.stubber = stubber
+        yield client
+        stubber.assert_no_pending_responses()
+
+
+@pytest.fixture(name="parts")
+def fixture_parts(tmp_path):
+    path = tmp_path / "object"
+    path.write_bytes(DATA)
+    return plan_parts(str(path), repeat(10))
+
+
+def etag(data):
+    return '"{}"'.format(md5(data).hexdigest())
+
+
+def new_upload(client, parts, **kwargs):
+    return ParallelMultipartUpload(client, 'bkt', 'obj', parts, upload_id='upload-1',
+                                   nworkers=1, **kwargs)
+
+
+def add_list_parts(client, stored):
+    client.stubber.add_response('list_parts', {'Parts': stored, 'IsTruncated': False}, UPLOAD)
+
+
+def test_resume_takes_over_parts_with_matching_etag(client, parts):
+    add_list_parts(client, [dict(PartNumber=1, ETag=etag(DATA[:10]), Size=10),
+                            dict(PartNumber=2, ETag=etag(b'stale'), Size=10),
+                            dict(PartNumber=9, ETag=etag(b'extra'), Size=10)])
+    mpu = new_upload(client, parts)
+    assert mpu.resume() == [2, 3]
+    assert mpu.etags == {1: etag(DATA[:10])} and mpu.resumed == 1
+
+
+def test_resume_without_verify_takes_over_parts_with_matching_size(client, parts):
+    add_list_parts(client, [dict(PartNumber=2, ETag=etag(b'stale'), Size=10),
+                            dict(PartNumber=3, ETag=etag(DATA[20:]), Size=4)])
+    mpu = new_upload(client, parts)
+    assert mpu.resume(verify=False) == [1, 3]
+    assert mpu.etags == {2: etag(b'stale')}
+
+
+def test_complete_rejects_missing_parts_and_orders_parts(client, parts):
+    mpu = new_upload(client, parts)
+    mpu.etags = {3: '"c"', 1: '"a"'}
+    with pytest.raises(ValueError, match=r"\[2\]"):
+        mpu.complete()
+    mpu.etags[2] = '"b"'
+    client.stubber.add_response('complete_multipart_upload', {}, dict(
+        UPLOAD, MultipartUpload={'Parts': [dict(PartNumber=1, ETag='"a"'),
+                                           dict(PartNumber=2, ETag='"b"'),
+                                           dict(PartNumber=3, ETag='"c"')]}))
+    mpu.complete()
+
+
+def test_upload_retries_failed_parts_with_backoff(client, parts, monkeypatch):
+    delays = list()
+    monkeypatch.setattr(s3_parallel_multipart.time, 'sleep', delays.append)
+    client.stubber.add_client_error('upload_part', 'InternalError', http_status_code=500)
+    client.stubber.add_client_error('upload_part', 'InternalError', http_status_code=500)
+    for number in (1, 2, 3):
+        client.stubber.add_response('upload_part', {'ETag': '"e{}"'.format(number)})
+    mpu = new_upload(client, parts, attempts=3)
+    assert mpu.upload() == {1: '"e1"', 2: '"e2"', 3: '"e3"'}
+    assert mpu.retries == 2
+    assert delays == [s3_parallel_multipart.RETRY_DELAY, 2 * s3_parallel_multipart.RETRY_DELAY]
+    report = mpu.report(elapsed=1.0)
+    assert report['retries'] == 2 and report['bytes'] == len(DATA)
+    assert report['uploaded'] == 3 and report['throughput'] == len(DATA)
+
+
+def test_upload_stops_or_continues_on_failed_part(client, parts, monkeypatch):
+    monkeypatch.setattr(s3_parallel_multipart.time, 'sleep', lambda delay: None)
+    client.stubber.add_client_error('upload_part', 'InternalError', http_status_code=500)
+    with pytest.raises(ClientError):
+        new_upload(client, parts, attempts=1).upload([1])
+    client.stubber.add_client_error('upload_part', 'InternalError', http_status_code=500)
+    client.stubber.add_response('upload_part', {'ETag': '"e2"'})
+    mpu = new_upload(client, parts, attempts=1)
+    assert mpu.upload([1, 2], stop_on_error=False) == {2: '"e2"'}
+
+
+def test_run_creates_uploads_and_completes(client, parts):
+    client.stubber.add_response('create_multipart_upload', dict(UPLOAD),
+                                dict(Bucket='bkt', Key='obj'))
+    for number in (1, 2, 3):
+        client.stubber.add_response('upload_part', {'ETag': '"e{}"'.format(number)})
+    client.stubber.add_response('complete_multipart_upload', {'ETag': '"done-3"'})
+    mpu = ParallelMultipartUpload(client, 'bkt', 'obj', parts, nworkers=1)
+    report = mpu.run()
+    assert report['upload_id'] == 'upload-1' and report['parts'] == 3
+    assert report['response']['ETag'] == '"done-3"'
+
+
+def test_percentile_nearest_rank():
+    assert _percentile([], 99) == 0.0
+    assert _percentile([5.0], 50) == 5.0
+    values = [float(value) for value in range(1, 101)]
+    assert _percentile(values, 50) == 50.0
+    assert _percentile(values, 99) == 99.0
+    assert _percentile(values, 100) == 100.0
@@ -0,0 +1,45 @@
+#
+# Copyright (c) 2022 Seagate Technology LLC and/or its Affiliates
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published
+# by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+#
+# For any questions about this software or licensing,
+# please email opensource@seagate.com or cortx-questions@seagate.com.
+"""Test DI parallel verifier."""
+import os
+
+from libs.di.parallel_verifier import ParallelVerifier
+
+CRASH_KEY = 'obj-crash'
+
+
+def _connect(users):
+    return {user: None for user in users}
+
+
+def _verify(record, s3):
+    if record['objectpath'] == CRASH_KEY:
+        os._exit(9)
+    return None, 1
+
+
+def test_dead_partition_records_are_server_errors(tmp_path):
+    records = [dict(user='u1', bucket='b1', objectpath=f'obj-{i}') for i in range(20)]
+    records.append(dict(user='u1', bucket='b1', objectpath=CRASH_KEY))
+    verifier = ParallelVerifier({'u1': {}}, _verify, connect=_connect, nprocs=2, nthreads=1,
+                                checkpoint_dir=str(tmp_path), progress_interval=1)
+    summary = verifier.run(records)
+    lost = [record['objectpath'] for record in summary['server_errors']]
+    assert CRASH_KEY in lost
+    assert summary['verified'] + len(lost) == len(records)
+    assert summary['errors'] == len(lost)
+    assert {entry['reason'] for entry in summary['mismatch_report']} == {'verifier_died'}
@@ -35,3 +35,29 @@ def test_serverlogs_lib():
                                               node="node1",
                                               test_suffix="0707")
     
+
+
+def test_extract_log_windows(tmp_path):
+    lines = ["2021-12-12 16:05:59,001 INFO before",
+             "2021-12-12 16:06:01,002 INFO start",
+             "    continuation of start",
+             "2021-12-12 16:10:00,003 INFO middle",
+             "2021-12-12 16:12:07,004 INFO end",
+             "2021-12-12 16:12:08,005 INFO after"]
+    log_file = tmp_path / "motr.log"
+    log_file.write_text("\n".join(lines) + "\n")
+    slices = serverlogs_helper.extract_log_windows(
+        str(log_file), {"0707": ("2021-12-12 16:06:01", "2021-12-12 16:12:07")},
+        str(tmp_path))
+    with open(slices["0707"]) as slice_file:
+        assert slice_file.read().splitlines() == lines[1:5]
+
+
+def test_extract_log_windows_bad_timestamp(tmp_path):
+    log_file = tmp_path / "motr.log"
+    log_file.write_text("2021-12-12 16:06:01,002 INFO start\n")
+    with pytest.raises(ValueError, match="st_time"):
+        serverlogs_helper.extract_log_windows(
+            str(log_file), {"0707": ("12/12/2021 16:06", "2021-12-12 16:12:07")},
+            str(tmp_path))
+    assert not (tmp_path / "0707_motr.log").exists()
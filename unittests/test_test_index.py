@@ -0,0 +1,72 @@
+#
+# Copyright (c) 2022 Seagate Technology LLC and/or its Affiliates
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published
+# by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+#
+# For any questions about this software or licensing,
+# please email opensource@seagate.com or cortx-questions@seagate.com.
+"""Test session test index used by pytest_collection."""
+import os
+
+import pytest
+
+from core.test_index import TestIndex
+from core.test_index import get_session_index
+
+
+class FakeMark:
+    """Minimal pytest mark."""
+
+    def __init__(self, name, *args):
+        self.name = name
+        self.args = args
+
+
+class FakeItem:
+    """Minimal pytest item."""
+
+    def __init__(self, nodeid, test_id=None, marks=()):
+        self.nodeid = nodeid
+        self._marks = [FakeMark(mark) for mark in marks]
+        if test_id:
+            self._marks.append(FakeMark('tags', test_id))
+
+    def iter_markers(self):
+        return iter(self._marks)
+
+
+@pytest.fixture
+def items():
+    return [FakeItem('tests/test_a.py::TestA::test_1', 'TEST-1', ['s3_ops']),
+            FakeItem('tests/test_a.py::TestA::test_2', 'TEST-2', ['parallel']),
+            FakeItem('tests/test_a.py::TestA::test_3', None, ['s3_ops']),
+            FakeItem('tests/test_b.py::TestB::test_4', 'TEST-4', ['ha'])]
+
+
+def test_select(items):
+    index = TestIndex.from_items(items)
+    selected, tests = index.select(items, ['TEST-1', 'TEST-2', 'TEST-3'])
+    assert tests == ['TEST-1', 'TEST-2']
+    selected, tests = index.select(items, ['TEST-1', 'TEST-2'], is_parallel=True)
+    assert [item.nodeid for item in selected] == ['tests/test_a.py::TestA::test_2']
+    selected, tests = index.select(items, ['TEST-1', 'TEST-2', 'TEST-4'], is_parallel=False)
+    assert tests == ['TEST-1', 'TEST-4']
+    assert index.nodeids('TEST-4') == ['tests/test_b.py::TestB::test_4']
+    assert index.marks(items[0]) == ['s3_ops']
+
+
+def test_session_index_shared(items, tmp_path):
+    index = get_session_index(items, str(tmp_path))
+    assert os.path.isfile(os.path.join(str(tmp_path), 'test_index.json'))
+    worker_index = get_session_index([], str(tmp_path))
+    assert worker_index.entries == index.entries
+    assert worker_index.test_id(items[3]) == 'TEST-4'
@@ -18,6 +18,7 @@
 
 """Test S3 utility library module."""
 
+import base64
 import os
 import time
 import logging
@@ -114,3 +115,39 @@ class TestS3Utils:
         resp = s3_utils.get_unaligned_parts(self.fpath, total_parts=total_parts, random=True)
         self.log.info(resp.keys())
         self.log.info("ENDED: get aligned parts.")
+
+    def test_plan_parts_stops_at_eof(self):
+        """Test plan parts drops part lengths beyond end of file."""
+        with open(self.fpath, "wb") as obj:
+            obj.write(os.urandom(25))
+        parts = s3_utils.plan_parts(self.fpath, [10, 10, 10, 10])
+        assert_utils.assert_equal([part.length for part in parts.values()], [10, 10, 5])
+        parts = s3_utils.get_precalculated_parts(
+            self.fpath, [{"part_size": 1, "count": 5}], chunk_size=10)
+        assert_utils.assert_equal(sorted(parts.keys()), [1, 2, 3])
+        assert_utils.assert_equal(sum(part.length for part in parts.values()), 25)
+
+    def test_multipart_etag_of_part_views(self):
+        """Test multipart ETag of part views matches ETag of in memory parts."""
+        with open(self.fpath, "wb") as obj:
+            obj.write(os.urandom(3 * 1024 + 7))
+        views = s3_utils.plan_parts(self.fpath, [1024] * 4, random=True)
+        pairs = {number: [view[0], view[1]] for number, view in views.items()}
+        assert_utils.assert_equal(s3_utils.get_multipart_etag(views),
+                                  s3_utils.get_multipart_etag(pairs))
+
+    def test_part_view_md5_before_data_reads_once(self, monkeypatch):
+        """Test content md5 asked before data does not read the part twice."""
+        data = os.urandom(100)
+        with open(self.fpath, "wb") as obj:
+            obj.write(data)
+        reads = list()
+        pread = os.pread
+        monkeypatch.setattr(s3_utils.os, "pread", lambda *args: reads.append(args) or pread(*args))
+        view = s3_utils.PartView(self.fpath, 10, 50)
+        content_md5 = view[1]
+        assert_utils.assert_equal(view[0], data[10:60])
+        assert_utils.assert_equal(len(reads), 1)
+        assert_utils.assert_equal(content_md5, base64.b64encode(md5(data[10:60]).digest()).decode())
+        assert_utils.assert_equal(view[0], data[10:60])
+        assert_utils.assert_equal(len(reads), 2)